@@ -0,0 +1,73 @@
+"""Compare la conversion des captures : RGB + LANCZOS + gris contre la voie NumPy.
+
+Utilise un tampon BGRA synthétique (pas besoin d'écran) et mesure la durée
+médiane et le pic mémoire Python (tracemalloc, tableaux NumPy compris) de
+chaque voie.
+
+Usage:
+    python benchmarks/capture_convert.py [--runs 10] [--size 3840x2160]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.capture import gray_frame  # noqa: E402
+
+MAX_SIZE = (1920, 1080)
+
+
+def _legacy(raw: bytearray, size):
+    """Ancienne voie : copie bytes, image RGB, miniature LANCZOS, puis gris."""
+    image = Image.frombytes("RGB", size, bytes(raw), "raw", "BGRX")
+    image.thumbnail(MAX_SIZE, Image.Resampling.LANCZOS)
+    return image.convert("L")
+
+
+def _numpy(raw: bytearray, size):
+    """Nouvelle voie : vue NumPy, réduction entière et gris en une étape, puis ajustement BOX."""
+    return gray_frame(raw, size, MAX_SIZE)
+
+
+def _measure(convert, raw, size, runs):
+    """Renvoie (durée médiane en ms, pic mémoire Python en MB, taille de sortie)."""
+    durations, peak = [], 0.0
+    for _ in range(runs):
+        tracemalloc.start()
+        start = time.perf_counter()
+        image = convert(raw, size)
+        durations.append((time.perf_counter() - start) * 1000)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] / 2 ** 20)
+        tracemalloc.stop()
+    durations.sort()
+    return durations[len(durations) // 2], peak, image.size
+
+
+def main():
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--size", default="3840x2160")
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.split("x"))
+
+    rng = np.random.default_rng(0)
+    raw = bytearray(rng.integers(0, 256, size[0] * size[1] * 4, dtype=np.uint8).tobytes())
+
+    print(f"Capture {size[0]}x{size[1]} -> max {MAX_SIZE[0]}x{MAX_SIZE[1]}")
+    print(f"{'Voie':<8}{'Durée (ms)':>12}{'Pic Python (MB)':>17}{'Sortie':>14}")
+    for name, convert in (("ancien", _legacy), ("numpy", _numpy)):
+        median_ms, peak_mb, out_size = _measure(convert, raw, size, args.runs)
+        print(f"{name:<8}{median_ms:>12.1f}{peak_mb:>17.1f}{out_size[0]:>8}x{out_size[1]}")
+    print("(les images PIL sont allouées en C : le pic Python de l'ancienne voie")
+    print(" ne compte que la copie bytes, sans l'image RGB pleine résolution)")
+
+
+if __name__ == "__main__":
+    main()
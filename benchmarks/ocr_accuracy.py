@@ -0,0 +1,246 @@
+"""Précision (taux d'erreur caractère) contre durée par page, pour chaque moteur OCR.
+
+Les pages viennent de benchmarks/qcm_corpus.py (générées à partir de la
+graine, ou lues dans un dossier avec leurs .txt de référence). Variantes
+mesurées :
+- Tesseract local avec chaque prétraitement d'OCRProcessor : adaptatif,
+  fixe (preprocess_image : contraste, netteté, seuil) et brut ;
+- OCRSpaceAPI contre le serveur local de stand_ins.py, avec plusieurs
+  réglages d'ImageEncoder (budget, JPEG seul, couleur). Le serveur
+  reconnaît l'image reçue avec le Tesseract local : l'écart de précision
+  entre réglages mesure la perte due à l'encodage.
+
+Sans Tesseract installé, seules les durées OCRSpace (encodage + envoi)
+sont mesurées. Aucun accès réseau n'est nécessaire.
+
+Le taux d'erreur caractère (CER) est la distance d'édition entre le texte
+reconnu et la référence (espaces normalisés), rapportée à la longueur de
+la référence.
+
+Usage:
+    python benchmarks/ocr_accuracy.py [--count 24] [--seed 0] [--corpus DIR]
+        [--lang fra+eng] [--by theme] [--json resultats.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from src.encoder import ImageEncoder  # noqa: E402
+from src.ocr import OCRProcessor  # noqa: E402
+from src.ocr_api import OCRSpaceAPI  # noqa: E402
+from qcm_corpus import Page, PageSpec, discover_fonts, generate_corpus  # noqa: E402
+from stand_ins import OCRSpaceStandIn, StandInConfig  # noqa: E402
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Réglages d'encodage comparés pour l'envoi à OCRSpace
+ENCODER_VARIANTS: Dict[str, Callable[[], ImageEncoder]] = {
+    "défaut": lambda: ImageEncoder(),
+    "JPEG seul": lambda: ImageEncoder(allow_png=False),
+    "JPEG 200 KB": lambda: ImageEncoder(max_bytes=200 * 1024, allow_png=False),
+    "couleur": lambda: ImageEncoder(grayscale=False),
+}
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Taux d'erreur caractère (distance de Levenshtein / longueur de la référence).
+
+    Args:
+        reference: Texte attendu
+        hypothesis: Texte reconnu
+
+    Returns:
+        CER (0 = identique ; peut dépasser 1 si le texte reconnu est plus long)
+    """
+    reference = _WHITESPACE.sub(" ", reference).strip()
+    hypothesis = _WHITESPACE.sub(" ", hypothesis).strip()
+    if not reference:
+        return float(bool(hypothesis))
+
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_char in enumerate(reference, start=1):
+        current = [i]
+        for j, hyp_char in enumerate(hypothesis, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_char != hyp_char),
+            ))
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def load_pages(directory: str) -> List[Page]:
+    """
+    Relit un corpus écrit par qcm_corpus.py (ou tout dossier image + .txt).
+
+    Args:
+        directory: Dossier du corpus
+
+    Returns:
+        Pages avec leur texte de référence (images sans .txt ignorées)
+    """
+    specs = {}
+    manifest = os.path.join(directory, "manifest.json")
+    if os.path.exists(manifest):
+        with open(manifest, encoding="utf-8") as f:
+            specs = {spec["name"]: PageSpec(**spec) for spec in json.load(f)}
+
+    pages = []
+    for entry in sorted(os.listdir(directory)):
+        name, ext = os.path.splitext(entry)
+        reference = os.path.join(directory, f"{name}.txt")
+        if ext.lower() not in (".png", ".jpg", ".jpeg") or not os.path.exists(reference):
+            continue
+        with open(reference, encoding="utf-8") as f:
+            text = f.read()
+        with Image.open(os.path.join(directory, entry)) as image:
+            image = image.convert("RGB")
+        spec = specs.get(name) or PageSpec(name, 0, "?", 0, "?", image.size, 0.0, 0)
+        pages.append(Page(spec, image, text))
+    return pages
+
+
+def _tesseract_variants(lang: str) -> Dict[str, Callable[[Image.Image], str]]:
+    """
+    Variantes de prétraitement Tesseract (vide si aucun moteur local).
+
+    Returns:
+        Nom -> fonction image -> texte
+    """
+    try:
+        adaptive = OCRProcessor(lang=lang, adaptive=True)
+        fixed = OCRProcessor(lang=lang, adaptive=False)
+    except Exception as e:
+        print(f"⚠️  Tesseract indisponible ({e}) : CER non mesuré")
+        return {}
+    if adaptive.warm_up() is None:
+        print("⚠️  Tesseract indisponible (binaire ou modèles absents) : CER non mesuré")
+        return {}
+    fixed.warm_up()
+    return {
+        "tesseract adaptatif": lambda image: adaptive.extract_text(image)[0],
+        "tesseract fixe": lambda image: fixed.extract_text(image)[0],
+        "tesseract brut": lambda image: fixed.extract_text(image, preprocess=False)[0],
+    }
+
+
+def _measure(recognize: Callable[[Image.Image], str], pages: List[Page], score: bool) -> List[dict]:
+    """Reconnaît chaque page : durée et CER (si mesurable)."""
+    rows = []
+    for page in pages:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            text = recognize(page.image.copy())
+            elapsed = (time.perf_counter() - start) * 1000
+        rows.append({
+            "page": page.spec.name,
+            "ms": round(elapsed, 2),
+            "cer": round(character_error_rate(page.text, text), 4) if score else None,
+            **{key: value for key, value in asdict(page.spec).items() if key not in ("name", "seed")},
+        })
+    return rows
+
+
+def run(pages: List[Page], lang: str, latency_ms: float) -> Dict[str, List[dict]]:
+    """
+    Mesure toutes les variantes sur toutes les pages.
+
+    Args:
+        pages: Corpus
+        lang: Langues Tesseract
+        latency_ms: Latence simulée du serveur OCRSpace
+
+    Returns:
+        Variante -> une ligne par page (ms, cer, paramètres de la page)
+    """
+    results = {}
+    tesseract = _tesseract_variants(lang)
+    for name, recognize in tesseract.items():
+        results[name] = _measure(recognize, pages, score=True)
+
+    # Le serveur reconnaît les images reçues comme le ferait OCRSpace (sans prétraitement)
+    server_engine = tesseract.get("tesseract brut")
+    with OCRSpaceStandIn(StandInConfig(latency_ms=latency_ms), recognize=server_engine) as server:
+        for name, make_encoder in ENCODER_VARIANTS.items():
+            api = OCRSpaceAPI(api_key="benchmark", encoder=make_encoder())
+            api.api_url = server.url
+            results[f"ocrspace {name}"] = _measure(
+                lambda image: api.extract_text(image)[0], pages, score=server_engine is not None
+            )
+            api.session.close()
+    return results
+
+
+def _summary(rows: List[dict]) -> Tuple[Optional[float], float, float]:
+    """(CER moyen ou None, ms médian, ms moyen) d'un ensemble de pages."""
+    durations = sorted(row["ms"] for row in rows)
+    scores = [row["cer"] for row in rows if row["cer"] is not None]
+    return (
+        sum(scores) / len(scores) if scores else None,
+        durations[len(durations) // 2],
+        sum(durations) / len(durations),
+    )
+
+
+def _print_table(results: Dict[str, List[dict]], by: Optional[str]):
+    """Affiche CER et durée par variante (et par valeur du paramètre `by`)."""
+    print(f"{'Variante':<24}{'Groupe':<20}{'Pages':>6}{'CER':>8}{'p50 (ms)':>10}{'moy. (ms)':>11}")
+    for variant, rows in results.items():
+        groups = defaultdict(list)
+        for row in rows:
+            groups[str(row[by]) if by else "tout"].append(row)
+        for group, group_rows in sorted(groups.items()):
+            cer, median_ms, mean_ms = _summary(group_rows)
+            cer_text = f"{cer:>8.3f}" if cer is not None else f"{'n/d':>8}"
+            print(f"{variant:<24}{group:<20}{len(group_rows):>6}{cer_text}{median_ms:>10.1f}{mean_ms:>11.1f}")
+
+
+def main():
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=None, help="Dossier écrit par qcm_corpus.py (généré sinon)")
+    parser.add_argument("--count", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fonts", type=int, default=4, help="Nombre maximal de polices")
+    parser.add_argument("--lang", default="fra+eng")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latence simulée d'OCRSpace")
+    parser.add_argument("--by", choices=["font", "font_size", "theme", "resolution", "noise", "questions"],
+                        help="Détailler par paramètre de page")
+    parser.add_argument("--json", help="Écrire les mesures par page dans ce fichier")
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_pages(args.corpus)
+    else:
+        pages = generate_corpus(args.count, args.seed, discover_fonts(args.fonts))
+    if not pages:
+        print(f"❌ Aucune page avec texte de référence dans {args.corpus}")
+        sys.exit(1)
+
+    results = run(pages, args.lang, args.latency_ms)
+    _print_table(results, args.by)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "pages": len(pages), "results": results}, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Mesures écrites dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
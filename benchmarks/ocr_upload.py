@@ -0,0 +1,144 @@
+"""Compare l'envoi OCRSpace en base64 (ancien format) et en multipart binaire.
+
+Mesure, pour une capture synthétique, la taille du corps HTTP, la durée
+d'encodage + envoi vers un serveur local et le pic mémoire Python
+(tracemalloc) par requête. Compare aussi l'ancien encodage JPEG
+(qualité 85 puis 70 si > 900 KB) à ImageEncoder.
+
+Usage:
+    python benchmarks/ocr_upload.py [--runs 10] [--size 1920x1080]
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.ocr_api import OCRSpaceAPI  # noqa: E402
+
+
+class _FakeOCRSpace(BaseHTTPRequestHandler):
+    """Serveur local qui lit le corps de la requête et renvoie un texte fixe."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({"ParsedResults": [{"ParsedText": "Question 1 ?"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _make_screen(width: int, height: int) -> Image.Image:
+    """Génère une capture synthétique de QCM."""
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for y in range(40, height - 40, 28):
+        draw.text((60, y), f"Question {y // 28} : quelle est la bonne réponse ? A) oui B) non", fill="black")
+    return image
+
+
+def _send_base64(api: OCRSpaceAPI, image: Image.Image, url: str) -> int:
+    """Ancien format : JPEG encodé en base64 dans un champ de formulaire."""
+    image_b64 = base64.b64encode(api.encoder.encode(image).buffer.getvalue()).decode("utf-8")
+    data = {
+        "apikey": api.api_key,
+        "language": api.language,
+        "isOverlayRequired": False,
+        "base64Image": f"data:image/jpeg;base64,{image_b64}",
+        "OCREngine": api.engine,
+    }
+    response = api.session.post(url, data=data, timeout=api.timeout)
+    return len(response.request.body)
+
+
+def _send_multipart(api: OCRSpaceAPI, image: Image.Image, url: str) -> int:
+    """Nouveau format : fichier JPEG binaire en multipart."""
+    data, files = api._build_payload(image)
+    response = api.session.post(url, data=data, files=files, timeout=api.timeout)
+    return len(response.request.body)
+
+
+def _legacy_encode(image: Image.Image) -> int:
+    """Ancien encodage : JPEG qualité 85 optimisé, réencodé en qualité 70 si trop gros."""
+    buffered = io.BytesIO()
+    image.save(buffered, format="JPEG", quality=85, optimize=True)
+    if buffered.tell() > 900 * 1024:
+        buffered = io.BytesIO()
+        image.save(buffered, format="JPEG", quality=70, optimize=True)
+    return buffered.tell()
+
+
+def _compare_encoders(api: OCRSpaceAPI, screens: dict, runs: int):
+    """Affiche octets et durée médiane des deux encodeurs pour chaque capture."""
+    print(f"\n{'Capture':<10}{'Encodeur':<14}{'Octets (KB)':>12}{'Durée (ms)':>12}")
+    for name, image in screens.items():
+        for label, encode in (
+            ("ancien", lambda img: _legacy_encode(img.convert("RGB"))),
+            ("ImageEncoder", lambda img: api.encoder.encode(img).nbytes),
+        ):
+            durations = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                nbytes = encode(image)
+                durations.append((time.perf_counter() - start) * 1000)
+            durations.sort()
+            print(f"{name:<10}{label:<14}{nbytes / 1024:>12.1f}{durations[len(durations) // 2]:>12.1f}")
+
+
+def _measure(send, api, image, url, runs):
+    """Exécute `runs` envois et renvoie (octets, ms médian, pic mémoire en KB)."""
+    durations, peaks = [], []
+    for _ in range(runs):
+        frame = image.copy()
+        tracemalloc.start()
+        start = time.perf_counter()
+        body_bytes = send(api, frame, url)
+        durations.append((time.perf_counter() - start) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+    durations.sort()
+    return body_bytes, durations[len(durations) // 2], max(peaks)
+
+
+def main():
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--size", default="1920x1080")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOCRSpace)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/parse/image"
+
+    api = OCRSpaceAPI(api_key="benchmark")
+    image = _make_screen(width, height)
+
+    print(f"{'Format':<12}{'Corps (KB)':>12}{'Envoi (ms)':>12}{'Pic mém. (KB)':>15}")
+    for name, send in (("base64", _send_base64), ("multipart", _send_multipart)):
+        body_bytes, median_ms, peak_kb = _measure(send, api, image, url, args.runs)
+        print(f"{name:<12}{body_bytes / 1024:>12.1f}{median_ms:>12.1f}{peak_kb:>15.1f}")
+
+    noise = Image.effect_noise((width, height), 64).convert("RGB")
+    _compare_encoders(api, {"texte": image, "bruit": noise}, args.runs)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
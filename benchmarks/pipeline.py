@@ -0,0 +1,418 @@
+"""Benchmark de bout en bout du pipeline contre des serveurs OCRSpace et Groq locaux.
+
+ScreenTutorApp s'exécute tel quel (file des captures, boucle asyncio,
+OCRSpaceAPI, LLMClient, caches vidés avant chaque capture) ; seules la
+capture d'écran, remplacée par les images d'un corpus, et les API
+distantes, remplacées par stand_ins.py, sont simulées. Aucun accès réseau,
+clavier ou écran n'est nécessaire.
+
+Pour chaque étape (spans de src/metrics.py) : p50, p95 et pic de RSS
+pendant l'étape ; pour l'ensemble : débit et pic de RSS du processus.
+Les résultats sont comparés à une référence JSON : au-delà du seuil, le
+benchmark échoue (code de sortie 1).
+
+Corpus : dossier d'images (.png, .jpg), par exemple les captures
+enregistrées avec DEBUG_SAVE_SCREENSHOTS=true (debug_screenshots/). Un
+fichier <image>.txt à côté d'une image donne le texte renvoyé par l'OCR
+simulé. Sans corpus, des écrans de QCM synthétiques sont générés.
+
+Usage:
+    python benchmarks/pipeline.py [--corpus debug_screenshots] [--runs 20]
+        [--ocr-latency-ms 300] [--llm-latency-ms 200] [--jitter-ms 30]
+        [--error-rate 0.05] [--token-ms 5] [--no-stream] [--sync]
+        [--baseline benchmarks/baseline.json] [--threshold 0.2] [--update-baseline]
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from main import ScreenTutorApp  # noqa: E402
+from src.metrics import MetricsRegistry, spans_from_jsonl  # noqa: E402
+from stand_ins import GroqStandIn, OCRSpaceStandIn, StandInConfig, sample_qcm_text  # noqa: E402
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Écarts ignorés quelle que soit la valeur relative (bruit de mesure)
+_MIN_DELTA_MS = 2.0
+_MIN_DELTA_MB = 5.0
+
+
+def _synthetic_screen(text: str, size: Tuple[int, int] = (1920, 1080)) -> Image.Image:
+    """Écran de QCM synthétique : le texte au centre d'une page blanche."""
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, size[0], 60), fill=(40, 60, 120))
+    draw.multiline_text((size[0] // 4, 160), text, fill="black", spacing=10)
+    return image
+
+
+def load_corpus(directory: Optional[str], count: int = 4) -> List[Tuple[str, Image.Image, str]]:
+    """
+    Charge le corpus de captures (ou génère des écrans synthétiques).
+
+    Args:
+        directory: Dossier d'images (.png, .jpg, .jpeg), optionnel
+        count: Nombre d'écrans synthétiques si le dossier est vide ou absent
+
+    Returns:
+        Liste de (nom, image décodée, texte renvoyé par l'OCR simulé)
+    """
+    paths = []
+    if directory:
+        for pattern in ("*.png", "*.jpg", "*.jpeg"):
+            paths.extend(glob.glob(os.path.join(directory, pattern)))
+
+    corpus = []
+    for path in sorted(paths):
+        name = os.path.splitext(os.path.basename(path))[0]
+        sidecar = os.path.splitext(path)[0] + ".txt"
+        text = sample_qcm_text(seed=len(corpus))
+        if os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as f:
+                text = f.read()
+        with Image.open(path) as image:
+            corpus.append((name, image.convert("RGB"), text))
+
+    if not corpus:
+        for seed in range(count):
+            text = sample_qcm_text(questions=2 + seed % 3, seed=seed)
+            corpus.append((f"synthetique-{seed}", _synthetic_screen(text), text))
+    return corpus
+
+
+class CorpusCapture:
+    """Remplace ScreenCapture : renvoie tour à tour les images du corpus."""
+
+    def __init__(self, images: List[Image.Image], mode: str = "gray"):
+        """
+        Initialise la capture simulée.
+
+        Args:
+            images: Images décodées du corpus
+            mode: "gray" (conversion en niveaux de gris comme ScreenCapture) ou "rgb"
+        """
+        self.images = images
+        self.mode = mode
+        self.profile = None
+        self.last_timing: Dict[str, float] = {}
+        self.grab_count = 0
+
+    def capture_fullscreen(self) -> Image.Image:
+        """
+        Capture suivante du corpus.
+
+        Returns:
+            Image (copie : le pipeline peut la modifier)
+        """
+        start = time.perf_counter()
+        image = self.images[self.grab_count % len(self.images)].copy()
+        grabbed = time.perf_counter()
+        if self.mode == "gray":
+            image = image.convert("L")
+        self.last_timing = {
+            "grab_ms": (grabbed - start) * 1000,
+            "convert_ms": (time.perf_counter() - grabbed) * 1000,
+        }
+        self.grab_count += 1
+        return image
+
+    def close(self):
+        """Rien à libérer."""
+
+
+class RSSSampler:
+    """Relève périodiquement la mémoire résidente du processus (Linux)."""
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Initialise l'échantillonneur.
+
+        Args:
+            interval: Intervalle entre deux relevés (secondes)
+        """
+        self.interval = interval
+        self.times: List[float] = []
+        self.values: List[int] = []
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def rss(self) -> int:
+        """Mémoire résidente actuelle (octets), 0 si /proc est indisponible."""
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * self._page_size
+        except OSError:
+            return 0
+
+    def start(self):
+        """Démarre les relevés dans un thread dédié."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rss", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête les relevés."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Boucle de relevé."""
+        while True:
+            self.times.append(time.time())
+            self.values.append(self.rss())
+            if self._stop.wait(self.interval):
+                return
+
+    def peak(self, start: float, end: float) -> int:
+        """
+        Pic de RSS entre deux instants (relevé suivant inclus pour les
+        étapes plus courtes que l'intervalle).
+
+        Args:
+            start: Début (time.time)
+            end: Fin (time.time)
+
+        Returns:
+            Pic en octets (0 sans relevé)
+        """
+        first = bisect_left(self.times, start)
+        last = bisect_left(self.times, end + self.interval, lo=first)
+        window = self.values[first:last + 1]
+        return max(window) if window else 0
+
+
+def _configure_env(ocr_url: str, groq_url: str, args) -> Dict[str, str]:
+    """Variables d'environnement du pipeline mesuré (indépendantes du .env local)."""
+    env = {
+        "OCRSPACE_API_KEY": "benchmark",
+        "GROQ_API_KEY": "benchmark",
+        "OCRSPACE_API_URL": ocr_url,
+        "GROQ_BASE_URL": groq_url,
+        "NO_PROXY": "127.0.0.1,localhost",
+        "OCR_BACKEND": "ocrspace",
+        "USE_LLM": "true",
+        "LLM_STREAM": "false" if args.no_stream else "true",
+        "ASYNC_CLIENTS": "false" if args.sync else "true",
+        "SKIP_UNCHANGED": "false",
+        "USE_OVERLAY": "false",
+        "DEBUG_MODE": "false",
+        "DEBUG_SAVE_SCREENSHOTS": "false",
+        "PROFILE_PIPELINE": "",
+        "METRICS_JSONL_PATH": "",
+        "METRICS_PROMETHEUS_PATH": "",
+        "OCR_CACHE_PATH": "",
+        "LLM_CACHE_PATH": "",
+        "CAPTURE_PROFILES_PATH": "",
+        "CAPTURE_PROFILE": "",
+    }
+    os.environ.update(env)
+    return env
+
+
+def _capture_once(app: ScreenTutorApp):
+    """Une capture à froid (caches vidés) via la file des captures."""
+    app.ocr_cache.clear()
+    app.llm_cache.clear()
+    app.change_detector.reset()
+    app.jobs.submit()
+    app.jobs.wait_idle()
+
+
+def run_benchmark(args) -> dict:
+    """
+    Exécute le pipeline sur le corpus et mesure chaque étape.
+
+    Args:
+        args: Options de la ligne de commande
+
+    Returns:
+        Résultats (configuration, débit, RSS, statistiques par étape)
+    """
+    corpus = load_corpus(args.corpus)
+    ocr = OCRSpaceStandIn(
+        StandInConfig(args.ocr_latency_ms, args.jitter_ms, args.error_rate, seed=args.seed),
+        texts=[text for _, _, text in corpus]
+    )
+    groq = GroqStandIn(
+        StandInConfig(args.llm_latency_ms, args.jitter_ms, args.error_rate, args.token_ms, seed=args.seed + 1)
+    )
+    sampler = RSSSampler()
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(ocr)
+        stack.enter_context(groq)
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        tmp = stack.enter_context(tempfile.TemporaryDirectory())
+        _configure_env(ocr.url, groq.url, args)
+        app = ScreenTutorApp(background_warm_up=False, hotkeys=False)
+        try:
+            app.show_notification = lambda *_, **__: None
+            app.screen_capture = CorpusCapture([image for _, image, _ in corpus])
+            app.warm_up()
+            for _ in range(args.warmup):
+                _capture_once(app)
+
+            # Mesures sur les captures suivantes seulement
+            spans_path = os.path.join(tmp, "spans.jsonl")
+            app.metrics = MetricsRegistry(jsonl_path=spans_path)
+            sampler.start()
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                _capture_once(app)
+            duration = time.perf_counter() - start
+            sampler.stop()
+        finally:
+            app.close()
+        spans = spans_from_jsonl(spans_path) if os.path.exists(spans_path) else []
+        stats = app.metrics.get_stats()
+
+    peaks: Dict[str, int] = {}
+    for span in spans:
+        peak = sampler.peak(span["ts"], span["ts"] + span["duration_ms"] / 1000)
+        peaks[span["name"]] = max(peaks.get(span["name"], 0), peak)
+
+    return {
+        "config": {
+            "corpus": [name for name, _, _ in corpus],
+            "ocr_latency_ms": args.ocr_latency_ms,
+            "llm_latency_ms": args.llm_latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "token_ms": args.token_ms,
+            "stream": not args.no_stream,
+            "async_clients": not args.sync,
+        },
+        "runs": args.runs,
+        "succeeded": sum(1 for span in spans if span["name"] == "render"),
+        "duration_s": round(duration, 3),
+        "throughput_per_s": round(args.runs / duration, 3) if duration else 0.0,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": {
+            name: {
+                "count": summary["count"],
+                "p50_ms": summary["p50_ms"],
+                "p95_ms": summary["p95_ms"],
+                "peak_rss_mb": round(peaks.get(name, 0) / (1024 * 1024), 1),
+            }
+            for name, summary in sorted(stats.items())
+        },
+    }
+
+
+def compare(baseline: dict, results: dict, threshold: float) -> List[str]:
+    """
+    Liste les régressions par rapport à la référence.
+
+    Une latence ou un pic de RSS régresse s'il dépasse la référence de plus
+    de `threshold` (relatif) et d'un écart absolu minimal ; le débit
+    régresse s'il baisse de plus de `threshold`.
+
+    Args:
+        baseline: Résultats de référence
+        results: Résultats de cette exécution
+        threshold: Seuil relatif (0.2 = 20 %)
+
+    Returns:
+        Descriptions des régressions (vide si aucune)
+    """
+    regressions = []
+    if results["throughput_per_s"] < baseline["throughput_per_s"] * (1 - threshold):
+        regressions.append(
+            f"débit {results['throughput_per_s']:.2f}/s (référence {baseline['throughput_per_s']:.2f}/s)"
+        )
+    for name, reference in baseline["stages"].items():
+        current = results["stages"].get(name)
+        if current is None:
+            continue
+        for key, min_delta, unit in (
+            ("p50_ms", _MIN_DELTA_MS, "ms"),
+            ("p95_ms", _MIN_DELTA_MS, "ms"),
+            ("peak_rss_mb", _MIN_DELTA_MB, "MB"),
+        ):
+            limit = max(reference[key] * (1 + threshold), reference[key] + min_delta)
+            if current[key] > limit:
+                regressions.append(f"{name} {key} {current[key]:.1f} {unit} (référence {reference[key]:.1f} {unit})")
+    return regressions
+
+
+def _print_results(results: dict, baseline: Optional[dict]):
+    """Affiche le tableau des étapes, avec la référence si elle existe."""
+    reference = (baseline or {}).get("stages", {})
+    print(f"{'Étape':<16}{'n':>5}{'p50 (ms)':>10}{'p95 (ms)':>10}{'RSS (MB)':>10}{'réf. p95':>10}")
+    for name, stage in results["stages"].items():
+        ref = reference.get(name, {}).get("p95_ms")
+        ref_text = f"{ref:>10.1f}" if ref is not None else f"{'-':>10}"
+        print(f"{name:<16}{stage['count']:>5}{stage['p50_ms']:>10.1f}{stage['p95_ms']:>10.1f}"
+              f"{stage['peak_rss_mb']:>10.1f}{ref_text}")
+    print(f"\nCaptures: {results['succeeded']}/{results['runs']} réussies en {results['duration_s']:.1f} s "
+          f"({results['throughput_per_s']:.2f}/s), pic RSS {results['peak_rss_mb']:.0f} MB")
+
+
+def main():
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=None, help="Dossier de captures (synthétiques si absent)")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2, help="Captures non mesurées avant les mesures")
+    parser.add_argument("--ocr-latency-ms", type=float, default=300)
+    parser.add_argument("--llm-latency-ms", type=float, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=30)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--token-ms", type=float, default=5, help="Délai entre deux fragments SSE")
+    parser.add_argument("--no-stream", action="store_true", help="Réponses LLM non diffusées")
+    parser.add_argument("--sync", action="store_true", help="Clients requests au lieu de httpx")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2, help="Régression tolérée (0.2 = 20 %%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="Afficher la sortie de l'application")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_results(results, baseline)
+
+    if baseline is None:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Référence enregistrée: {args.baseline}")
+        return
+
+    if baseline["config"] != results["config"]:
+        print("\n⚠️  Configuration différente de la référence (relancer avec --update-baseline)")
+        sys.exit(2)
+
+    regressions = compare(baseline, results, args.threshold)
+    if regressions:
+        print(f"\n❌ Régressions (seuil {args.threshold:.0%}):")
+        for regression in regressions:
+            print(f"   {regression}")
+        sys.exit(1)
+    print(f"\n✓ Aucune régression (seuil {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Génère des pages de QCM synthétiques avec leur texte de référence.
+
+Chaque page varie la police, la taille du texte, le thème (clair, sombre,
+faible contraste), la résolution et le bruit ; toutes les variations sont
+tirées d'une graine, de sorte qu'un même `--seed` redonne les mêmes pages
+(à polices installées identiques). Le texte de référence est exactement
+celui dessiné, ligne par ligne.
+
+Le dossier produit (<page>.png + <page>.txt + manifest.json) sert de
+corpus à benchmarks/ocr_accuracy.py et à benchmarks/pipeline.py.
+
+Usage:
+    python benchmarks/qcm_corpus.py --out qcm_corpus [--count 24] [--seed 0]
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+
+# Thèmes : (fond, texte, bandeau)
+THEMES: Dict[str, Tuple[tuple, tuple, tuple]] = {
+    "clair": ((255, 255, 255), (20, 20, 20), (40, 60, 120)),
+    "sombre": ((30, 30, 30), (225, 225, 225), (60, 60, 60)),
+    "contraste faible": ((235, 235, 235), (120, 120, 120), (200, 200, 210)),
+}
+RESOLUTIONS: List[Tuple[int, int]] = [(1280, 720), (1920, 1080), (2560, 1440)]
+FONT_SIZES: List[int] = [14, 18, 24, 32]
+NOISE_LEVELS: List[float] = [0.0, 8.0, 20.0]
+
+# Police fournie avec Pillow : présente partout, donc reproductible
+DEFAULT_FONT = "pillow"
+_FONT_DIRS = (
+    "/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts"),
+    "/Library/Fonts", "/System/Library/Fonts", "C:\\Windows\\Fonts",
+)
+
+_STEMS = [
+    "Quelle est la capitale de {pays} ?",
+    "Quel élément chimique a pour symbole {symbole} ?",
+    "En quelle année a eu lieu {evenement} ?",
+    "Lequel de ces nombres est premier ?",
+    "Quelle est la dérivée de {fonction} ?",
+    "Quel auteur a écrit « {livre} » ?",
+    "Combien font {a} × {b} ?",
+    "Quelle structure de données suit le principe FIFO ?",
+]
+_FILLERS = {
+    "pays": ["la France", "l'Espagne", "la Norvège", "le Japon", "l'Égypte"],
+    "symbole": ["Fe", "Na", "Au", "Hg", "K"],
+    "evenement": ["la prise de la Bastille", "la chute du mur de Berlin", "le premier pas sur la Lune"],
+    "fonction": ["x² + 3x", "sin(x)", "e^(2x)", "ln(x)"],
+    "livre": ["Les Misérables", "L'Étranger", "Germinal", "Le Petit Prince"],
+}
+_OPTIONS = [
+    "Paris", "Madrid", "Oslo", "Tokyo", "Le Caire", "Le fer", "Le sodium", "L'or",
+    "1789", "1989", "1969", "2x + 3", "cos(x)", "2e^(2x)", "1/x", "Victor Hugo",
+    "Albert Camus", "Émile Zola", "Saint-Exupéry", "Une pile", "Une file", "Un arbre",
+    "Aucune de ces réponses", "Toutes ces réponses", "17", "21", "42", "56", "63",
+]
+
+
+@dataclass
+class PageSpec:
+    """Paramètres de rendu d'une page."""
+
+    name: str
+    seed: int
+    font: str
+    font_size: int
+    theme: str
+    resolution: Tuple[int, int]
+    noise: float
+    questions: int
+
+
+@dataclass
+class Page:
+    """Page rendue et son texte de référence."""
+
+    spec: PageSpec
+    image: Image.Image
+    text: str
+
+
+def discover_fonts(limit: int = 4) -> List[str]:
+    """
+    Polices disponibles : celle de Pillow puis des polices TrueType installées.
+
+    Args:
+        limit: Nombre maximal de polices
+
+    Returns:
+        Noms ("pillow") ou chemins de fichiers .ttf/.otf, triés
+    """
+    paths = set()
+    for directory in _FONT_DIRS:
+        for pattern in ("**/*.ttf", "**/*.otf"):
+            paths.update(glob.glob(os.path.join(directory, pattern), recursive=True))
+    regular = sorted(p for p in paths if not any(s in os.path.basename(p) for s in ("Bold", "Italic", "Oblique")))
+    return [DEFAULT_FONT] + regular[:max(0, limit - 1)]
+
+
+def _load_font(font: str, size: int) -> ImageFont.ImageFont:
+    """Charge une police à la taille demandée."""
+    if font == DEFAULT_FONT:
+        return ImageFont.load_default(size=size)
+    return ImageFont.truetype(font, size)
+
+
+def _question(rng: random.Random, number: int) -> List[str]:
+    """Énoncé et options d'une question (lignes de référence)."""
+    stem = rng.choice(_STEMS).format(
+        **{key: rng.choice(values) for key, values in _FILLERS.items()},
+        a=rng.randint(3, 12), b=rng.randint(3, 12)
+    )
+    options = rng.sample(_OPTIONS, 4)
+    return [f"{number}. {stem}"] + [f"{letter}) {option}" for letter, option in zip("ABCD", options)]
+
+
+def _wrap(line: str, font: ImageFont.ImageFont, width: int) -> List[str]:
+    """Coupe une ligne trop longue aux espaces."""
+    words, lines, current = line.split(" "), [], ""
+    for word in words:
+        candidate = f"{current} {word}".strip()
+        if current and font.getlength(candidate) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    return lines + [current]
+
+
+def render_page(spec: PageSpec) -> Page:
+    """
+    Dessine une page de QCM.
+
+    Les questions qui ne tiennent pas dans la hauteur sont abandonnées :
+    le texte de référence ne contient que ce qui est visible.
+
+    Args:
+        spec: Paramètres de la page
+
+    Returns:
+        Page rendue avec son texte de référence
+    """
+    rng = random.Random(spec.seed)
+    width, height = spec.resolution
+    background, foreground, banner = THEMES[spec.theme]
+    font = _load_font(spec.font, spec.font_size)
+    line_height = int(spec.font_size * 1.5)
+
+    image = Image.new("RGB", spec.resolution, background)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, width, height // 18), fill=banner)
+
+    left, top = width // 8, height // 8
+    usable = width - 2 * left
+    y, drawn = top, []
+    for number in range(1, spec.questions + 1):
+        block = [wrapped for line in _question(rng, number) for wrapped in _wrap(line, font, usable)]
+        if y + line_height * len(block) > height - top:
+            break
+        for line in block:
+            draw.text((left, y), line, fill=foreground, font=font)
+            y += line_height
+        drawn.extend(block)
+        y += line_height
+
+    if spec.noise:
+        pixels = np.asarray(image, dtype=np.float32)
+        noise = np.random.default_rng(spec.seed).normal(0, spec.noise, pixels.shape)
+        image = Image.fromarray(np.clip(pixels + noise, 0, 255).astype(np.uint8))
+
+    return Page(spec, image, "\n".join(drawn))
+
+
+def generate_corpus(count: int = 24, seed: int = 0, fonts: Optional[List[str]] = None) -> List[Page]:
+    """
+    Génère un corpus de pages variées, reproductible à partir de la graine.
+
+    Args:
+        count: Nombre de pages
+        seed: Graine des tirages
+        fonts: Polices utilisables (discover_fonts() par défaut)
+
+    Returns:
+        Pages rendues
+    """
+    rng = random.Random(seed)
+    fonts = fonts or discover_fonts()
+    pages = []
+    for index in range(count):
+        spec = PageSpec(
+            name=f"qcm-{seed}-{index:03d}",
+            seed=rng.randrange(2 ** 32),
+            font=rng.choice(fonts),
+            font_size=rng.choice(FONT_SIZES),
+            theme=rng.choice(list(THEMES)),
+            resolution=rng.choice(RESOLUTIONS),
+            noise=rng.choice(NOISE_LEVELS),
+            questions=rng.randint(1, 4),
+        )
+        pages.append(render_page(spec))
+    return pages
+
+
+def save_corpus(pages: List[Page], directory: str):
+    """
+    Écrit les pages (PNG), leur texte (.txt) et le manifeste des paramètres.
+
+    Args:
+        pages: Pages rendues
+        directory: Dossier de sortie (créé si absent)
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = []
+    for page in pages:
+        base = os.path.join(directory, page.spec.name)
+        page.image.save(f"{base}.png")
+        with open(f"{base}.txt", "w", encoding="utf-8") as f:
+            f.write(page.text)
+        manifest.append(asdict(page.spec))
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    """Point d'entrée du générateur."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="Dossier de sortie")
+    parser.add_argument("--count", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fonts", type=int, default=4, help="Nombre maximal de polices")
+    args = parser.parse_args()
+
+    pages = generate_corpus(args.count, args.seed, discover_fonts(args.fonts))
+    save_corpus(pages, args.out)
+    print(f"✓ {len(pages)} pages écrites dans {args.out}")
+
+
+if __name__ == "__main__":
+    main()
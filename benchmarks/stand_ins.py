@@ -0,0 +1,296 @@
+"""Serveurs HTTP locaux imitant OCRSpace et Groq pour les benchmarks.
+
+Chaque serveur répond au format de l'API réelle, après une latence
+configurable (moyenne ± gigue), et échoue sur une fraction des requêtes.
+Le serveur Groq diffuse sa réponse en SSE, fragment par fragment, quand
+la requête le demande (`"stream": true`).
+
+Usage (depuis un benchmark):
+    with OCRSpaceStandIn(StandInConfig(latency_ms=300)) as ocr:
+        os.environ["OCRSPACE_API_URL"] = ocr.url
+"""
+
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.questions import parse_questions  # noqa: E402
+
+
+@dataclass
+class StandInConfig:
+    """Comportement d'un serveur de remplacement."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    # Délai entre deux fragments SSE (Groq en streaming)
+    token_ms: float = 0.0
+    seed: int = 0
+
+
+class _StandInServer:
+    """Serveur HTTP local dans un thread, avec tirages reproductibles."""
+
+    handler = BaseHTTPRequestHandler
+    path = "/"
+
+    def __init__(self, config: Optional[StandInConfig] = None):
+        """
+        Initialise le serveur (démarré par start() ou `with`).
+
+        Args:
+            config: Latence, gigue, taux d'erreur (aucun par défaut)
+        """
+        self.config = config or StandInConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+
+    @property
+    def url(self) -> str:
+        """URL de l'API imitée."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}{self.path}"
+
+    def start(self) -> "_StandInServer":
+        """Démarre le serveur dans un thread."""
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Arrête le serveur."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def draw(self) -> tuple:
+        """
+        Tire la latence et l'échec d'une requête.
+
+        Returns:
+            Tuple (latence en secondes, True si la requête doit échouer)
+        """
+        with self._lock:
+            self.requests += 1
+            latency = self.config.latency_ms + self._random.uniform(-1, 1) * self.config.jitter_ms
+            failed = self._random.random() < self.config.error_rate
+            self.errors += failed
+        return max(0.0, latency) / 1000, failed
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Base commune : corps JSON, préchauffage HEAD, journal désactivé."""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def stand_in(self):
+        return self.server.stand_in
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def _uploaded_image(content_type: str, body: bytes) -> Optional[Image.Image]:
+    """Image envoyée dans le champ `file` d'une requête multipart."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    for part in message.iter_parts():
+        if part.get_param("name", header="content-disposition") == "file":
+            return Image.open(io.BytesIO(part.get_payload(decode=True)))
+    return None
+
+
+class _OCRSpaceHandler(_Handler):
+    """POST /parse/image : texte reconnu dans l'image envoyée, ou texte suivant de la liste."""
+
+    def do_POST(self):
+        body = self._read_body()
+        latency, failed = self.stand_in.draw()
+        start = time.perf_counter()
+        text = None
+        if self.stand_in.recognize is not None and not failed:
+            image = _uploaded_image(self.headers["Content-Type"], body)
+            text = self.stand_in.recognize(image) if image is not None else ""
+        # La latence simulée s'ajoute au temps de reconnaissance locale
+        recognize_s = time.perf_counter() - start
+        time.sleep(latency)
+        latency += recognize_s
+        if failed:
+            self._send_json({
+                "IsErroredOnProcessing": True,
+                "ErrorMessage": ["E500: erreur simulée"],
+                "ProcessingTimeInMilliseconds": str(int(latency * 1000)),
+            })
+            return
+        self._send_json({
+            "IsErroredOnProcessing": False,
+            "ParsedResults": [{"ParsedText": text if text is not None else self.stand_in.next_text()}],
+            "ProcessingTimeInMilliseconds": str(int(latency * 1000)),
+        })
+
+
+class OCRSpaceStandIn(_StandInServer):
+    """Remplaçant local de https://api.ocr.space/parse/image.
+
+    Par défaut, le serveur ne lit pas les images : il renvoie tour à tour
+    les textes fournis (transcriptions du corpus), ce qui suffit à mesurer
+    le pipeline client. Avec `recognize` (ex: un moteur Tesseract local),
+    il décode l'image reçue et renvoie le texte reconnu, ce qui rend
+    mesurable l'effet de l'encodage sur la précision.
+    """
+
+    handler = _OCRSpaceHandler
+    path = "/parse/image"
+
+    def __init__(
+        self,
+        config: Optional[StandInConfig] = None,
+        texts: Optional[List[str]] = None,
+        recognize: Optional[Callable[[Image.Image], str]] = None
+    ):
+        """
+        Initialise le serveur.
+
+        Args:
+            config: Latence, gigue, taux d'erreur
+            texts: Textes renvoyés à tour de rôle (un QCM générique par défaut)
+            recognize: Reconnaissance de l'image envoyée (remplace `texts`)
+        """
+        super().__init__(config)
+        self.texts = texts or [sample_qcm_text()]
+        self.recognize = recognize
+        self._next = 0
+
+    def next_text(self) -> str:
+        """Texte de la requête suivante."""
+        with self._lock:
+            text = self.texts[self._next % len(self.texts)]
+            self._next += 1
+        return text
+
+
+class _GroqHandler(_Handler):
+    """POST /openai/v1/chat/completions : réponse complète ou flux SSE."""
+
+    def do_POST(self):
+        payload = json.loads(self._read_body() or b"{}")
+        latency, failed = self.stand_in.draw()
+        time.sleep(latency)
+        if failed:
+            self._send_json({"error": {"message": "erreur simulée"}}, status=503)
+            return
+
+        answer = answer_for(payload["messages"][-1]["content"])
+        if not payload.get("stream"):
+            self._send_json({
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}}],
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for chunk in _tokens(answer):
+            event = {"choices": [{"index": 0, "delta": {"content": chunk}}]}
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(self.stand_in.config.token_ms / 1000)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class GroqStandIn(_StandInServer):
+    """Remplaçant local de l'API chat/completions de Groq (compatible OpenAI)."""
+
+    handler = _GroqHandler
+    path = "/openai/v1"
+
+
+def _tokens(text: str, size: int = 4) -> List[str]:
+    """Découpe une réponse en fragments de quelques mots (≈ jetons SSE)."""
+    words = text.split(" ")
+    return [" ".join(words[i:i + size]) + (" " if i + size < len(words) else "")
+            for i in range(0, len(words), size)]
+
+
+def answer_for(prompt: str) -> str:
+    """
+    Réponse au format QCM_PROMPT : un bloc par question du texte envoyé.
+
+    Args:
+        prompt: Message utilisateur envoyé au LLM
+
+    Returns:
+        Réponse formatée (un bloc "❓ QUESTION n" par question)
+    """
+    text = prompt.split("\n\n", 1)[-1]
+    questions = parse_questions(text) or [None]
+    blocks = []
+    for number, question in enumerate(questions, start=1):
+        stem = question.stem if question is not None else "Question"
+        blocks.append(
+            f"❓ QUESTION {number}: {stem}\n"
+            f"✅ RÉPONSE: A\n"
+            f"💡 EXPLICATION: Réponse simulée par le serveur local de benchmark."
+        )
+    return "\n\n---\n\n".join(blocks)
+
+
+def sample_qcm_text(questions: int = 3, seed: int = 0) -> str:
+    """
+    Texte de QCM générique, tel que renvoyé par l'OCR.
+
+    Args:
+        questions: Nombre de questions
+        seed: Variante (le texte change avec la graine)
+
+    Returns:
+        Texte du QCM
+    """
+    lines = []
+    for n in range(1, questions + 1):
+        lines.append(f"{n}. Quelle est la bonne réponse à la question {seed}-{n} ?")
+        lines.extend(f"{letter}) Option {letter.lower()} de la question {n}" for letter in "ABCD")
+        lines.append("")
+    return "\n".join(lines).strip()
@@ -0,0 +1,90 @@
+"""Compare le coût par appel des moteurs Tesseract (pytesseract et tesserocr).
+
+pytesseract écrit l'image dans un fichier temporaire et lance un processus
+`tesseract` qui recharge les modèles à chaque appel ; tesserocr garde l'API
+chargée dans le processus. Le benchmark mesure la durée médiane d'un appel
+sur une petite image (coût fixe dominant) et sur une capture de QCM, puis
+compare l'OCR de la page par un seul appel et par bandes en parallèle
+(ParallelOCR).
+
+Usage:
+    python benchmarks/tesseract_engines.py [--runs 10] [--lang fra+eng] [--workers 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.ocr import create_engine  # noqa: E402
+from src.ocr_parallel import ParallelOCR  # noqa: E402
+
+
+def _images():
+    """Images de test : une ligne courte et une page de QCM."""
+    small = Image.new("L", (200, 40), 255)
+    ImageDraw.Draw(small).text((5, 12), "A) Paris", fill=0)
+
+    page = Image.new("L", (1000, 600), 255)
+    draw = ImageDraw.Draw(page)
+    lines = ["Question 1 : Quelle est la capitale de la France ?", "A) Paris", "B) Lyon", "C) Lille"]
+    for i, line in enumerate(lines * 4):
+        draw.text((40, 30 + 32 * i), line, fill=0)
+    return {"ligne": small, "page": page.resize((2000, 1200))}
+
+
+def _median_ms(engine, image, runs):
+    """Durée médiane d'un appel en millisecondes."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        engine.recognize(image)
+        durations.append((time.perf_counter() - start) * 1000)
+    durations.sort()
+    return durations[len(durations) // 2]
+
+
+def main():
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--lang", default="fra+eng")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    images = _images()
+    available = []
+
+    print(f"{'Moteur':<14}{'Init (ms)':>10}" + "".join(f"{name + ' (ms)':>14}" for name in images))
+    for name in ("pytesseract", "tesserocr"):
+        start = time.perf_counter()
+        try:
+            engine = create_engine(name, lang=args.lang)
+            # Premier appel : vérifie que le moteur fonctionne
+            engine.recognize(images["ligne"])
+        except Exception as e:
+            print(f"{name:<14}indisponible ({e.__class__.__name__}: {e})")
+            continue
+        init_ms = (time.perf_counter() - start) * 1000
+        timings = [_median_ms(engine, image, args.runs) for image in images.values()]
+        print(f"{name:<14}{init_ms:>10.0f}" + "".join(f"{ms:>14.1f}" for ms in timings))
+        engine.close()
+        available.append((name, timings[-1]))
+
+    # Page complète : un appel contre des bandes en parallèle
+    for name, single_ms in available:
+        ocr = ParallelOCR(workers=args.workers, lang=args.lang, engine=name)
+        ocr.warm_up()
+        parallel_ms = _median_ms(ocr, images["page"], args.runs)
+        ocr.close()
+        print(
+            f"\n{name} page : 1 appel {single_ms:.0f} ms, "
+            f"{len(ocr.last_bands)} bandes / {args.workers} processus {parallel_ms:.0f} ms "
+            f"(x{single_ms / parallel_ms:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,292 @@
 """Point d'entrée principal de l'application Screen Tutor Assistant (version terminal)."""
 
+import time
+
+# Instant de lancement, référence du temps de démarrage
+_LAUNCHED_AT = time.perf_counter()
+
 import os
 import sys
+import asyncio
 import threading
 import subprocess
+import concurrent.futures
 from typing import Optional
-from dotenv import load_dotenv
-from pynput import keyboard as kb
 
-# Import des modules locaux
-from src.capture import capture_screen
-from src.ocr_api import OCRSpaceAPI
-from src.llm_client import create_llm_client
+# Les modules locaux (NumPy, PIL, requests, httpx...) sont importés dans
+# _build_components, une fois le listener clavier démarré
+from src.jobs import CoalescingJobQueue, Job
+from src.metrics import MetricsRegistry
+from src.startup import StartupTimer, run_warm_up
 
 
 class ScreenTutorApp:
     """Application principale Screen Tutor Assistant."""
 
-    def __init__(self):
-        """Initialise l'application."""
-        # Charger les variables d'environnement
-        load_dotenv()
+    def __init__(
+        self,
+        startup: Optional[StartupTimer] = None,
+        background_warm_up: bool = True,
+        hotkeys: bool = True
+    ):
+        """
+        Initialise l'application (variables d'environnement déjà chargées).
+
+        Args:
+            startup: Chronomètre du démarrage (créé si absent)
+            background_warm_up: Préchauffer dans un thread (sinon, l'appelant
+                appelle warm_up() lui-même, comme --startup-profile)
+            hotkeys: Écouter le clavier (False : pilotage par le code, sans
+                pynput ni serveur d'affichage, comme benchmarks/pipeline.py)
+        """
+        self.startup = startup or StartupTimer(start=_LAUNCHED_AT)
 
         # Configuration
         self.debug_mode = os.getenv("DEBUG_MODE", "false").lower() == "true"
         self.debug_save = os.getenv("DEBUG_SAVE_SCREENSHOTS", "false").lower() == "true"
         self.ocr_lang = os.getenv("OCR_LANGUAGE", "fre")
         self.use_llm = os.getenv("USE_LLM", "false").lower() == "true"
+        self.segment_questions = os.getenv("SEGMENT_QUESTIONS", "true").lower() == "true"
+        self.stream_llm = os.getenv("LLM_STREAM", "true").lower() == "true"
+        self.pipeline_timeout = float(os.getenv("PIPELINE_TIMEOUT", "60"))
+        self.llm_concurrency = int(os.getenv("LLM_CONCURRENCY", "1"))
+        self.startup_budget_ms = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+
+        # Latences par étape (histogrammes en mémoire, export JSON lines / Prometheus)
+        self.metrics = MetricsRegistry(
+            jsonl_path=os.getenv("METRICS_JSONL_PATH") or None,
+            prometheus_path=os.getenv("METRICS_PROMETHEUS_PATH") or None
+        )
+
+        # Profilage CPU / mémoire de chaque capture (module importé seulement si activé)
+        self.profiler = None
+        profile_mode = os.getenv("PROFILE_PIPELINE", "").lower()
+        if profile_mode:
+            from src.profiling import PipelineProfiler
+            self.profiler = PipelineProfiler(
+                mode=profile_mode,
+                output_dir=os.getenv("PROFILE_DIR", "profiles"),
+                keep=int(os.getenv("PROFILE_KEEP", "20"))
+            )
 
-        # Composants
-        self.ocr_api = OCRSpaceAPI(language=self.ocr_lang)
-        
-        # LLM optionnel (si activé)
-        self.llm_client = None
-        if self.use_llm:
-            try:
-                self.llm_client = create_llm_client()
-                print("   LLM: ✓ Activé (Groq API)")
-            except Exception as e:
-                print(f"   LLM: ✗ Désactivé ({e})")
-                self.use_llm = False
+        # Enregistrement / rejeu de la session (module importé seulement si activé)
+        self.cassette = None
+        if os.getenv("CASSETTE_MODE"):
+            from src.cassette import get_cassette
+            self.cassette = get_cassette()
 
         # Dernier résultat (pour copier)
         self.last_result = ""
 
-        # État
-        self.is_processing = False
+        # File des captures : un seul traitement à la fois, les appuis
+        # reçus entre-temps sont regroupés en une capture de l'écran le plus récent
+        self.ready = threading.Event()
+        self.jobs = CoalescingJobQueue(self.process_screen_capture, name="captures")
+
+        # Raccourcis actifs au plus tôt : un appui pendant l'initialisation
+        # attend que les composants soient prêts
+        self.listener = None
+        if hotkeys:
+            with self.startup.phase("listener clavier"):
+                self._start_listener()
+
+        self._build_components()
+        ready_ms = self.startup.mark_ready()
+        self.ready.set()
 
         print("🚀 Screen Tutor Assistant démarré")
-        print(f"   OCR: OCRSpace API ({self.ocr_lang})")
+        print(f"   OCR: {' + '.join(self.ocr_backends)}")
+        print(f"   Profil de capture: {self.capture_profiles.active}")
         print(f"   Mode debug: {'✓ Activé' if self.debug_mode else '✗ Désactivé'}")
+        print(f"   Prêt en {ready_ms:.0f} ms")
+        if ready_ms > self.startup_budget_ms:
+            print(f"⚠️  Démarrage au-delà du budget ({self.startup_budget_ms:.0f} ms), voir --startup-profile")
+        if self.debug_mode:
+            print(self.startup.report())
         print("\n📌 Raccourcis:")
         print("   = - Capturer l'écran et analyser")
+        print("   * - Changer de profil de capture")
         print("   ESC - Quitter l'application")
         print("\n✨ Les réponses s'afficheront en popup")
         print("En attente...\n")
 
+        # Codecs, connexions HTTPS, moteur Tesseract et client LLM en arrière-plan
+        if background_warm_up:
+            threading.Thread(target=self.warm_up, daemon=True).start()
+
+    def _start_listener(self):
+        """Démarre l'écoute des raccourcis clavier."""
+        from pynput import keyboard as kb
+
+        self._esc_key = kb.Key.esc
+        self.listener = kb.Listener(on_press=self.on_press)
+        self.listener.start()
+
+    def _build_components(self):
+        """Importe les modules et crée les composants, étape par étape."""
+        with self.startup.phase("boucle asyncio"):
+            from src.event_loop import EventLoopThread
+            from src import async_clients
+
+            # Pipeline asyncio : clients httpx (HTTP/2) si disponibles,
+            # sinon clients synchrones exécutés dans des threads
+            self.async_clients = (
+                os.getenv("ASYNC_CLIENTS", "true").lower() == "true" and async_clients.is_available()
+            )
+            self.event_loop = EventLoopThread()
+
+        with self.startup.phase("caches"):
+            from src.cache import ResultCache
+
+            # Cache OCR (mémoire + SQLite optionnel)
+            self.ocr_cache = ResultCache(
+                max_bytes=int(float(os.getenv("OCR_CACHE_MAX_MB", "16")) * 1024 * 1024),
+                db_path=os.getenv("OCR_CACHE_PATH") or None,
+                namespace="ocr"
+            )
+
+            # Cache des réponses LLM (texte normalisé, TTL)
+            llm_cache_ttl = float(os.getenv("LLM_CACHE_TTL", "86400"))
+            self.llm_cache = ResultCache(
+                max_entries=512,
+                db_path=os.getenv("LLM_CACHE_PATH") or None,
+                namespace="llm",
+                ttl=llm_cache_ttl if llm_cache_ttl > 0 else None
+            )
+
+        with self.startup.phase("capture"):
+            from src.capture import ScreenCapture
+            from src.capture_profiles import ProfileStore
+            from src.change_detect import ScreenChangeDetector
+
+            # Détection d'écran inchangé (hachage perceptuel)
+            self.skip_unchanged = os.getenv("SKIP_UNCHANGED", "true").lower() == "true"
+            self.change_detector = ScreenChangeDetector(
+                threshold=int(os.getenv("CHANGE_THRESHOLD", "2"))
+            )
+
+            # Recadrage sur la zone de texte avant l'OCR
+            self.auto_crop = os.getenv("AUTO_CROP", "true").lower() == "true"
+            if self.auto_crop:
+                from src.text_region import crop_to_text
+                self._crop_to_text = crop_to_text
+
+            self.capture_profiles = ProfileStore(
+                path=os.getenv("CAPTURE_PROFILES_PATH", "capture_profiles.json"),
+                active=os.getenv("CAPTURE_PROFILE") or None
+            )
+            if self.cassette is not None and not self.cassette.recording:
+                # Rejeu : captures de la cassette au lieu de l'écran
+                from src.cassette import CassetteCapture
+                self.screen_capture = CassetteCapture(self.cassette)
+            else:
+                self.screen_capture = ScreenCapture(
+                    debug_mode=self.debug_save,
+                    debug_save_path="debug_screenshots" if self.debug_save else None,
+                    mode=os.getenv("CAPTURE_MODE", "gray").lower(),
+                    profile=self.capture_profiles.current
+                )
+
+        with self.startup.phase("moteur OCR"):
+            from src.encoder import ImageEncoder
+            from src.ocr_backends import backend_parts, create_backend
+
+            encoder = ImageEncoder(
+                max_bytes=int(float(os.getenv("OCR_UPLOAD_MAX_KB", "900")) * 1024),
+                grayscale=os.getenv("OCR_GRAYSCALE", "true").lower() == "true"
+            )
+
+            # Moteur OCR (ocrspace, tesseract, hybrid...), importé seulement s'il est choisi
+            self.ocr_backend = os.getenv("OCR_BACKEND", "ocrspace").lower()
+            self.ocr_api = create_backend(
+                self.ocr_backend,
+                language=self.ocr_lang,
+                cache=self.ocr_cache,
+                encoder=encoder,
+                use_async=self.async_clients,
+                tesseract_lang=os.getenv("TESSERACT_LANG", "fra+eng"),
+                tesseract_workers=int(os.getenv("TESSERACT_WORKERS", "1")),
+                hybrid_backends=os.getenv("OCR_HYBRID_BACKENDS", "ocrspace,tesseract"),
+                quality_bar=float(os.getenv("OCR_QUALITY_BAR", "0.6"))
+            )
+            self.ocr_backends = backend_parts(self.ocr_api, self.ocr_backend)
+
+        # LLM optionnel (si activé)
+        self.llm_client = None
+        self.question_answerer = None
+        if self.use_llm:
+            with self.startup.phase("client LLM"):
+                try:
+                    if self.async_clients:
+                        self.llm_client = async_clients.create_async_llm_client(cache=self.llm_cache)
+                    else:
+                        from src.llm_client import create_llm_client
+                        self.llm_client = create_llm_client(cache=self.llm_cache)
+                    if self.segment_questions:
+                        from src.questions import QuestionAnswerer
+                        self.question_answerer = QuestionAnswerer(self.llm_client, self.llm_cache)
+                    print("   LLM: ✓ Activé (Groq API)")
+                except Exception as e:
+                    print(f"   LLM: ✗ Désactivé ({e})")
+                    self.use_llm = False
+
+        # Fenêtre overlay optionnelle (réponses affichées au fil de l'eau)
+        self.overlay = None
+        if os.getenv("USE_OVERLAY", "false").lower() == "true":
+            with self.startup.phase("overlay"):
+                from src.ui import OverlayWindow
+                self.overlay = OverlayWindow()
+
+    def _warm_up_tasks(self):
+        """
+        Tâches de préchauffage, des plus utiles aux moins utiles.
+
+        Returns:
+            Liste de (nom, fonction sans argument)
+        """
+        tasks = [("codecs PIL", self._warm_up_codecs)]
+        for name, backend in self.ocr_backends.items():
+            if hasattr(backend, "warm_up"):
+                tasks.append((f"OCR {name}", lambda backend=backend: self._warm_up_client(backend)))
+        if self.llm_client:
+            tasks.append(("LLM Groq", lambda: self._warm_up_client(self.llm_client)))
+        return tasks
+
+    def _warm_up_codecs(self):
+        """Charge les codecs PIL et l'encodeur avant la première capture."""
+        from PIL import Image
+
+        Image.init()
+        for backend in self.ocr_backends.values():
+            encoder = getattr(backend, "encoder", None)
+            if encoder is not None:
+                encoder.encode(Image.new("L", (64, 64), 255))
+
+    def _warm_up_client(self, client):
+        """
+        Préchauffe un client (connexion HTTPS ou modèles Tesseract).
+
+        Args:
+            client: Objet dont warm_up() (éventuellement coroutine) renvoie
+                une durée, ou None en cas d'échec
+
+        Raises:
+            ConnectionError: Si le préchauffage a échoué
+        """
+        elapsed = client.warm_up()
+        if asyncio.iscoroutine(elapsed):
+            elapsed = self.event_loop.run(elapsed)
+        if elapsed is None:
+            raise ConnectionError("préchauffage impossible")
+
+    def warm_up(self):
+        """Préchauffe codecs, connexions, moteur Tesseract et client LLM."""
+        for name, elapsed in run_warm_up(self._warm_up_tasks()):
+            self.startup.add(f"préchauffage {name}", elapsed)
+            if self.debug_mode:
+                status = f"{elapsed:.0f} ms" if elapsed is not None else "échec"
+                print(f"[DEBUG] Préchauffage {name}: {status}")
+
     def show_notification(self, title: str, message: str, sound: bool = True):
         """Affiche une fenêtre popup macOS.
         
@@ -106,74 +337,168 @@ class ScreenTutorApp:
         else:
             return "Analyse terminée - Voir terminal"
 
-    def process_screen_capture(self):
-        """Pipeline: capture -> OCRSpace API -> (optionnel LLM) -> UI."""
-        if self.is_processing:
-            print("⚠️  Traitement déjà en cours, veuillez patienter...")
-            return
+    def _show_result(self, response: str, streamed: Optional[str] = None):
+        """
+        Affiche une réponse du LLM (notification + terminal + overlay).
 
-        self.is_processing = True
+        Args:
+            response: Réponse complète du LLM
+            streamed: Texte déjà affiché en streaming (None si aucun)
+        """
+        # Extraire juste les réponses pour la notification
+        notification_text = self._extract_answers_summary(response)
 
-        try:
-            print("📸 Capture de l'écran...")
-            
-            # 1. Capture d'écran
-            image = capture_screen(debug_mode=self.debug_save)
-            if not image:
-                print("❌ Échec de la capture d'écran")
-                self.is_processing = False
-                return
-
-            # 2. OCR via OCRSpace API
-            print("🔍 Extraction du texte via OCRSpace...")
-            text, success = self.ocr_api.extract_text(image)
-
-            if not success or not text:
-                print("❌ Échec de l'extraction OCR")
-                self.show_notification(
-                    "Erreur OCR",
-                    "Impossible d'extraire le texte. Vérifiez votre clé API."
-                )
-                self.is_processing = False
-                return
+        # Afficher notification
+        self.show_notification("🎯 Réponses QCM", notification_text)
 
-            print(f"✓ Texte extrait: {len(text)} caractères")
+        # Afficher aussi dans le terminal
+        if streamed is None:
+            print("\n" + "="*70)
+            print("🎯 RÉPONSES:")
+            print("="*70)
+            print(response)
+        else:
+            print()
+            if streamed != response:
+                # Réponse réassemblée (questions en cache + nouvelles)
+                print("-"*70)
+                print(response)
+        print("="*70 + "\n")
 
-            # 3. Analyse par LLM
-            print("🤖 Analyse du QCM par l'IA...")
-            if self.use_llm and self.llm_client:
-                response = self.llm_client.analyze_qcm_text(text)
-                if response:
-                    # Extraire juste les réponses pour la notification
-                    notification_text = self._extract_answers_summary(response)
-                    
-                    # Afficher notification
-                    self.show_notification("🎯 Réponses QCM", notification_text)
-                    
-                    # Afficher aussi dans le terminal
-                    print("\n" + "="*70)
-                    print("🎯 RÉPONSES:")
-                    print("="*70)
-                    print(response)
-                    print("="*70 + "\n")
-                    
-                    final_text = response
-                    print("✓ Réponse affichée")
-                else:
-                    self.show_notification("⚠️ Erreur", "Impossible d'analyser le QCM")
-                    final_text = "Impossible d'analyser le QCM"
-                    print("❌ Erreur analyse LLM")
-            else:
-                self.show_notification(
-                    "⚠️ Configuration",
-                    "LLM non configuré. Activez USE_LLM dans .env"
+        if self.overlay and streamed != response:
+            self.overlay.call_soon(self.overlay.set_explanation, response)
+
+    def _start_stream(self):
+        """
+        Prépare l'affichage d'une réponse en streaming.
+
+        Returns:
+            Tuple (callback à passer au LLM, liste des fragments reçus)
+        """
+        print("\n" + "="*70)
+        print("🎯 RÉPONSES:")
+        print("="*70)
+        if self.overlay:
+            self.overlay.call_soon(self.overlay.set_explanation, "")
+
+        chunks = []
+
+        def on_token(chunk: str):
+            chunks.append(chunk)
+            print(chunk, end="", flush=True)
+            if self.overlay:
+                self.overlay.call_soon(self.overlay.append_explanation, chunk, False)
+
+        return on_token, chunks
+
+    @staticmethod
+    async def _call(func, *args, **kwargs):
+        """
+        Appelle une méthode de client, synchrone ou asynchrone.
+
+        Les méthodes synchrones (clients requests, OCR local) sont exécutées
+        dans un thread pour ne pas bloquer la boucle d'événements.
+        """
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def _analyze_text(self, text: str, on_token) -> Optional[str]:
+        """
+        Envoie le texte OCR au LLM (par question si la segmentation est active).
+
+        Args:
+            text: Texte extrait
+            on_token: Callback de streaming (optionnel)
+
+        Returns:
+            Réponse du LLM, ou None en cas d'erreur
+        """
+        if self.question_answerer:
+            if self.async_clients:
+                return await self.question_answerer.answer_async(
+                    text, on_token=on_token, concurrency=self.llm_concurrency
                 )
-                final_text = text
-                print("⚠️  LLM désactivé")
-            
-            # Sauvegarder le dernier résultat
-            self.last_result = final_text
+            return await asyncio.to_thread(self.question_answerer.answer, text, on_token)
+        return await self._call(self.llm_client.analyze_qcm_text, text, on_token=on_token)
+
+    def process_screen_capture(self, job: Optional[Job] = None):
+        """
+        Pipeline synchrone : enveloppe fine autour de process_screen_capture_async().
+
+        Appelé par le thread consommateur de la file des captures.
+
+        Args:
+            job: Demande de la file (une demande isolée si absente)
+        """
+        self._wait_until_ready()
+        job = job or Job(id=0)
+        if job.presses > 1:
+            print(f"🔁 {job.presses} appuis regroupés : capture de l'écran le plus récent")
+        if (job.wait_ms or 0) >= 1:
+            print(f"⏱️  Attente en file: {job.wait_ms:.0f} ms")
+
+        if self.profiler:
+            with self.profiler.profile(f"capture{job.id}"):
+                self._run_job(job)
+        else:
+            self._run_job(job)
+        if self.debug_mode:
+            print(f"[DEBUG] File des captures: {self.jobs.get_stats()}")
+
+    def _run_job(self, job: Job):
+        """
+        Exécute une demande sur la boucle asyncio et attend sa fin.
+
+        Args:
+            job: Demande de la file
+        """
+        future = self.event_loop.submit(self.process_screen_capture_async(job))
+        job.on_cancel(future.cancel)
+        try:
+            future.result()
+        except concurrent.futures.CancelledError:
+            print("⏹️  Traitement annulé")
+
+    def cancel_current(self) -> bool:
+        """
+        Annule le traitement en cours (la tâche asyncio reçoit CancelledError).
+
+        Returns:
+            True si un traitement a été annulé
+        """
+        return self.jobs.cancel_running()
+
+    def _cancel_if_stale(self):
+        """Annule le traitement en cours si l'écran a changé depuis sa capture."""
+        running = self.jobs.running
+        signature = running.data.get("frame_signature") if running else None
+        if signature is None:
+            # Capture pas encore faite : elle portera sur l'écran actuel
+            return
+
+        # Capture de contrôle : ne modifie pas les durées lues par le pipeline
+        image = self.screen_capture.probe()
+        if image is None:
+            return
+        if not self.change_detector.same_screen(self.change_detector.compute(image), signature):
+            if running.cancel():
+                print("⏭️  Écran modifié : traitement en cours annulé au profit de la nouvelle capture")
+
+    async def process_screen_capture_async(self, job: Optional[Job] = None):
+        """
+        Pipeline: capture -> OCRSpace API -> (optionnel LLM) -> UI, avec délai maximal.
+
+        Args:
+            job: Demande de la file (reçoit la signature de l'écran capturé)
+        """
+        trace = self.metrics.new_trace()
+        try:
+            with self.metrics.span("pipeline"):
+                await asyncio.wait_for(self._run_pipeline(job), timeout=self.pipeline_timeout)
 
+        except asyncio.TimeoutError:
+            print(f"⏱️  Traitement interrompu après {self.pipeline_timeout:.0f} s")
         except ValueError as e:
             # Erreur de clé API
             print(f"❌ {e}")
@@ -181,14 +506,175 @@ class ScreenTutorApp:
             print("="*70)
             print(str(e))
             print("="*70 + "\n")
-            self.is_processing = False
         except Exception as e:
             print(f"❌ Erreur: {e}")
             if self.debug_mode:
                 import traceback
                 traceback.print_exc()
         finally:
-            self.is_processing = False
+            self.metrics.end_trace(trace)
+            self.metrics.write_prometheus()
+            if self.debug_mode:
+                print(f"[DEBUG] Latences par étape:\n{self.metrics.report()}")
+
+    async def _run_pipeline(self, job: Optional[Job] = None):
+        """
+        Étapes du pipeline (coroutine annulable entre chaque étape).
+
+        Args:
+            job: Demande de la file (optionnelle)
+        """
+        print("📸 Capture de l'écran...")
+
+        # 1. Capture d'écran
+        image = await asyncio.to_thread(self.screen_capture.capture_fullscreen)
+        if not image:
+            print("❌ Échec de la capture d'écran")
+            return
+        timing = self.screen_capture.last_timing
+        if self.cassette is not None and self.cassette.recording:
+            self.cassette.record_frame(image, timing)
+        print(f"✓ Capture: {timing['grab_ms']:.1f} ms (+ conversion {timing['convert_ms']:.1f} ms)")
+        self.metrics.record("capture", timing["grab_ms"], pixels=image.width * image.height)
+        self.metrics.record("convert", timing["convert_ms"], bytes=_image_bytes(image))
+
+        # 1b. Écran inchangé depuis le dernier résultat : on le réutilise.
+        # La signature sert aussi à annuler ce traitement si l'écran change
+        # avant la fin (nouvel appui sur =)
+        frame_signature = self.change_detector.compute(image)
+        if job is not None:
+            job.data["frame_signature"] = frame_signature
+        if self.skip_unchanged and self.change_detector.is_unchanged(frame_signature):
+            print("♻️  Écran inchangé - réutilisation du dernier résultat")
+            if self.use_llm and self.llm_client:
+                self._show_result(self.last_result)
+            else:
+                self._notify_llm_disabled()
+            return
+
+        # 1c. Recadrage sur la zone de texte (moins de pixels à encoder et envoyer)
+        if self.auto_crop:
+            full_size = image.size
+            with self.metrics.span("crop") as span:
+                image, box = await asyncio.to_thread(self._crop_to_text, image)
+                span.set(bytes=_image_bytes(image))
+            if box:
+                print(f"✂️  Zone de texte: {image.width}x{image.height} (sur {full_size[0]}x{full_size[1]})")
+
+        # 2. OCR (OCRSpace, Tesseract local ou les deux en course)
+        print(f"🔍 Extraction du texte via {' + '.join(self.ocr_backends)}...")
+        ocr_hits = self.ocr_cache.hits
+        with self.metrics.span("ocr", backend=self.ocr_backend) as span:
+            text, success = await self._call(self.ocr_api.extract_text, image)
+            span.set(
+                cache_hit=self.ocr_cache.hits > ocr_hits,
+                chars=len(text),
+                backend=getattr(self.ocr_api, "last_winner", None) or self.ocr_backend
+            )
+        self._record_upload_spans()
+
+        if not success or not text:
+            print("❌ Échec de l'extraction OCR")
+            self.show_notification(
+                "Erreur OCR",
+                "Impossible d'extraire le texte. Vérifiez votre clé API."
+            )
+            return
+
+        print(f"✓ Texte extrait: {len(text)} caractères")
+        if self.debug_mode:
+            print(f"[DEBUG] Cache OCR: {self.ocr_cache.get_stats()}")
+            if getattr(self.ocr_api, "last_stats", None):
+                print(f"[DEBUG] Envoi OCR: {self.ocr_api.last_stats}")
+            if hasattr(self.ocr_api, "get_stats"):
+                print(f"[DEBUG] Moteurs OCR: {self.ocr_api.get_stats()}")
+        if self.overlay:
+            self.overlay.call_soon(self.overlay.set_ocr_text, text)
+
+        # 3. Analyse par LLM
+        print("🤖 Analyse du QCM par l'IA...")
+        if self.use_llm and self.llm_client:
+            on_token, chunks = self._start_stream() if self.stream_llm else (None, None)
+            response = await self._timed_analysis(text, on_token)
+            if self.debug_mode:
+                print(f"[DEBUG] Cache LLM: {self.llm_cache.get_stats()}")
+            if response:
+                with self.metrics.span("render", bytes=len(response.encode())):
+                    self._show_result(response, "".join(chunks) if chunks is not None else None)
+                final_text = response
+                print("✓ Réponse affichée")
+                self.change_detector.remember(frame_signature)
+            else:
+                if chunks is not None:
+                    print("\n" + "="*70)
+                self.show_notification("⚠️ Erreur", "Impossible d'analyser le QCM")
+                final_text = "Impossible d'analyser le QCM"
+                print("❌ Erreur analyse LLM")
+                self.change_detector.reset()
+        else:
+            # Mode OCR seul : le texte extrait est le résultat réutilisable
+            self._notify_llm_disabled()
+            final_text = text
+            self.change_detector.remember(frame_signature)
+
+        # Sauvegarder le dernier résultat
+        self.last_result = final_text
+
+    def _notify_llm_disabled(self):
+        """Signale le mode OCR seul (USE_LLM désactivé)."""
+        self.show_notification(
+            "⚠️ Configuration",
+            "LLM non configuré. Activez USE_LLM dans .env"
+        )
+        print("⚠️  LLM désactivé")
+
+    def _record_upload_spans(self):
+        """Enregistre encodage, envoi et temps serveur du dernier appel OCRSpace."""
+        for backend in self.ocr_backends.values():
+            stats = getattr(backend, "last_stats", None) or {}
+            if "payload_bytes" not in stats:
+                continue
+            size = stats["payload_bytes"]
+            self.metrics.record("encode", stats["encode_ms"], bytes=size, format=stats.get("format"))
+            if "request_ms" in stats:
+                self.metrics.record("upload", stats["request_ms"], bytes=size)
+            if "server_ms" in stats:
+                self.metrics.record("ocr_server", stats["server_ms"])
+
+    async def _timed_analysis(self, text: str, on_token) -> Optional[str]:
+        """
+        Analyse LLM mesurée : attente du premier fragment puis génération.
+
+        Args:
+            text: Texte extrait
+            on_token: Callback de streaming (optionnel)
+
+        Returns:
+            Réponse du LLM, ou None en cas d'erreur
+        """
+        first_token = []
+
+        def timed_on_token(chunk: str):
+            if not first_token:
+                first_token.append(time.perf_counter())
+            on_token(chunk)
+
+        llm_hits = self.llm_cache.hits
+        start = time.perf_counter()
+        with self.metrics.span("llm", bytes=len(text.encode())) as span:
+            response = await self._analyze_text(text, timed_on_token if on_token else None)
+            span.set(cache_hit=self.llm_cache.hits > llm_hits, response_bytes=len((response or "").encode()))
+        if first_token:
+            end = start + span.duration_ms / 1000
+            self.metrics.record("llm_queue", (first_token[0] - start) * 1000)
+            self.metrics.record("llm_generation", (end - first_token[0]) * 1000)
+        return response
+
+    async def _aclose_clients(self):
+        """Ferme les connexions des clients asynchrones."""
+        for client in (*self.ocr_backends.values(), self.llm_client):
+            if hasattr(client, "aclose"):
+                await client.aclose()
 
     def copy_last_result(self):
         """Copie le dernier résultat dans le presse-papiers."""
@@ -216,15 +702,39 @@ class ScreenTutorApp:
         """Fonction supprimée - version terminal."""
         pass
 
+    def _wait_until_ready(self):
+        """Attend la fin de l'initialisation (raccourci pressé pendant le démarrage)."""
+        if not self.ready.is_set():
+            print("⏳ Initialisation en cours, le raccourci sera traité dès que possible...")
+            self.ready.wait()
+
     def on_hotkey_press(self):
         """Gère l'appui sur la touche =."""
         print("\n" + "="*50)
         print("⌨️  Hotkey '=' pressée - Début du traitement")
         print("="*50)
-        
-        # Lancer dans un thread pour ne pas bloquer keyboard
-        thread = threading.Thread(target=self.process_screen_capture, daemon=True)
-        thread.start()
+
+        # Le thread consommateur de la file traite la demande
+        job, merged = self.jobs.submit()
+        if merged:
+            print(f"📥 Regroupé avec la capture en attente ({job.presses} appuis)")
+        elif self.jobs.depth > 1:
+            print(f"📥 Capture en file (profondeur {self.jobs.depth})")
+
+        running = self.jobs.running
+        if running is not None and running is not job:
+            threading.Thread(target=self._cancel_if_stale, daemon=True).start()
+
+    def cycle_capture_profile(self):
+        """Passe au profil de capture suivant et le mémorise."""
+        profile = self.capture_profiles.cycle()
+        self.screen_capture.profile = profile
+        self.change_detector.reset()
+        try:
+            self.capture_profiles.save()
+        except OSError as e:
+            print(f"⚠️  Profil non enregistré: {e}")
+        print(f"🖥️  Profil de capture: {profile.name} ({profile.type})")
 
     def on_press(self, key):
         """Callback pour les touches pressées."""
@@ -233,17 +743,26 @@ class ScreenTutorApp:
             if hasattr(key, 'char'):
                 if key.char == '=':
                     self.on_hotkey_press()
+                elif key.char == '*':
+                    self._wait_until_ready()
+                    self.cycle_capture_profile()
         except AttributeError:
             # Touche spéciale (ESC, etc.)
-            if key == kb.Key.esc:
+            if key == self._esc_key:
+                self._wait_until_ready()
                 self.quit()
 
     def run(self):
         """Lance l'application et écoute les hotkeys."""
         try:
-            # Créer un listener pour les touches
-            with kb.Listener(on_press=self.on_press) as listener:
-                listener.join()
+            if self.overlay:
+                # La boucle Tk doit tourner dans le thread principal
+                self.overlay.show()
+                self.listener.stop()
+                self.quit()
+
+            # Le listener tourne depuis le début de l'initialisation
+            self.listener.join()
 
         except KeyboardInterrupt:
             print("\n⏹️  Interruption utilisateur")
@@ -258,21 +777,81 @@ class ScreenTutorApp:
     def quit(self):
         """Quitte l'application proprement."""
         print("\n👋 Arrêt de l'application...")
+        self.close()
         sys.exit(0)
 
+    def close(self):
+        """Libère les ressources (capture, clients, boucle asyncio, caches)."""
+        if self.overlay:
+            self.overlay.call_soon(self.overlay.close)
+        self.jobs.stop()
+        self.screen_capture.close()
+        if self.async_clients:
+            try:
+                self.event_loop.run(self._aclose_clients(), timeout=2)
+            except Exception:
+                pass
+        self.event_loop.stop()
+        for backend in self.ocr_backends.values():
+            if hasattr(backend, "close"):
+                backend.close()
+        self.ocr_cache.close()
+        self.llm_cache.close()
+        if self.cassette is not None:
+            self.cassette.close()
+
+
+def _image_bytes(image) -> int:
+    """Taille en octets des pixels d'une image PIL."""
+    return image.width * image.height * len(image.getbands())
+
+
+def replay_cassette(startup: Optional[StartupTimer] = None) -> int:
+    """
+    Rejoue toutes les captures de la cassette (CASSETTE_PATH) dans le pipeline.
+
+    Les réponses OCRSpace et Groq viennent de la cassette : les clés API ne
+    sont pas nécessaires. Pour un rejeu fidèle, garder la configuration de
+    l'enregistrement (moteur OCR, USE_LLM, LLM_STREAM) et des caches en
+    mémoire seulement.
+
+    Args:
+        startup: Chronomètre du démarrage
+
+    Returns:
+        Code de sortie (1 si des requêtes n'avaient pas de réponse enregistrée)
+    """
+    os.environ.setdefault("OCRSPACE_API_KEY", "cassette")
+    os.environ.setdefault("GROQ_API_KEY", "cassette")
+    # Pas de boucle Tk pendant le rejeu
+    os.environ["USE_OVERLAY"] = "false"
+    try:
+        app = ScreenTutorApp(startup, background_warm_up=False, hotkeys=False)
+    except (ImportError, OSError, ValueError) as e:
+        print(f"❌ Rejeu impossible: {e}")
+        return 1
+    app.show_notification = lambda *_, **__: None
+
+    frames = app.cassette.frame_count
+    print(f"📼 Rejeu de {frames} capture(s) depuis {app.cassette.path}")
+    start = time.perf_counter()
+    for _ in range(frames):
+        app.jobs.submit()
+        app.jobs.wait_idle()
+    elapsed = time.perf_counter() - start
+
+    stats = app.cassette.get_stats()
+    app.close()
+    print(f"\n⏱️  {frames} capture(s) en {elapsed:.2f} s")
+    print(app.metrics.report())
+    print(f"📼 Cassette: {stats}")
+    return 1 if stats["exhausted"] else 0
+
 
 def main():
-    """Point d'entrée principal."""
-    # Vérifier les dépendances critiques
-    try:
-        import pytesseract
-        from PIL import Image
-        import mss
-        import requests
-    except ImportError as e:
-        print(f"❌ Dépendance manquante: {e}")
-        print("Exécutez: pip install -r requirements.txt")
-        sys.exit(1)
+    """Point d'entrée principal (--startup-profile : mesure du démarrage puis arrêt)."""
+    profile_startup = "--startup-profile" in sys.argv[1:]
+    startup = StartupTimer(start=_LAUNCHED_AT, profile_imports=profile_startup)
 
     # Vérifier le fichier .env
     if not os.path.exists(".env"):
@@ -281,11 +860,21 @@ def main():
         print("cp .env.example .env")
         sys.exit(1)
 
-    # Charger les variables
-    load_dotenv()
-    
-    # Vérifier la clé OCRSpace
-    if not os.getenv("OCRSPACE_API_KEY"):
+    # Charger les variables (une seule fois, avant la création de l'application)
+    with startup.phase("variables d'environnement"):
+        from dotenv import load_dotenv
+        load_dotenv()
+
+    # Rejeu d'une cassette : pas d'écran, de clavier ni d'accès réseau
+    if os.getenv("CASSETTE_MODE", "").lower() == "replay":
+        sys.exit(replay_cassette(startup))
+
+    # Vérifier la clé OCRSpace (inutile si le moteur choisi ne l'utilise pas)
+    ocr_backend = os.getenv("OCR_BACKEND", "ocrspace").lower()
+    uses_ocrspace = ocr_backend == "ocrspace" or (
+        ocr_backend == "hybrid" and "ocrspace" in os.getenv("OCR_HYBRID_BACKENDS", "ocrspace,tesseract")
+    )
+    if uses_ocrspace and not os.getenv("OCRSPACE_API_KEY"):
         print("❌ Clé API OCRSpace manquante dans .env")
         print("\n📝 Obtenez une clé API gratuite ici:")
         print("   https://ocr.space/ocrapi")
@@ -293,8 +882,21 @@ def main():
         print("   OCRSPACE_API_KEY=votre_clé_ici")
         sys.exit(1)
 
-    # Lancer l'application
-    app = ScreenTutorApp()
+    # Lancer l'application (les dépendances du moteur OCR sont importées ici)
+    try:
+        app = ScreenTutorApp(startup, background_warm_up=not profile_startup)
+    except ImportError as e:
+        print(f"❌ Dépendance manquante: {e}")
+        print("Exécutez: pip install -r requirements.txt")
+        sys.exit(1)
+
+    if profile_startup:
+        app.warm_up()
+        print(startup.report())
+        app.listener.stop()
+        app.close()
+        sys.exit(0 if startup.ready_ms <= app.startup_budget_ms else 1)
+
     app.run()
 
 
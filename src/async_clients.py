@@ -0,0 +1,337 @@
+"""Variantes asynchrones (asyncio + httpx, HTTP/2) des clients OCRSpace et Groq."""
+
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Callable, Optional, Tuple
+from PIL import Image
+
+from src.cache import ResultCache
+from src.encoder import ImageEncoder
+from src.http_session import get_timeouts, origin
+from src.llm_client import LLMClient
+from src.ocr_api import OCRSpaceAPI
+
+try:
+    import httpx
+except ImportError:  # Dépendance optionnelle : repli sur les clients synchrones
+    httpx = None
+
+
+def is_available() -> bool:
+    """Indique si les clients asynchrones sont utilisables (httpx installé)."""
+    return httpx is not None
+
+
+def create_async_client(
+    pool_size: Optional[int] = None,
+    timeout: Optional[Tuple[float, float]] = None
+) -> "httpx.AsyncClient":
+    """
+    Crée un client HTTP asynchrone avec pool de connexions.
+
+    HTTP/2 est activé si le paquet `h2` est installé : les requêtes
+    concurrentes vers un même hôte partagent alors une seule connexion.
+
+    Args:
+        pool_size: Nombre maximal de connexions (HTTP_POOL_SIZE)
+        timeout: Délais (connexion, lecture) en secondes
+
+    Returns:
+        Client httpx.AsyncClient
+
+    Raises:
+        ImportError: Si httpx n'est pas installé
+    """
+    if httpx is None:
+        raise ImportError("httpx n'est pas installé (pip install 'httpx[http2]')")
+
+    if pool_size is None:
+        pool_size = int(os.getenv("HTTP_POOL_SIZE", "4"))
+    connect, read = timeout or get_timeouts()
+
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    http_timeout = httpx.Timeout(read, connect=connect)
+    if os.getenv("CASSETTE_MODE"):
+        # Enregistrement / rejeu de la session (import seulement si activé)
+        from src.cassette import get_cassette
+        transport = get_cassette().async_transport(httpx.AsyncHTTPTransport(http2=http2, limits=limits))
+        return httpx.AsyncClient(transport=transport, timeout=http_timeout)
+
+    return httpx.AsyncClient(http2=http2, limits=limits, timeout=http_timeout)
+
+
+async def _warm_up(client: "httpx.AsyncClient", url: str) -> Optional[float]:
+    """
+    Ouvre à l'avance une connexion vers un hôte.
+
+    Args:
+        client: Client asynchrone
+        url: URL de l'hôte
+
+    Returns:
+        Durée en millisecondes, ou None en cas d'échec
+    """
+    start = time.perf_counter()
+    try:
+        await client.head(url)
+    except httpx.HTTPError:
+        return None
+    return (time.perf_counter() - start) * 1000
+
+
+class AsyncOCRSpaceAPI(OCRSpaceAPI):
+    """Client OCRSpace asynchrone (même configuration, cache et parsing)."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        language: str = "fre",
+        engine: int = 2,
+        cache: Optional[ResultCache] = None,
+        client: Optional["httpx.AsyncClient"] = None,
+        timeout: Optional[Tuple[float, float]] = None,
+        encoder: Optional[ImageEncoder] = None
+    ):
+        """
+        Initialise le client OCRSpace asynchrone.
+
+        Args:
+            api_key: Clé API OCRSpace
+            language: Code langue (fre=français, eng=anglais)
+            engine: Moteur OCRSpace
+            cache: Cache de résultats OCR partagé (optionnel)
+            client: Client httpx à réutiliser (créé si absent)
+            timeout: Délais (connexion, lecture) en secondes
+            encoder: Encodeur d'image (budget de 900 KB par défaut)
+        """
+        super().__init__(
+            api_key=api_key, language=language, engine=engine, cache=cache,
+            timeout=timeout, encoder=encoder
+        )
+        self.client = client or create_async_client(timeout=self.timeout)
+
+    def _create_session(self) -> None:
+        """Pas de session requests : les requêtes passent par le client httpx."""
+        return None
+
+    async def warm_up(self) -> Optional[float]:
+        """
+        Ouvre la connexion vers OCRSpace avant la première capture.
+
+        Returns:
+            Durée en millisecondes, ou None en cas d'échec
+        """
+        return await _warm_up(self.client, origin(self.api_url))
+
+    async def extract_text(self, image: Image.Image) -> Tuple[str, bool]:
+        """
+        Extrait le texte d'une image via OCRSpace API.
+
+        L'encodage de l'image est exécuté dans un thread pour ne pas
+        bloquer la boucle d'événements.
+
+        Args:
+            image: Image PIL à analyser
+
+        Returns:
+            Tuple (texte extrait, succès)
+        """
+        cache_key, cached = self._get_cached(image)
+        if cached is not None:
+            return cached, True
+
+        try:
+            data, files = await asyncio.to_thread(self._build_payload, image)
+
+            print(f"📤 Envoi à OCRSpace API ({self.last_stats['payload_bytes'] / 1024:.1f} KB)...")
+            start = time.perf_counter()
+            response = await self.client.post(self.api_url, data=data, files=files)
+            response.raise_for_status()
+            result = response.json()
+            self._record_response(result, (time.perf_counter() - start) * 1000)
+
+            return self._parse_result(result, cache_key)
+
+        except httpx.TimeoutException:
+            print("❌ Timeout de l'API OCRSpace")
+            return "", False
+
+        except httpx.HTTPError as e:
+            print(f"❌ Erreur réseau: {e}")
+            return "", False
+
+        except Exception as e:
+            print(f"❌ Erreur inattendue: {e}")
+            return "", False
+
+    async def aclose(self):
+        """Ferme les connexions du client."""
+        await self.client.aclose()
+
+
+class AsyncLLMClient(LLMClient):
+    """Client Groq asynchrone (même prompt, cache et format de réponse)."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "llama-3.3-70b-versatile",
+        temperature: float = 0.3,
+        cache: Optional[ResultCache] = None,
+        client: Optional["httpx.AsyncClient"] = None,
+        timeout: Optional[Tuple[float, float]] = None
+    ):
+        """
+        Initialise le client Groq asynchrone.
+
+        Args:
+            api_key: Clé API Groq (ou depuis variable GROQ_API_KEY)
+            model: Modèle à utiliser
+            temperature: Température d'échantillonnage
+            cache: Cache des réponses (optionnel)
+            client: Client httpx à réutiliser (créé si absent)
+            timeout: Délais (connexion, lecture) en secondes
+        """
+        super().__init__(api_key=api_key, model=model, temperature=temperature, cache=cache, timeout=timeout)
+        self.client = client or create_async_client(timeout=self.timeout)
+
+    def _create_session(self) -> None:
+        """Pas de session requests : les requêtes passent par le client httpx."""
+        return None
+
+    @staticmethod
+    def _report_error(error: Exception):
+        """
+        Affiche une erreur de requête httpx de façon lisible.
+
+        Args:
+            error: Exception levée pendant la requête
+        """
+        if isinstance(error, httpx.TimeoutException):
+            print("⏱️  Timeout - la requête a pris trop de temps")
+        elif isinstance(error, httpx.HTTPStatusError):
+            LLMClient._report_status(error.response.status_code, error)
+        else:
+            print(f"❌ Erreur lors de l'analyse: {error}")
+
+    async def warm_up(self) -> Optional[float]:
+        """
+        Ouvre la connexion vers Groq avant la première analyse.
+
+        Returns:
+            Durée en millisecondes, ou None en cas d'échec
+        """
+        return await _warm_up(self.client, self.base_url)
+
+    async def analyze_qcm_text(
+        self,
+        text: str,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Optional[str]:
+        """
+        Analyse un texte de QCM avec Groq.
+
+        Args:
+            text: Texte extrait du QCM
+            on_token: Callback recevant chaque fragment en streaming (optionnel)
+
+        Returns:
+            Réponse formatée avec questions et réponses, ou None en cas d'erreur
+        """
+        if on_token is not None:
+            parts = []
+            async for chunk in self.stream_qcm_text(text):
+                parts.append(chunk)
+                on_token(chunk)
+            return "".join(parts) if self.last_stream_completed else None
+
+        cache_key, cached = self._get_cached(text)
+        if cached is not None:
+            return cached
+
+        url, headers, payload = self._build_request(text)
+
+        try:
+            response = await self.client.post(url, headers=headers, json=payload)
+            response.raise_for_status()
+
+            data = response.json()
+            answer = data.get("choices", [{}])[0].get("message", {}).get("content")
+            if answer and cache_key is not None:
+                self.cache.put(cache_key, answer)
+            return answer
+
+        except Exception as e:
+            self._report_error(e)
+            return None
+
+    async def stream_qcm_text(self, text: str) -> AsyncIterator[str]:
+        """
+        Analyse un texte de QCM en recevant la réponse en flux (SSE).
+
+        Args:
+            text: Texte extrait du QCM
+
+        Yields:
+            Fragments de texte de la réponse
+        """
+        self.last_stream_completed = False
+
+        cache_key, cached = self._get_cached(text)
+        if cached is not None:
+            self.last_stream_completed = True
+            yield cached
+            return
+
+        url, headers, payload = self._build_request(text, stream=True)
+        parts = []
+
+        try:
+            async with self.client.stream("POST", url, headers=headers, json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    done, content = self._parse_sse_line(line)
+                    if done:
+                        break
+                    if content:
+                        parts.append(content)
+                        yield content
+
+        except Exception as e:
+            self._report_error(e)
+            return
+
+        self.last_stream_completed = True
+        if parts and cache_key is not None:
+            self.cache.put(cache_key, "".join(parts))
+
+    async def aclose(self):
+        """Ferme les connexions du client."""
+        await self.client.aclose()
+
+
+def create_async_llm_client(
+    api_key: Optional[str] = None,
+    cache: Optional[ResultCache] = None
+) -> AsyncLLMClient:
+    """
+    Factory function pour créer un client Groq asynchrone.
+
+    Args:
+        api_key: Clé API Groq (optionnel, lecture depuis .env par défaut)
+        cache: Cache des réponses (optionnel)
+
+    Returns:
+        Instance de AsyncLLMClient
+
+    Raises:
+        ValueError: Si la clé API est manquante
+    """
+    return AsyncLLMClient(api_key=api_key, cache=cache)
@@ -0,0 +1,218 @@
+"""Cache de résultats (OCR, LLM) en mémoire avec niveau SQLite optionnel."""
+
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from PIL import Image
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Construit une clé de cache stable à partir de plusieurs éléments.
+
+    Args:
+        *parts: Éléments composant la clé (convertis en texte)
+
+    Returns:
+        Empreinte hexadécimale de la clé
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def image_fingerprint(image: Image.Image, max_side: int = 512) -> str:
+    """
+    Calcule une empreinte rapide des pixels d'une image.
+
+    L'image est d'abord réduite par un facteur entier (moyenne par blocs)
+    pour que le hachage porte sur quelques centaines de Ko au plus.
+
+    Args:
+        image: Image PIL
+        max_side: Taille maximale du plus grand côté avant hachage
+
+    Returns:
+        Empreinte hexadécimale
+    """
+    factor = max(1, math.ceil(max(image.size) / max_side))
+    small = image.reduce(factor) if factor > 1 else image
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{image.mode}:{image.size[0]}x{image.size[1]}".encode("ascii"))
+    h.update(small.tobytes())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Cache LRU borné en nombre d'entrées et en octets, avec TTL optionnel.
+
+    Un second niveau SQLite peut être activé via `db_path` : les entrées y
+    sont écrites à chaque insertion et relues en cas d'absence en mémoire.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 16 * 1024 * 1024,
+        db_path: Optional[str] = None,
+        namespace: str = "default",
+        ttl: Optional[float] = None
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            max_entries: Nombre maximal d'entrées en mémoire
+            max_bytes: Taille maximale (octets) des valeurs en mémoire
+            db_path: Chemin de la base SQLite persistante (optionnel)
+            namespace: Espace de noms des entrées dans la base
+            ttl: Durée de validité des entrées en secondes (None = illimitée)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # hits compte toutes les réponses trouvées ; disk_hits, celles lues en base
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "created REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _sizeof(key: str, value: str) -> int:
+        """Estime l'occupation mémoire d'une entrée."""
+        return len(key) + len(value.encode("utf-8"))
+
+    def _is_expired(self, stored_at: float) -> bool:
+        """Indique si une entrée enregistrée à `stored_at` a expiré."""
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def _discard(self, key: str):
+        """Retire une entrée de la mémoire."""
+        value, _ = self._entries.pop(key)
+        self._bytes -= self._sizeof(key, value)
+
+    def _store(self, key: str, value: str, stored_at: float):
+        """Insère une entrée en mémoire et applique l'éviction LRU."""
+        if key in self._entries:
+            self._discard(key)
+
+        size = self._sizeof(key, value)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (value, stored_at)
+        self._bytes += size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._discard(next(iter(self._entries)))
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Recherche une entrée.
+
+        Args:
+            key: Clé de cache
+
+        Returns:
+            Valeur en cache, ou None si absente
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._is_expired(entry[1]):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._discard(key)
+                self.expired += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+                if row is not None and not self._is_expired(row[1]):
+                    self._store(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str):
+        """
+        Enregistre une entrée.
+
+        Args:
+            key: Clé de cache
+            value: Valeur à conserver
+        """
+        with self._lock:
+            now = time.time()
+            self._store(key, value, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (namespace, key, value, created) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, value, now)
+                )
+                self._db.commit()
+
+    def clear(self):
+        """Vide le cache mémoire et les entrées persistantes de l'espace de noms."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+                self._db.commit()
+
+    def close(self):
+        """Ferme la base persistante."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs du cache.
+
+        Returns:
+            Dictionnaire (hits dont disk_hits, misses, expired, entries, bytes)
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
@@ -1,30 +1,358 @@
 """Module de capture d'écran avec mss."""
 
+import concurrent.futures
 import os
-from typing import Optional
+import threading
+import time
+from typing import Optional, Dict, Any, Tuple
+import numpy as np
 from PIL import Image
 import mss
+import mss.exception
+
+from src.capture_profiles import CaptureProfile
+
+
+# Poids entiers (somme = 256) de la luminance ITU-R BT.601, ordre B, G, R
+_GRAY_WEIGHTS = (29, 150, 77)
+
+
+def reduction_factor(size: Tuple[int, int], max_size: Optional[Tuple[int, int]]) -> int:
+    """
+    Calcule le plus grand facteur entier gardant la capture au moins aussi
+    grande que la taille maximale.
+
+    La réduction entière (moyenne de blocs, sans image intermédiaire) fait
+    l'essentiel du travail ; fit_size() donne ensuite la taille finale, pour
+    ne pas perdre de résolution OCR (2560x1440 -> 1920x1080 et non 1280x720).
+
+    Args:
+        size: Taille (largeur, hauteur) de la capture
+        max_size: Taille maximale, ou None pour aucune réduction
+
+    Returns:
+        Facteur de réduction (1 = taille inchangée)
+    """
+    if not max_size:
+        return 1
+    return max(1, min(size[0] // max_size[0], size[1] // max_size[1]))
+
+
+def fit_size(size: Tuple[int, int], max_size: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+    """
+    Taille finale d'une image ramenée sous un maximum (proportions gardées).
+
+    Args:
+        size: Taille (largeur, hauteur)
+        max_size: Taille maximale, ou None pour aucune réduction
+
+    Returns:
+        Taille inchangée si elle tient déjà, sinon la plus grande qui tient
+    """
+    if not max_size or (size[0] <= max_size[0] and size[1] <= max_size[1]):
+        return size
+    scale = min(max_size[0] / size[0], max_size[1] / size[1])
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def bgra_to_gray(raw, size: Tuple[int, int], factor: int = 1) -> np.ndarray:
+    """
+    Convertit un tampon BGRA en niveaux de gris réduit, sans image intermédiaire.
+
+    Le tampon est lu via une vue NumPy (sans copie). Avec un facteur > 1,
+    chaque bloc factor×factor est moyenné (réduction par facteur entier) en
+    accumulant des vues décalées : seuls des tableaux à la taille de sortie
+    sont alloués.
+
+    Args:
+        raw: Tampon BGRA brut (bytes, bytearray ou memoryview)
+        size: Taille (largeur, hauteur) de la capture
+        factor: Facteur de réduction entier
+
+    Returns:
+        Tableau uint8 (hauteur // factor, largeur // factor)
+    """
+    width, height = size
+    pixels = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+    out_h, out_w = height // factor, width // factor
+    dtype = np.uint16 if factor == 1 else np.uint32
+
+    gray = np.zeros((out_h, out_w), dtype=dtype)
+    # Produit calculé directement dans le type de l'accumulateur : avec NumPy
+    # 1.x, uint8 * scalaire resterait en uint8 et déborderait
+    weighted = np.empty((out_h, out_w), dtype=dtype)
+    for dy in range(factor):
+        for dx in range(factor):
+            block = pixels[dy:out_h * factor:factor, dx:out_w * factor:factor]
+            for channel, weight in enumerate(_GRAY_WEIGHTS):
+                np.multiply(block[..., channel], weight, out=weighted, dtype=dtype)
+                gray += weighted
+
+    gray //= 256 * factor * factor
+    return gray.astype(np.uint8)
+
+
+def gray_frame(raw, size: Tuple[int, int], max_size: Optional[Tuple[int, int]]) -> Image.Image:
+    """
+    Image en niveaux de gris d'un tampon BGRA, ramenée sous la taille maximale.
+
+    Réduction entière par bgra_to_gray(), puis redimensionnement BOX (moyenne
+    de zones) vers fit_size() si la taille ne tombe pas juste.
+
+    Args:
+        raw: Tampon BGRA brut
+        size: Taille (largeur, hauteur) de la capture
+        max_size: Taille maximale, ou None pour aucune réduction
+
+    Returns:
+        Image L
+    """
+    image = Image.fromarray(bgra_to_gray(raw, size, reduction_factor(size, max_size)), "L")
+    target = fit_size(image.size, max_size)
+    if target != image.size:
+        image = image.resize(target, Image.Resampling.BOX)
+    return image
 
 
 class ScreenCapture:
-    """Gestionnaire de capture d'écran."""
+    """Gestionnaire de capture d'écran.
+
+    Conserve une session mss ouverte entre les captures : la connexion à
+    l'affichage et la liste des moniteurs ne sont initialisées qu'une fois.
+    Les handles mss étant liés au thread qui les a créés (xlib, DC Windows),
+    toutes les opérations mss passent par un unique thread dédié, quel que
+    soit le thread appelant. La session est reconstruite si la configuration
+    des moniteurs change.
+    """
 
-    def __init__(self, debug_mode: bool = False, debug_save_path: Optional[str] = None):
+    def __init__(
+        self,
+        debug_mode: bool = False,
+        debug_save_path: Optional[str] = None,
+        monitor_check_interval: float = 30.0,
+        mode: str = "rgb",
+        max_size: Optional[Tuple[int, int]] = (1920, 1080),
+        profile: Optional[CaptureProfile] = None
+    ):
         """
         Initialise le gestionnaire de capture.
 
         Args:
             debug_mode: Active le mode debug
             debug_save_path: Chemin pour sauvegarder les captures en mode debug
+            monitor_check_interval: Délai (s) entre deux vérifications des moniteurs
+            mode: "rgb" (image couleur pleine résolution) ou "gray" (niveaux
+                de gris réduits d'un facteur entier sous `max_size`)
+            max_size: Taille maximale des captures en mode "gray"
+            profile: Zone à capturer (moniteur principal si absent)
         """
+        if mode not in ("rgb", "gray"):
+            raise ValueError(f"Mode de capture inconnu: {mode} (rgb ou gray)")
+
         self.debug_mode = debug_mode
         self.debug_save_path = debug_save_path
+        self.monitor_check_interval = monitor_check_interval
+        self.mode = mode
+        self.max_size = max_size
+        self.profile = profile
         if debug_mode and debug_save_path:
             os.makedirs(debug_save_path, exist_ok=True)
 
+        self._lock = threading.Lock()
+        self._thread: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._sct = None
+        self._monitors: list = []
+        self._last_monitor_check = 0.0
+
+        # Timings de la dernière capture (ms)
+        self.last_timing: Dict[str, float] = {}
+        self.grab_count = 0
+
+    def _open_session(self):
+        """Ouvre (ou rouvre) la session mss et mémorise les moniteurs."""
+        self._close_session()
+        self._sct = mss.mss()
+        self._monitors = [dict(m) for m in self._sct.monitors]
+        self._last_monitor_check = time.monotonic()
+
+    def _close_session(self):
+        """Ferme la session mss courante si elle existe."""
+        if self._sct is not None:
+            try:
+                self._sct.close()
+            except Exception:
+                pass
+            self._sct = None
+
+    def _ensure_session(self):
+        """
+        Garantit une session valide et à jour.
+
+        La liste des moniteurs est réénumérée au plus une fois par
+        `monitor_check_interval` secondes ; si elle a changé (écran branché,
+        débranché ou résolution modifiée), la session est reconstruite.
+        """
+        if self._sct is None:
+            self._open_session()
+            return
+
+        now = time.monotonic()
+        if now - self._last_monitor_check < self.monitor_check_interval:
+            return
+
+        self._last_monitor_check = now
+        with mss.mss() as probe:
+            current = [dict(m) for m in probe.monitors]
+        if current != self._monitors:
+            if self.debug_mode:
+                print("[DEBUG] Configuration des moniteurs modifiée, session recréée")
+            self._open_session()
+
+    def _run(self, func, *args):
+        """
+        Exécute une opération mss sur le thread de capture et attend son résultat.
+
+        Args:
+            func: Fonction à exécuter
+            *args: Arguments de la fonction
+
+        Returns:
+            Résultat de la fonction (ses exceptions sont propagées)
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="capture"
+                )
+            future = self._thread.submit(func, *args)
+        return future.result()
+
+    def invalidate(self):
+        """Force la reconstruction de la session à la prochaine capture."""
+        self._run(self._close_session)
+
+    def close(self):
+        """Libère la session mss et arrête le thread de capture."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.submit(self._close_session)
+            thread.shutdown(wait=True)
+
+    def _area(self, monitor_index: int) -> dict:
+        """
+        Zone mss à capturer : profil actif, sinon moniteur demandé.
+
+        Args:
+            monitor_index: Index du moniteur mss utilisé sans profil
+
+        Returns:
+            Zone {"left", "top", "width", "height"}
+        """
+        if self.profile is not None:
+            return self.profile.resolve(self._monitors)
+        return self._monitors[min(monitor_index, len(self._monitors) - 1)]
+
+    def _grab(self, monitor_index: int = 1):
+        """
+        Capture brute de la zone du profil actif avec la session persistante.
+
+        mss ne lit que cette zone (pas de capture complète recadrée ensuite).
+        La capture s'exécute sur le thread de capture, propriétaire de la
+        session.
+
+        Args:
+            monitor_index: Index du moniteur mss sans profil (1 = principal)
+
+        Returns:
+            Objet ScreenShot mss
+        """
+        return self._run(self._grab_in_session, monitor_index)
+
+    def _grab_in_session(self, monitor_index: int):
+        """
+        Capture avec la session persistante (thread de capture uniquement).
+
+        Une erreur de capture (moniteur disparu, serveur d'affichage
+        redémarré...) provoque une reconstruction de la session et un
+        unique nouvel essai.
+
+        Args:
+            monitor_index: Index du moniteur mss sans profil (1 = principal)
+
+        Returns:
+            Objet ScreenShot mss
+        """
+        self._ensure_session()
+        try:
+            return self._sct.grab(self._area(monitor_index))
+        except (mss.exception.ScreenShotError, IndexError):
+            self._open_session()
+            return self._sct.grab(self._area(monitor_index))
+
+    def _to_image(self, screenshot) -> Image.Image:
+        """
+        Convertit une capture mss en image PIL selon le mode choisi.
+
+        Args:
+            screenshot: Objet ScreenShot mss
+
+        Returns:
+            Image RGB pleine résolution, ou image L réduite en mode "gray"
+        """
+        width, height = screenshot.size
+        if self.mode == "gray" and len(screenshot.raw) == width * height * 4:
+            return gray_frame(screenshot.raw, screenshot.size, self.max_size)
+
+        return Image.frombytes(
+            "RGB",
+            screenshot.size,
+            screenshot.bgra,
+            "raw",
+            "BGRX"
+        )
+
+    def _capture(self) -> Tuple[Image.Image, Dict[str, float]]:
+        """
+        Capture et convertit la zone du profil actif, sans modifier l'état.
+
+        Returns:
+            Tuple (image PIL, durées de capture et de conversion en ms)
+        """
+        start = time.perf_counter()
+        # Capture la zone du profil (ou le moniteur principal)
+        screenshot = self._grab(1)
+        grabbed = time.perf_counter()
+
+        # Convertir en PIL Image
+        img = self._to_image(screenshot)
+        converted = time.perf_counter()
+        return img, {
+            "grab_ms": (grabbed - start) * 1000,
+            "convert_ms": (converted - grabbed) * 1000,
+        }
+
+    def probe(self) -> Optional[Image.Image]:
+        """
+        Capture de contrôle (l'écran a-t-il changé ?) hors du pipeline.
+
+        Ne touche ni à `last_timing` ni à `grab_count`, et n'enregistre
+        aucune capture de debug : le pipeline peut lire ses propres durées
+        pendant qu'une vérification tourne en parallèle.
+
+        Returns:
+            Image PIL, ou None en cas d'erreur
+        """
+        try:
+            return self._capture()[0]
+        except Exception as e:
+            if self.debug_mode:
+                print(f"[DEBUG] Capture de contrôle impossible: {e}")
+            return None
+
     def capture_fullscreen(self) -> Optional[Image.Image]:
         """
-        Capture l'écran complet.
+        Capture l'écran complet, ou la zone du profil actif.
 
         Returns:
             Image PIL de la capture, ou None en cas d'erreur
@@ -33,42 +361,51 @@ class ScreenCapture:
             Exception: En cas d'erreur de capture
         """
         try:
-            with mss.mss() as sct:
-                # Capture le premier moniteur (ou moniteur principal)
-                monitor = sct.monitors[1]
-                screenshot = sct.grab(monitor)
-
-                # Convertir en PIL Image
-                img = Image.frombytes(
-                    "RGB",
-                    screenshot.size,
-                    screenshot.bgra,
-                    "raw",
-                    "BGRX"
+            img, timing = self._capture()
+
+            self.grab_count += 1
+            self.last_timing = timing
+            if self.debug_mode:
+                print(
+                    f"[DEBUG] Capture #{self.grab_count}: "
+                    f"grab {self.last_timing['grab_ms']:.1f} ms, "
+                    f"conversion {self.last_timing['convert_ms']:.1f} ms"
                 )
 
-                # Sauvegarder en mode debug
-                if self.debug_mode and self.debug_save_path:
-                    from datetime import datetime
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    debug_path = os.path.join(
-                        self.debug_save_path,
-                        f"capture_{timestamp}.png"
-                    )
-                    img.save(debug_path)
-                    print(f"[DEBUG] Capture sauvegardée: {debug_path}")
+            # Sauvegarder en mode debug
+            if self.debug_mode and self.debug_save_path:
+                from datetime import datetime
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                debug_path = os.path.join(
+                    self.debug_save_path,
+                    f"capture_{timestamp}.png"
+                )
+                img.save(debug_path)
+                print(f"[DEBUG] Capture sauvegardée: {debug_path}")
 
-                return img
+            return img
 
         except Exception as e:
             print(f"Erreur lors de la capture d'écran: {e}")
             raise
 
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les statistiques de capture.
+
+        Returns:
+            Dictionnaire avec le nombre de captures et les derniers timings
+        """
+        return {"grab_count": self.grab_count, **self.last_timing}
+
 
 def capture_screen(debug_mode: bool = False) -> Optional[Image.Image]:
     """
     Fonction utilitaire pour capturer l'écran.
 
+    Crée une session à usage unique ; pour des captures répétées,
+    utiliser une instance de ScreenCapture conservée par l'appelant.
+
     Args:
         debug_mode: Active le mode debug
 
@@ -77,4 +414,7 @@ def capture_screen(debug_mode: bool = False) -> Optional[Image.Image]:
     """
     debug_path = "debug_screenshots" if debug_mode else None
     capturer = ScreenCapture(debug_mode, debug_path)
-    return capturer.capture_fullscreen()
+    try:
+        return capturer.capture_fullscreen()
+    finally:
+        capturer.close()
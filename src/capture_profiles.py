@@ -0,0 +1,226 @@
+"""Profils de capture : zone fixe, moniteur précis ou moniteur sous le curseur."""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+PROFILE_TYPES = ("monitor", "region", "cursor")
+
+# Profils disponibles sans fichier de configuration
+DEFAULT_PROFILES = {
+    "ecran": {"type": "monitor", "monitor": 1},
+    "curseur": {"type": "cursor"},
+}
+
+
+def cursor_position() -> Optional[Tuple[int, int]]:
+    """
+    Renvoie la position du curseur sur le bureau.
+
+    Returns:
+        Tuple (x, y), ou None si elle n'est pas disponible
+    """
+    try:
+        from pynput.mouse import Controller
+        x, y = Controller().position
+        return int(x), int(y)
+    except Exception:
+        return None
+
+
+@dataclass
+class CaptureProfile:
+    """Zone de l'écran à capturer.
+
+    Types :
+    - "monitor" : tout le moniteur `monitor` (1 = principal) ;
+    - "region" : rectangle (gauche, haut, largeur, hauteur) relatif au
+      moniteur `monitor` ;
+    - "cursor" : tout le moniteur contenant le curseur.
+    """
+
+    name: str
+    type: str = "monitor"
+    monitor: int = 1
+    region: Optional[Tuple[int, int, int, int]] = None
+    cursor: Callable[[], Optional[Tuple[int, int]]] = field(
+        default=cursor_position, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        """Valide le profil."""
+        if self.type not in PROFILE_TYPES:
+            raise ValueError(f"Profil '{self.name}': type inconnu '{self.type}' ({', '.join(PROFILE_TYPES)})")
+        if self.type == "region":
+            if not self.region or len(self.region) != 4:
+                raise ValueError(f"Profil '{self.name}': 'region' doit valoir [gauche, haut, largeur, hauteur]")
+            self.region = tuple(int(v) for v in self.region)
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict) -> "CaptureProfile":
+        """
+        Crée un profil depuis sa description JSON.
+
+        Args:
+            name: Nom du profil
+            data: Description ({"type": ..., "monitor": ..., "region": [...]})
+
+        Returns:
+            Profil de capture
+        """
+        return cls(
+            name=name,
+            type=data.get("type", "monitor"),
+            monitor=int(data.get("monitor", 1)),
+            region=data.get("region")
+        )
+
+    def to_dict(self) -> dict:
+        """Description JSON du profil."""
+        data = {"type": self.type}
+        if self.type != "cursor":
+            data["monitor"] = self.monitor
+        if self.region:
+            data["region"] = list(self.region)
+        return data
+
+    def resolve(self, monitors: List[dict]) -> dict:
+        """
+        Calcule la zone mss à capturer.
+
+        Args:
+            monitors: Liste des moniteurs mss (index 0 = bureau complet)
+
+        Returns:
+            Zone {"left", "top", "width", "height"} en coordonnées du bureau
+
+        Raises:
+            ValueError: Si la zone est hors de l'écran
+        """
+        if self.type == "cursor":
+            return dict(self._monitor_under_cursor(monitors))
+
+        monitor = monitors[min(max(self.monitor, 1), len(monitors) - 1)]
+        if self.type == "monitor":
+            return dict(monitor)
+
+        left, top, width, height = self.region
+        x0 = max(monitor["left"], monitor["left"] + left)
+        y0 = max(monitor["top"], monitor["top"] + top)
+        x1 = min(monitor["left"] + monitor["width"], monitor["left"] + left + width)
+        y1 = min(monitor["top"] + monitor["height"], monitor["top"] + top + height)
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError(f"Profil '{self.name}': la zone {self.region} est hors du moniteur {self.monitor}")
+        return {"left": x0, "top": y0, "width": x1 - x0, "height": y1 - y0}
+
+    def _monitor_under_cursor(self, monitors: List[dict]) -> dict:
+        """
+        Trouve le moniteur contenant le curseur.
+
+        Args:
+            monitors: Liste des moniteurs mss
+
+        Returns:
+            Moniteur sous le curseur, ou le moniteur principal à défaut
+        """
+        position = self.cursor()
+        if position is not None:
+            x, y = position
+            for monitor in monitors[1:]:
+                if (monitor["left"] <= x < monitor["left"] + monitor["width"]
+                        and monitor["top"] <= y < monitor["top"] + monitor["height"]):
+                    return monitor
+        return monitors[min(1, len(monitors) - 1)]
+
+
+class ProfileStore:
+    """Profils de capture enregistrés dans un fichier JSON.
+
+    Format du fichier :
+        {
+          "active": "quiz",
+          "profiles": {
+            "ecran": {"type": "monitor", "monitor": 1},
+            "quiz": {"type": "region", "monitor": 2, "region": [100, 150, 1000, 800]},
+            "curseur": {"type": "cursor"}
+          }
+        }
+    """
+
+    def __init__(self, path: Optional[str] = None, active: Optional[str] = None):
+        """
+        Charge les profils (profils par défaut si le fichier est absent).
+
+        Args:
+            path: Chemin du fichier JSON (optionnel)
+            active: Nom du profil à activer (prioritaire sur le fichier)
+
+        Raises:
+            ValueError: Si le fichier ou le profil demandé est invalide
+        """
+        self.path = path
+        data = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Fichier de profils invalide ({path}): {e}")
+
+        self.profiles: Dict[str, CaptureProfile] = {
+            name: CaptureProfile.from_dict(name, spec)
+            for name, spec in (data.get("profiles") or DEFAULT_PROFILES).items()
+        }
+
+        name = active or data.get("active") or next(iter(self.profiles))
+        if name not in self.profiles:
+            raise ValueError(
+                f"Profil de capture inconnu: {name} (disponibles: {', '.join(self.profiles)})"
+            )
+        self.active = name
+
+    @property
+    def current(self) -> CaptureProfile:
+        """Profil actif."""
+        return self.profiles[self.active]
+
+    def select(self, name: str) -> CaptureProfile:
+        """
+        Active un profil par son nom.
+
+        Args:
+            name: Nom du profil
+
+        Returns:
+            Profil activé
+
+        Raises:
+            KeyError: Si le profil n'existe pas
+        """
+        if name not in self.profiles:
+            raise KeyError(name)
+        self.active = name
+        return self.current
+
+    def cycle(self) -> CaptureProfile:
+        """
+        Active le profil suivant (dans l'ordre du fichier).
+
+        Returns:
+            Profil activé
+        """
+        names = list(self.profiles)
+        return self.select(names[(names.index(self.active) + 1) % len(names)])
+
+    def save(self):
+        """Enregistre les profils et le profil actif dans le fichier."""
+        if not self.path:
+            return
+        data = {
+            "active": self.active,
+            "profiles": {name: profile.to_dict() for name, profile in self.profiles.items()},
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,705 @@
+"""Enregistrement et rejeu des sessions (captures et échanges HTTP) dans une cassette.
+
+En mode `record`, chaque capture traitée par le pipeline (image et
+empreinte) et chaque échange avec OCRSpace et Groq (corps envoyé, donc
+l'image encodée, statut, en-têtes, fragments de réponse et leurs instants
+d'arrivée) sont écrits dans un fichier zip. En mode `replay`, les captures
+sont relues à la place de l'écran et les réponses servies par
+l'adaptateur requests / le transport httpx, avec les latences d'origine
+multipliées par `latency_scale` (0 = instantané) : tout le chemin de
+process_screen_capture se rejoue hors ligne et à l'identique.
+
+Activé par CASSETTE_MODE=record|replay (CASSETTE_PATH, CASSETTE_LATENCY_SCALE) ;
+sans cette variable, le module n'est pas importé.
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import zipfile
+from collections import deque
+from email.message import Message
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src.cache import image_fingerprint
+
+
+CASSETTE_MODES = ("record", "replay")
+
+# En-têtes propres à la connexion d'origine, non rejoués
+_HOP_BY_HOP = {"connection", "keep-alive", "transfer-encoding", "content-encoding"}
+
+
+# Clés API à ne jamais écrire dans la cassette (OCRSpace envoie la sienne dans le corps)
+_SECRET_VARIABLES = ("OCRSPACE_API_KEY", "GROQ_API_KEY")
+
+
+def _redact(body: bytes) -> bytes:
+    """Remplace les clés API configurées par un marqueur."""
+    for name in _SECRET_VARIABLES:
+        secret = os.getenv(name)
+        if secret:
+            body = body.replace(secret.encode(), b"<redacted>")
+    return body
+
+
+def _request_key(method: str, url: str, content_type: Optional[str], body: bytes) -> Tuple[str, str]:
+    """
+    Type et empreinte d'une requête (corps déjà masqué par _redact).
+
+    La frontière multipart, tirée au hasard à chaque envoi, est neutralisée :
+    deux envois de la même image encodée ont la même empreinte.
+
+    Args:
+        method: Méthode HTTP
+        url: URL de la requête
+        content_type: En-tête Content-Type
+        body: Corps envoyé
+
+    Returns:
+        Tuple ("POST /parse/image", empreinte du corps)
+    """
+    if content_type:
+        message = Message()
+        message["Content-Type"] = content_type
+        boundary = message.get_param("boundary")
+        if boundary:
+            body = body.replace(boundary.encode(), b"boundary")
+    return f"{method} {urlsplit(url).path}", hashlib.sha256(body).hexdigest()
+
+
+class Interaction:
+    """Un échange HTTP enregistré : requête, réponse et instants d'arrivée."""
+
+    def __init__(self, seq: int, kind: str, request_sha: str, request_body: bytes = b""):
+        """
+        Initialise l'échange.
+
+        Args:
+            seq: Numéro d'ordre dans la session
+            kind: Méthode et chemin ("POST /parse/image")
+            request_sha: Empreinte du corps envoyé
+            request_body: Corps envoyé
+        """
+        self.seq = seq
+        self.kind = kind
+        self.request_sha = request_sha
+        self.request_body = request_body
+        self.status = 0
+        self.reason = ""
+        self.headers: Dict[str, str] = {}
+        self.ttfb_ms = 0.0
+        # Fragments de réponse : (instant depuis l'envoi en ms, octets)
+        self.chunks: List[Tuple[float, bytes]] = []
+        self._start = time.perf_counter()
+        self._on_finish = None
+
+    def respond(self, status: int, reason: str, headers: Dict[str, str]):
+        """Note le statut et les en-têtes reçus."""
+        self.ttfb_ms = (time.perf_counter() - self._start) * 1000
+        self.status = status
+        self.reason = reason or ""
+        self.headers = {k: v for k, v in headers.items() if k.lower() not in _HOP_BY_HOP}
+
+    def add_chunk(self, data: bytes):
+        """Note un fragment de réponse et son instant d'arrivée."""
+        if data:
+            self.chunks.append(((time.perf_counter() - self._start) * 1000, bytes(data)))
+
+    def finish(self):
+        """Réponse entièrement lue (ou abandonnée) : l'échange est écrit une fois."""
+        callback, self._on_finish = self._on_finish, None
+        if callback is not None:
+            callback(self)
+
+    @property
+    def body(self) -> bytes:
+        """Corps complet de la réponse."""
+        return b"".join(data for _, data in self.chunks)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Métadonnées JSON (corps stockés à part)."""
+        return {
+            "seq": self.seq,
+            "kind": self.kind,
+            "request_sha": self.request_sha,
+            "status": self.status,
+            "reason": self.reason,
+            "headers": self.headers,
+            "ttfb_ms": round(self.ttfb_ms, 3),
+            "chunks": [[round(t, 3), len(data)] for t, data in self.chunks],
+        }
+
+    @classmethod
+    def from_dict(cls, meta: Dict[str, Any], request_body: bytes, body: bytes) -> "Interaction":
+        """Reconstruit un échange lu dans la cassette."""
+        interaction = cls(meta["seq"], meta["kind"], meta["request_sha"], request_body)
+        interaction.status = meta["status"]
+        interaction.reason = meta["reason"]
+        interaction.headers = meta["headers"]
+        interaction.ttfb_ms = meta["ttfb_ms"]
+        offset = 0
+        for t, length in meta["chunks"]:
+            interaction.chunks.append((t, body[offset:offset + length]))
+            offset += length
+        return interaction
+
+
+class Cassette:
+    """Fichier zip d'une session : captures et échanges HTTP, dans l'ordre.
+
+    Contenu : frames/NNNNNN.png (+ .json : empreinte et durées de capture),
+    http/NNNNNN.json (métadonnées), .req (corps envoyé) et .body (réponse).
+    L'écriture se fait dans un thread dédié pour ne pas ralentir le pipeline.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency_scale: float = 1.0):
+        """
+        Ouvre la cassette.
+
+        Args:
+            path: Chemin du fichier
+            mode: "record" (nouvelle cassette, écrase l'existante) ou "replay"
+            latency_scale: Facteur appliqué aux latences rejouées
+
+        Raises:
+            ValueError: Si le mode est inconnu
+            FileNotFoundError: Si la cassette à rejouer n'existe pas
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"CASSETTE_MODE inconnu: {mode} ({', '.join(CASSETTE_MODES)})")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._pending: List[Interaction] = []
+
+        # Statistiques
+        self.recorded = 0
+        self.replayed = 0
+        self.mismatched = 0
+        self.exhausted = 0
+
+        self._frames: Deque[Tuple[str, bytes, Dict[str, float]]] = deque()
+        self._interactions: Dict[str, Deque[Interaction]] = {}
+        if self.recording:
+            # Nouvelle cassette (vide tant que rien n'est enregistré)
+            zipfile.ZipFile(path, "w").close()
+            self._writer = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="cassette")
+        else:
+            self._writer = None
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        """Mode enregistrement."""
+        return self.mode == "record"
+
+    @property
+    def frame_count(self) -> int:
+        """Captures restant à rejouer."""
+        return len(self._frames)
+
+    # --- Écriture -----------------------------------------------------
+
+    def _write(self, entries: List[Tuple[str, bytes, int]]):
+        """Ajoute des fichiers à la cassette (thread d'écriture)."""
+        with zipfile.ZipFile(self.path, "a") as archive:
+            for name, data, compression in entries:
+                archive.writestr(name, data, compress_type=compression)
+
+    def _submit(self, task: Callable, *args):
+        """Planifie une écriture (erreurs affichées, l'enregistrement continue)."""
+        future = self._writer.submit(task, *args)
+        future.add_done_callback(
+            lambda f: f.exception() and print(f"⚠️  Écriture de la cassette impossible: {f.exception()}")
+        )
+
+    def record_frame(self, image: Image.Image, timing: Dict[str, float]) -> str:
+        """
+        Enregistre une capture du pipeline.
+
+        Args:
+            image: Capture (non modifiée)
+            timing: Durées de capture et conversion (ms)
+
+        Returns:
+            Empreinte de la capture
+        """
+        fingerprint = image_fingerprint(image)
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        meta = json.dumps({"seq": seq, "hash": fingerprint, "timing": timing}).encode()
+
+        def encode():
+            buffered = io.BytesIO()
+            image.save(buffered, format="PNG", compress_level=6)
+            self._write([
+                (f"frames/{seq:06d}.png", buffered.getvalue(), zipfile.ZIP_STORED),
+                (f"frames/{seq:06d}.json", meta, zipfile.ZIP_DEFLATED),
+            ])
+
+        self._submit(encode)
+        return fingerprint
+
+    def start_interaction(self, method: str, url: str, content_type: Optional[str], body: bytes) -> Interaction:
+        """
+        Commence l'enregistrement d'un échange.
+
+        Args:
+            method: Méthode HTTP
+            url: URL
+            content_type: En-tête Content-Type de la requête
+            body: Corps envoyé
+
+        Returns:
+            Échange à compléter (respond, add_chunk, finish)
+        """
+        body = _redact(body)
+        kind, sha = _request_key(method, url, content_type, body)
+        with self._lock:
+            self._seq += 1
+            interaction = Interaction(self._seq, kind, sha, body)
+            self._pending.append(interaction)
+        interaction._on_finish = self._save_interaction
+        return interaction
+
+    def _save_interaction(self, interaction: Interaction):
+        """Écrit un échange terminé."""
+        with self._lock:
+            if interaction in self._pending:
+                self._pending.remove(interaction)
+            self.recorded += 1
+        name = f"http/{interaction.seq:06d}"
+        self._submit(self._write, [
+            (f"{name}.json", json.dumps(interaction.to_dict()).encode(), zipfile.ZIP_DEFLATED),
+            (f"{name}.req", interaction.request_body, zipfile.ZIP_DEFLATED),
+            (f"{name}.body", interaction.body, zipfile.ZIP_DEFLATED),
+        ])
+
+    # --- Lecture ------------------------------------------------------
+
+    def _load(self):
+        """Charge les captures et échanges d'une cassette existante."""
+        with zipfile.ZipFile(self.path) as archive:
+            names = sorted(archive.namelist())
+            for name in names:
+                if name.startswith("frames/") and name.endswith(".json"):
+                    meta = json.loads(archive.read(name))
+                    png = archive.read(name[:-len(".json")] + ".png")
+                    self._frames.append((meta["hash"], png, meta["timing"]))
+                elif name.startswith("http/") and name.endswith(".json"):
+                    base = name[:-len(".json")]
+                    meta = json.loads(archive.read(name))
+                    interaction = Interaction.from_dict(
+                        meta, archive.read(f"{base}.req"), archive.read(f"{base}.body")
+                    )
+                    self._interactions.setdefault(interaction.kind, deque()).append(interaction)
+
+    def next_frame(self) -> Optional[Tuple[Image.Image, Dict[str, float], str]]:
+        """
+        Capture suivante de la session.
+
+        Returns:
+            Tuple (image, durées de capture d'origine, empreinte), ou None
+            si toutes les captures ont été rejouées
+        """
+        with self._lock:
+            if not self._frames:
+                return None
+            fingerprint, png, timing = self._frames.popleft()
+        image = Image.open(io.BytesIO(png))
+        image.load()
+        return image, timing, fingerprint
+
+    def take(self, method: str, url: str, content_type: Optional[str], body: bytes) -> Optional[Interaction]:
+        """
+        Réponse enregistrée pour une requête.
+
+        L'échange au corps identique est préféré ; à défaut (image encodée
+        autrement après une optimisation...), le suivant du même type est
+        servi et compté comme divergent.
+
+        Args:
+            method: Méthode HTTP
+            url: URL
+            content_type: En-tête Content-Type de la requête
+            body: Corps envoyé
+
+        Returns:
+            Échange enregistré, ou None si aucun ne reste pour ce type
+        """
+        kind, sha = _request_key(method, url, content_type, _redact(body))
+        with self._lock:
+            queue = self._interactions.get(kind)
+            if not queue:
+                self.exhausted += method != "HEAD"
+                return None
+            for interaction in queue:
+                if interaction.request_sha == sha:
+                    queue.remove(interaction)
+                    break
+            else:
+                interaction = queue.popleft()
+                self.mismatched += 1
+            self.replayed += 1
+        return interaction
+
+    def delay(self, ms: float) -> float:
+        """Durée d'attente rejouée (secondes) pour une latence enregistrée."""
+        return max(0.0, ms * self.latency_scale / 1000)
+
+    # --- Clients HTTP -------------------------------------------------
+
+    def adapter(self, **kwargs) -> HTTPAdapter:
+        """
+        Adaptateur requests enregistrant ou rejouant les échanges.
+
+        Args:
+            **kwargs: Options de HTTPAdapter (pool...)
+
+        Returns:
+            Adaptateur à monter sur la session
+        """
+        return CassetteAdapter(self, **kwargs)
+
+    def async_transport(self, inner):
+        """
+        Transport httpx enregistrant ou rejouant les échanges.
+
+        Args:
+            inner: Transport réel (utilisé en enregistrement)
+
+        Returns:
+            Transport à passer à httpx.AsyncClient
+        """
+        return _async_transport_class()(self, inner)
+
+    def close(self):
+        """Termine les échanges en cours et attend la fin des écritures."""
+        if self._writer is None:
+            return
+        for interaction in list(self._pending):
+            interaction.finish()
+        self._writer.shutdown(wait=True)
+        self._writer = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Statistiques de la cassette.
+
+        Returns:
+            Mode, échanges enregistrés, rejoués, divergents (corps différent),
+            manquants, et captures restantes
+        """
+        return {
+            "mode": self.mode,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "mismatched": self.mismatched,
+            "exhausted": self.exhausted,
+            "frames_left": self.frame_count,
+        }
+
+
+class _RecordingRaw:
+    """Flux urllib3 dont chaque fragment lu est noté dans l'échange."""
+
+    def __init__(self, raw, interaction: Interaction):
+        self._raw = raw
+        self._interaction = interaction
+
+    def stream(self, amt=None, decode_content=None) -> Iterator[bytes]:
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            self._interaction.add_chunk(chunk)
+            yield chunk
+        self._interaction.finish()
+
+    def read(self, *args, **kwargs) -> bytes:
+        data = self._raw.read(*args, **kwargs)
+        if data:
+            self._interaction.add_chunk(data)
+        else:
+            self._interaction.finish()
+        return data
+
+    def close(self):
+        self._raw.close()
+        self._interaction.finish()
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class _ReplayRaw:
+    """Flux rejouant les fragments enregistrés à leurs instants d'origine."""
+
+    def __init__(self, interaction: Interaction, cassette: Cassette, start: float):
+        self._chunks = deque(interaction.chunks)
+        self._cassette = cassette
+        self._start = start
+
+    def _next(self) -> bytes:
+        if not self._chunks:
+            return b""
+        t, data = self._chunks.popleft()
+        wait = self._start + self._cassette.delay(t) - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        return data
+
+    def stream(self, amt=None, decode_content=None) -> Iterator[bytes]:
+        while True:
+            data = self._next()
+            if not data:
+                return
+            yield data
+
+    def read(self, *args, **kwargs) -> bytes:
+        return self._next()
+
+    def close(self):
+        self._chunks.clear()
+
+    def release_conn(self):
+        pass
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Adaptateur requests : enregistre ou rejoue les échanges de la session."""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        """
+        Initialise l'adaptateur.
+
+        Args:
+            cassette: Cassette ouverte
+            **kwargs: Options de HTTPAdapter
+        """
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        content_type = request.headers.get("Content-Type")
+
+        if not self.cassette.recording:
+            return self._replay(request, content_type, body)
+        if request.method == "HEAD":
+            # Préchauffage : connexion seulement, rien à rejouer
+            return super().send(request, **kwargs)
+
+        # Réponses non compressées : les fragments notés sont ceux que lit le client
+        request.headers["Accept-Encoding"] = "identity"
+        interaction = self.cassette.start_interaction(request.method, request.url, content_type, body)
+        response = super().send(request, **kwargs)
+        interaction.respond(response.status_code, response.reason, dict(response.headers))
+        response.raw = _RecordingRaw(response.raw, interaction)
+        return response
+
+    def _replay(self, request, content_type: Optional[str], body: bytes) -> requests.Response:
+        """Réponse enregistrée (200 vide pour un préchauffage, 503 si la cassette est épuisée)."""
+        start = time.perf_counter()
+        interaction = self.cassette.take(request.method, request.url, content_type, body)
+        if interaction is None:
+            interaction = _missing_interaction(request.method, request.url)
+        time.sleep(self.cassette.delay(interaction.ttfb_ms))
+
+        response = requests.Response()
+        response.status_code = interaction.status
+        response.reason = interaction.reason
+        response.headers = CaseInsensitiveDict(interaction.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _ReplayRaw(interaction, self.cassette, start)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+def _missing_interaction(method: str, url: str) -> Interaction:
+    """Réponse servie sans échange enregistré."""
+    interaction = Interaction(0, method, "")
+    if method == "HEAD":
+        interaction.status, interaction.reason = 200, "OK"
+        return interaction
+    print(f"⚠️  Cassette épuisée : aucune réponse enregistrée pour {method} {urlsplit(url).path}")
+    interaction.status, interaction.reason = 503, "Cassette exhausted"
+    interaction.headers = {"Content-Type": "application/json"}
+    interaction.chunks = [(0.0, b'{"error": "cassette exhausted"}')]
+    return interaction
+
+
+_ASYNC_TRANSPORT = None
+
+
+def _async_transport_class():
+    """Classe du transport httpx (httpx importé seulement si utilisé)."""
+    global _ASYNC_TRANSPORT
+    if _ASYNC_TRANSPORT is not None:
+        return _ASYNC_TRANSPORT
+    import httpx
+
+    class _RecordingStream(httpx.AsyncByteStream):
+        def __init__(self, stream, interaction: Interaction):
+            self._stream = stream
+            self._interaction = interaction
+
+        async def __aiter__(self):
+            async for chunk in self._stream:
+                self._interaction.add_chunk(chunk)
+                yield chunk
+            self._interaction.finish()
+
+        async def aclose(self):
+            await self._stream.aclose()
+            self._interaction.finish()
+
+    class _ReplayStream(httpx.AsyncByteStream):
+        def __init__(self, interaction: Interaction, cassette: Cassette, start: float):
+            self._interaction = interaction
+            self._cassette = cassette
+            self._start = start
+
+        async def __aiter__(self):
+            for t, data in self._interaction.chunks:
+                wait = self._start + self._cassette.delay(t) - time.perf_counter()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                yield data
+
+    class CassetteTransport(httpx.AsyncBaseTransport):
+        """Transport httpx : enregistre ou rejoue les échanges du client."""
+
+        def __init__(self, cassette: Cassette, inner: httpx.AsyncBaseTransport):
+            self.cassette = cassette
+            self.inner = inner
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            body = await request.aread()
+            content_type = request.headers.get("Content-Type")
+            start = time.perf_counter()
+
+            if not self.cassette.recording:
+                interaction = self.cassette.take(request.method, str(request.url), content_type, body)
+                if interaction is None:
+                    interaction = _missing_interaction(request.method, str(request.url))
+                await asyncio.sleep(self.cassette.delay(interaction.ttfb_ms))
+                return httpx.Response(
+                    interaction.status,
+                    headers=interaction.headers,
+                    stream=_ReplayStream(interaction, self.cassette, start),
+                    request=request,
+                )
+
+            if request.method == "HEAD":
+                return await self.inner.handle_async_request(request)
+
+            request.headers["Accept-Encoding"] = "identity"
+            interaction = self.cassette.start_interaction(request.method, str(request.url), content_type, body)
+            response = await self.inner.handle_async_request(request)
+            interaction.respond(response.status_code, response.extensions.get("reason_phrase", b"").decode(),
+                                dict(response.headers))
+            return httpx.Response(
+                response.status_code,
+                headers=response.headers,
+                stream=_RecordingStream(response.stream, interaction),
+                extensions=response.extensions,
+                request=request,
+            )
+
+        async def aclose(self):
+            await self.inner.aclose()
+
+    _ASYNC_TRANSPORT = CassetteTransport
+    return _ASYNC_TRANSPORT
+
+
+class CassetteCapture:
+    """Source de captures rejouant celles de la cassette (remplace ScreenCapture)."""
+
+    def __init__(self, cassette: Cassette):
+        """
+        Initialise la source.
+
+        Args:
+            cassette: Cassette ouverte en rejeu
+        """
+        self.cassette = cassette
+        self.profile = None
+        self.last_timing: Dict[str, float] = {}
+        self.last_fingerprint: Optional[str] = None
+
+    def capture_fullscreen(self) -> Optional[Image.Image]:
+        """
+        Capture suivante, après la durée de capture d'origine (mise à l'échelle).
+
+        Returns:
+            Image enregistrée, ou None si toutes ont été rejouées
+        """
+        frame = self.cassette.next_frame()
+        if frame is None:
+            return None
+        image, timing, self.last_fingerprint = frame
+        time.sleep(self.cassette.delay(sum(timing.values())))
+        self.last_timing = timing
+        return image
+
+    def probe(self) -> Optional[Image.Image]:
+        """
+        Capture de contrôle : aucune en rejeu (elle consommerait une capture).
+
+        Returns:
+            Toujours None
+        """
+        return None
+
+    def close(self):
+        pass
+
+
+_ACTIVE: Optional[Cassette] = None
+_ACTIVE_LOCK = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    Cassette de la session, ouverte au premier appel d'après l'environnement.
+
+    Variables: CASSETTE_MODE (record, replay), CASSETTE_PATH
+    (session.cassette), CASSETTE_LATENCY_SCALE (1.0).
+
+    Returns:
+        Cassette partagée, ou None si CASSETTE_MODE est vide
+
+    Raises:
+        ValueError: Si CASSETTE_MODE est inconnu
+    """
+    global _ACTIVE
+    mode = os.getenv("CASSETTE_MODE", "").lower()
+    if not mode:
+        return None
+    with _ACTIVE_LOCK:
+        if _ACTIVE is None:
+            _ACTIVE = Cassette(
+                os.getenv("CASSETTE_PATH") or "session.cassette",
+                mode=mode,
+                latency_scale=float(os.getenv("CASSETTE_LATENCY_SCALE", "1.0"))
+            )
+        return _ACTIVE
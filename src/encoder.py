@@ -0,0 +1,247 @@
+"""Encodage des captures pour l'envoi à l'OCR, en une passe et sous un budget d'octets."""
+
+import io
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import numpy as np
+from PIL import Image
+
+
+# Modèle de taille JPEG (niveaux de gris) : bits/pixel ≈ k·contraste + m·densité + b,
+# ajusté sur des captures synthétiques de QCM (texte, dégradés, bruit).
+# contraste = gradient absolu moyen, densité = part de pixels voisins différents.
+_JPEG_MODEL = {
+    40: (0.0461, 0.009, 0.152),
+    45: (0.0488, 0.035, 0.152),
+    50: (0.0512, 0.068, 0.149),
+    55: (0.0536, 0.107, 0.145),
+    60: (0.0566, 0.157, 0.140),
+    65: (0.0599, 0.227, 0.134),
+    70: (0.0641, 0.319, 0.119),
+    75: (0.0685, 0.426, 0.105),
+    80: (0.0749, 0.608, 0.074),
+    85: (0.0829, 0.896, 0.027),
+}
+# Surcoût des canaux de chrominance (sous-échantillonnage 4:2:0)
+_COLOR_FACTOR = 1.15
+# PNG : bits/pixel ≈ facteur × densité (borne haute observée)
+_PNG_BITS_PER_CHANGE = 7.0
+
+
+@dataclass
+class EncodedImage:
+    """Image encodée prête à l'envoi."""
+
+    buffer: io.BytesIO
+    format: str
+    quality: Optional[int]
+    size: Tuple[int, int]
+    encode_ms: float
+    passes: int = 1
+
+    @property
+    def nbytes(self) -> int:
+        """Taille de l'image encodée en octets."""
+        return self.buffer.getbuffer().nbytes
+
+    @property
+    def mime_type(self) -> str:
+        """Type MIME du fichier."""
+        return "image/png" if self.format == "PNG" else "image/jpeg"
+
+    @property
+    def filetype(self) -> str:
+        """Type de fichier attendu par OCRSpace."""
+        return "PNG" if self.format == "PNG" else "JPG"
+
+
+def content_features(image: Image.Image) -> Tuple[float, float]:
+    """
+    Mesure le contenu d'une image en niveaux de gris.
+
+    Args:
+        image: Image PIL en mode L
+
+    Returns:
+        Tuple (gradient absolu moyen, part de pixels différents de leur voisin)
+    """
+    pixels = np.asarray(image.reduce(2) if min(image.size) >= 64 else image, dtype=np.int16)
+    dx = np.abs(np.diff(pixels, axis=1))
+    dy = np.abs(np.diff(pixels, axis=0))
+    if not dx.size or not dy.size:
+        return 0.0, 0.0
+    contrast = (float(dx.mean()) + float(dy.mean())) / 2
+    density = np.count_nonzero(dx) / dx.size
+    return contrast, density
+
+
+class ImageEncoder:
+    """Encode une capture en une passe en respectant un budget d'octets.
+
+    Le format et la qualité sont choisis à partir d'un modèle du contenu
+    (contraste et densité de détails) au lieu d'encodages successifs :
+    - PNG quand l'écran est surtout composé d'aplats (texte sur fond uni),
+      où il est à la fois plus petit et sans perte ;
+    - sinon JPEG, à la qualité la plus haute (≤ 85) dont la taille prédite
+      tient dans le budget, avec réduction de taille si aucune ne tient.
+    Une seule passe de secours (réduction de taille) est faite si la
+    prédiction s'avère fausse.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 900 * 1024,
+        max_size: Tuple[int, int] = (1920, 1080),
+        grayscale: bool = True,
+        allow_png: bool = True,
+        safety_margin: float = 1.3
+    ):
+        """
+        Initialise l'encodeur.
+
+        Args:
+            max_bytes: Budget d'octets par image
+            max_size: Dimensions maximales (largeur, hauteur)
+            grayscale: Convertir en niveaux de gris (suffisant pour l'OCR)
+            allow_png: Autoriser le PNG pour les écrans de texte
+            safety_margin: Marge appliquée aux tailles prédites
+        """
+        self.max_bytes = max_bytes
+        self.max_size = max_size
+        self.grayscale = grayscale
+        self.allow_png = allow_png
+        self.safety_margin = safety_margin
+
+    @property
+    def signature(self) -> tuple:
+        """Paramètres influençant l'image envoyée (pour les clés de cache)."""
+        return (self.max_size, self.grayscale, self.allow_png)
+
+    def _prepare(self, image: Image.Image) -> Image.Image:
+        """
+        Redimensionne et convertit l'image sans modifier l'originale.
+
+        Args:
+            image: Image PIL
+
+        Returns:
+            Image prête à encoder
+        """
+        if image.width > self.max_size[0] or image.height > self.max_size[1]:
+            ratio = min(self.max_size[0] / image.width, self.max_size[1] / image.height)
+            size = (max(1, int(image.width * ratio)), max(1, int(image.height * ratio)))
+            image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+            print(f"   Image redimensionnée à {image.size}")
+
+        if self.grayscale:
+            return image.convert("L") if image.mode != "L" else image
+        return image.convert("RGB") if image.mode not in ("RGB", "L") else image
+
+    def choose(self, image: Image.Image) -> Tuple[str, Optional[int], float]:
+        """
+        Choisit le format, la qualité et l'échelle d'après le contenu de l'image.
+
+        Args:
+            image: Image préparée (mode L ou RGB)
+
+        Returns:
+            Tuple (format, qualité JPEG ou None, facteur d'échelle ≤ 1)
+        """
+        gray = image if image.mode == "L" else image.convert("L")
+        contrast, density = content_features(gray)
+        pixels = image.width * image.height
+        budget_bits = self.max_bytes * 8 / self.safety_margin
+        color_factor = 1.0 if image.mode == "L" else _COLOR_FACTOR
+
+        def jpeg_bits(q: int) -> float:
+            k, m, b = _JPEG_MODEL[q]
+            return (k * contrast + m * density + b) * pixels * color_factor
+
+        quality = next(
+            (q for q in sorted(_JPEG_MODEL, reverse=True) if jpeg_bits(q) <= budget_bits),
+            None
+        )
+
+        if self.allow_png:
+            png_bits = _PNG_BITS_PER_CHANGE * density * pixels * color_factor
+            if png_bits <= budget_bits and (quality is None or png_bits < jpeg_bits(quality)):
+                return "PNG", None, 1.0
+
+        if quality is None:
+            # Même la qualité minimale dépasse : réduire la taille dès cette passe
+            quality = min(_JPEG_MODEL)
+            return "JPEG", quality, min(1.0, (budget_bits / jpeg_bits(quality)) ** 0.5)
+        return "JPEG", quality, 1.0
+
+    @staticmethod
+    def _resize(image: Image.Image, scale: float) -> Image.Image:
+        """
+        Réduit une image d'un facteur donné.
+
+        Args:
+            image: Image PIL
+            scale: Facteur d'échelle (< 1)
+
+        Returns:
+            Image réduite
+        """
+        size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        return image.resize(size, Image.Resampling.LANCZOS)
+
+    def _save(self, image: Image.Image, fmt: str, quality: Optional[int]) -> io.BytesIO:
+        """
+        Encode l'image dans un tampon mémoire.
+
+        Args:
+            image: Image préparée
+            fmt: "PNG" ou "JPEG"
+            quality: Qualité JPEG
+
+        Returns:
+            Tampon positionné au début
+        """
+        buffered = io.BytesIO()
+        if fmt == "PNG":
+            image.save(buffered, format="PNG", compress_level=3)
+        else:
+            image.save(buffered, format="JPEG", quality=quality, subsampling=2)
+        buffered.seek(0)
+        return buffered
+
+    def encode(self, image: Image.Image) -> EncodedImage:
+        """
+        Encode une capture sous le budget d'octets.
+
+        Args:
+            image: Image PIL (non modifiée)
+
+        Returns:
+            Image encodée avec format, qualité, taille et durée d'encodage
+        """
+        start = time.perf_counter()
+        prepared = self._prepare(image)
+        fmt, quality, scale = self.choose(prepared)
+        if scale < 1.0:
+            prepared = self._resize(prepared, scale)
+            print(f"   Image réduite à {prepared.size} pour tenir sous {self.max_bytes // 1024} KB")
+        buffered = self._save(prepared, fmt, quality)
+        passes = 1
+
+        # Prédiction erronée : une passe de secours, plus petite, en JPEG
+        nbytes = buffered.getbuffer().nbytes
+        if nbytes > self.max_bytes:
+            prepared = self._resize(prepared, (self.max_bytes / nbytes) ** 0.5 * 0.9)
+            fmt, quality = "JPEG", quality or max(_JPEG_MODEL)
+            buffered = self._save(prepared, fmt, quality)
+            passes = 2
+            print(f"   Image réduite à {prepared.size} pour tenir sous {self.max_bytes // 1024} KB")
+
+        return EncodedImage(
+            buffer=buffered,
+            format=fmt,
+            quality=quality,
+            size=prepared.size,
+            encode_ms=(time.perf_counter() - start) * 1000,
+            passes=passes
+        )
@@ -0,0 +1,71 @@
+"""Boucle asyncio persistante exécutée dans un thread dédié."""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+
+class EventLoopThread:
+    """Boucle d'événements de fond partagée par les traitements.
+
+    Les clients asynchrones gardent leurs connexions liées à cette boucle :
+    elle vit aussi longtemps que l'application, contrairement à un
+    asyncio.run() par capture.
+    """
+
+    def __init__(self, name: str = "pipeline-loop"):
+        """
+        Démarre la boucle dans un thread daemon.
+
+        Args:
+            name: Nom du thread
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Exécute la boucle jusqu'à son arrêt, puis annule les tâches restantes
+        et ferme les générateurs asynchrones (flux SSE interrompus)."""
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        Planifie une coroutine sur la boucle depuis n'importe quel thread.
+
+        Args:
+            coro: Coroutine à exécuter
+
+        Returns:
+            Future annulable (future.cancel() annule la tâche asyncio)
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Exécute une coroutine et attend son résultat.
+
+        Args:
+            coro: Coroutine à exécuter
+            timeout: Délai maximal d'attente en secondes
+
+        Returns:
+            Résultat de la coroutine
+        """
+        return self.submit(coro).result(timeout)
+
+    def stop(self):
+        """Arrête la boucle et attend la fin du thread."""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=1)
@@ -0,0 +1,93 @@
+"""Sessions HTTP partagées (pool de connexions keep-alive) pour les clients API."""
+
+import os
+import time
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def get_timeouts() -> Tuple[float, float]:
+    """
+    Lit les délais HTTP depuis l'environnement.
+
+    Returns:
+        Tuple (délai de connexion, délai de lecture) en secondes
+    """
+    connect = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    read = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+    return connect, read
+
+
+def origin(url: str) -> str:
+    """
+    Racine d'une URL (schéma et hôte), cible du préchauffage.
+
+    Args:
+        url: URL complète (ex: https://api.ocr.space/parse/image)
+
+    Returns:
+        Racine de l'URL (ex: https://api.ocr.space/)
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+def create_session(
+    pool_size: Optional[int] = None,
+    keep_alive: Optional[bool] = None
+) -> requests.Session:
+    """
+    Crée une session requests avec un pool de connexions dédié.
+
+    La session réutilise les connexions TCP/TLS d'une requête à l'autre :
+    seule la première requête vers un hôte paie la poignée de main.
+
+    Args:
+        pool_size: Nombre de connexions conservées par hôte (HTTP_POOL_SIZE)
+        keep_alive: Conserver les connexions ouvertes (HTTP_KEEP_ALIVE)
+
+    Returns:
+        Session configurée
+    """
+    if pool_size is None:
+        pool_size = int(os.getenv("HTTP_POOL_SIZE", "4"))
+    if keep_alive is None:
+        keep_alive = os.getenv("HTTP_KEEP_ALIVE", "true").lower() == "true"
+
+    session = requests.Session()
+    if os.getenv("CASSETTE_MODE"):
+        # Enregistrement / rejeu de la session (import seulement si activé)
+        from src.cassette import get_cassette
+        adapter = get_cassette().adapter(pool_connections=2, pool_maxsize=pool_size, max_retries=0)
+    else:
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def warm_up(session: requests.Session, url: str, timeout: Tuple[float, float]) -> Optional[float]:
+    """
+    Ouvre à l'avance une connexion vers un hôte (DNS + TCP + TLS).
+
+    Une requête HEAD est envoyée ; le code de retour importe peu, seule
+    compte la connexion qui reste ensuite disponible dans le pool.
+
+    Args:
+        session: Session à préchauffer
+        url: URL de l'hôte
+        timeout: Délais (connexion, lecture)
+
+    Returns:
+        Durée en millisecondes, ou None en cas d'échec
+    """
+    start = time.perf_counter()
+    try:
+        session.head(url, timeout=timeout, allow_redirects=False).close()
+    except requests.exceptions.RequestException:
+        return None
+    return (time.perf_counter() - start) * 1000
@@ -0,0 +1,231 @@
+"""File de traitements à consommateur unique, avec regroupement des demandes."""
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.metrics import Histogram
+
+
+@dataclass
+class Job:
+    """Demande de traitement (un ou plusieurs appuis regroupés)."""
+
+    id: int
+    submitted_at: float = field(default_factory=time.perf_counter)
+    presses: int = 1
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    cancelled: bool = False
+    # Données posées par le traitement (ex: signature de l'écran capturé)
+    data: Dict[str, Any] = field(default_factory=dict)
+    _cancel_callbacks: List[Callable[[], Any]] = field(default_factory=list, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def wait_ms(self) -> Optional[float]:
+        """Attente en file avant le début du traitement (ms)."""
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.submitted_at) * 1000
+
+    def on_cancel(self, callback: Callable[[], Any]):
+        """
+        Enregistre l'action qui interrompt le traitement en cours.
+
+        Args:
+            callback: Fonction sans argument (appelée aussitôt si la
+                demande est déjà annulée)
+        """
+        with self._lock:
+            if not self.cancelled:
+                self._cancel_callbacks.append(callback)
+                return
+        callback()
+
+    def cancel(self) -> bool:
+        """
+        Annule la demande.
+
+        Returns:
+            True si la demande n'était pas déjà annulée
+        """
+        with self._lock:
+            if self.cancelled:
+                return False
+            self.cancelled = True
+            callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+        for callback in callbacks:
+            callback()
+        return True
+
+
+class CoalescingJobQueue:
+    """File à consommateur unique : au plus un traitement en cours et un en attente.
+
+    Les demandes reçues pendant un traitement sont regroupées en une seule
+    demande en attente, exécutée dès la fin du traitement en cours : elle
+    porte donc toujours sur l'écran le plus récent. Aucune demande n'est
+    perdue, aucune n'est traitée deux fois.
+    """
+
+    def __init__(self, handler: Callable[[Job], Any], name: str = "jobs", wait_window: int = 1024):
+        """
+        Démarre le thread consommateur.
+
+        Args:
+            handler: Traitement d'une demande (exécuté dans le thread consommateur)
+            name: Nom du thread
+            wait_window: Nombre d'attentes conservées pour p95 et maximum
+        """
+        self.handler = handler
+        self._condition = threading.Condition()
+        self._ids = itertools.count(1)
+        self._pending: Optional[Job] = None
+        self._running: Optional[Job] = None
+        self._stopped = False
+
+        # Statistiques
+        self.submitted = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.max_depth = 0
+        self._waits = Histogram(window=wait_window)
+
+        self._thread = threading.Thread(target=self._consume, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> Optional[Job]:
+        """Demande en cours de traitement."""
+        return self._running
+
+    @property
+    def pending(self) -> Optional[Job]:
+        """Demande en attente."""
+        return self._pending
+
+    @property
+    def depth(self) -> int:
+        """Nombre de demandes en cours ou en attente (0 à 2)."""
+        with self._condition:
+            return (self._running is not None) + (self._pending is not None)
+
+    def submit(self) -> Tuple[Job, bool]:
+        """
+        Ajoute une demande, ou la regroupe avec celle déjà en attente.
+
+        Returns:
+            Tuple (demande en attente, True si regroupée avec une précédente)
+
+        Raises:
+            RuntimeError: Si la file est arrêtée
+        """
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("File de traitements arrêtée")
+            self.submitted += 1
+            if self._pending is not None:
+                self._pending.presses += 1
+                self.coalesced += 1
+                return self._pending, True
+
+            self._pending = Job(id=next(self._ids))
+            self.max_depth = max(self.max_depth, (self._running is not None) + 1)
+            self._condition.notify()
+            return self._pending, False
+
+    def cancel_running(self) -> bool:
+        """
+        Annule le traitement en cours.
+
+        Returns:
+            True si un traitement a été annulé
+        """
+        job = self._running
+        return job is not None and job.cancel()
+
+    def _consume(self):
+        """Boucle du thread consommateur."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                job, self._pending = self._pending, None
+                job.started_at = time.perf_counter()
+                self._running = job
+                self._waits.observe(job.wait_ms)
+
+            try:
+                if not job.cancelled:
+                    self.handler(job)
+            except Exception as e:
+                print(f"❌ Erreur de traitement: {e}")
+            finally:
+                job.finished_at = time.perf_counter()
+                with self._condition:
+                    self._running = None
+                    if job.cancelled:
+                        self.cancelled += 1
+                    else:
+                        self.completed += 1
+                    self._condition.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend que la file soit vide.
+
+        Args:
+            timeout: Délai maximal en secondes
+
+        Returns:
+            True si la file est vide
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._running is None and self._pending is None, timeout
+            )
+
+    def stop(self, timeout: Optional[float] = 2.0):
+        """
+        Arrête le consommateur (la demande en attente est abandonnée,
+        celle en cours est annulée).
+
+        Args:
+            timeout: Délai maximal d'attente du thread
+        """
+        with self._condition:
+            self._stopped = True
+            self._pending = None
+            self._condition.notify_all()
+        self.cancel_running()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Statistiques de la file.
+
+        Returns:
+            Demandes reçues, regroupées, traitées, annulées, profondeur
+            actuelle et maximale, attente moyenne, p95 et maximale (ms) ;
+            p95 et maximum portent sur la fenêtre de l'histogramme
+        """
+        with self._condition:
+            waits = self._waits
+            return {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "depth": (self._running is not None) + (self._pending is not None),
+                "max_depth": self.max_depth,
+                "wait_mean_ms": round(waits.total / waits.count, 1) if waits.count else 0.0,
+                "wait_p95_ms": round(waits.percentile(0.95), 1),
+                "wait_max_ms": round(waits.percentile(1.0), 1),
+            }
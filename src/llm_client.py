@@ -1,9 +1,52 @@
 """Client pour Groq LLM API."""
 
 import os
-from typing import Optional
+import re
+import json
+import hashlib
+import unicodedata
+from typing import Callable, Iterator, Optional, Tuple
 import requests
 
+from src.cache import ResultCache, make_key
+from src.http_session import create_session, get_timeouts, warm_up
+
+
+# Variantes typographiques fréquentes dans les sorties OCR
+_PUNCTUATION_MAP = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u2032": "'", "`": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u00ab": '"', "\u00bb": '"',
+    "\u2010": "-", "\u2011": "-", "\u2012": "-", "\u2013": "-", "\u2014": "-",
+    "\u2212": "-",
+})
+_GUILLEMETS = re.compile(r"\u00ab\s*|\s*\u00bb")
+_SPACE_BEFORE_PUNCT = re.compile(r"\s+([.,;:!?)\]}])")
+_SPACE_AFTER_OPEN = re.compile(r"([(\[{])\s+")
+_REPEATED_PUNCT = re.compile(r"([.,;:!?'\"-])\1+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_qcm_text(text: str) -> str:
+    """
+    Normalise un texte OCR pour le comparer à une lecture précédente.
+
+    Opérations: normalisation Unicode NFKC, unification des guillemets et
+    tirets, casse repliée, suppression des espaces parasites autour de la
+    ponctuation, ponctuation répétée réduite, espaces fusionnés.
+
+    Args:
+        text: Texte brut issu de l'OCR
+
+    Returns:
+        Texte normalisé
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = _GUILLEMETS.sub('"', text).translate(_PUNCTUATION_MAP).casefold()
+    text = _SPACE_BEFORE_PUNCT.sub(r"\1", text)
+    text = _SPACE_AFTER_OPEN.sub(r"\1", text)
+    text = _REPEATED_PUNCT.sub(r"\1", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
 
 class LLMClient:
     """Client pour interagir avec l'API Groq."""
@@ -36,13 +79,25 @@ D) [option D]
 
 Si le texte ne contient pas de QCM identifiable, indique-le clairement."""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "llama-3.3-70b-versatile"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "llama-3.3-70b-versatile",
+        temperature: float = 0.3,
+        cache: Optional[ResultCache] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[Tuple[float, float]] = None
+    ):
         """
         Initialise le client Groq.
 
         Args:
             api_key: Clé API Groq (ou depuis variable GROQ_API_KEY)
             model: Modèle à utiliser
+            temperature: Température d'échantillonnage
+            cache: Cache des réponses (optionnel)
+            session: Session HTTP à réutiliser (créée si absente)
+            timeout: Délais (connexion, lecture) en secondes
         """
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
         if not self.api_key:
@@ -54,17 +109,55 @@ Si le texte ne contient pas de QCM identifiable, indique-le clairement."""
             )
         
         self.model = model
-        self.base_url = "https://api.groq.com/openai/v1"
+        self.temperature = temperature
+        self.cache = cache
+        self.base_url = (os.getenv("GROQ_BASE_URL") or "https://api.groq.com/openai/v1").rstrip("/")
+        self.session = session or self._create_session()
+        self.timeout = timeout or get_timeouts()
 
-    def analyze_qcm_text(self, text: str) -> Optional[str]:
+        self.last_stream_completed = False
+
+        # Version du prompt : toute modification invalide les réponses en cache
+        self.prompt_version = hashlib.sha256(self.QCM_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+    def _create_session(self) -> Optional[requests.Session]:
+        """Session HTTP par défaut (les sous-classes asynchrones n'en créent pas)."""
+        return create_session()
+
+    def warm_up(self) -> Optional[float]:
         """
-        Analyse un texte de QCM avec Groq.
+        Ouvre la connexion vers Groq avant la première analyse.
+
+        Returns:
+            Durée en millisecondes, ou None en cas d'échec
+        """
+        return warm_up(self.session, self.base_url, self.timeout)
+
+    def _cache_key(self, text: str) -> str:
+        """
+        Construit la clé de cache d'un texte de QCM.
 
         Args:
             text: Texte extrait du QCM
 
         Returns:
-            Réponse formatée avec questions et réponses, ou None en cas d'erreur
+            Clé de cache
+        """
+        return make_key(
+            "llm", self.model, self.prompt_version, self.temperature,
+            normalize_qcm_text(text)
+        )
+
+    def _build_request(self, text: str, stream: bool = False) -> Tuple[str, dict, dict]:
+        """
+        Prépare la requête chat/completions.
+
+        Args:
+            text: Texte extrait du QCM
+            stream: Demander une réponse en flux SSE
+
+        Returns:
+            Tuple (url, en-têtes, payload JSON)
         """
         url = f"{self.base_url}/chat/completions"
         
@@ -85,42 +178,203 @@ Si le texte ne contient pas de QCM identifiable, indique-le clairement."""
                     "content": f"Voici le texte du QCM à analyser:\n\n{text}"
                 }
             ],
-            "temperature": 0.3,
+            "temperature": self.temperature,
             "max_tokens": 2000
         }
+        if stream:
+            payload["stream"] = True
+
+        return url, headers, payload
+
+    @staticmethod
+    def _report_status(status_code: int, error: Exception):
+        """
+        Affiche une erreur HTTP renvoyée par Groq.
+
+        Args:
+            status_code: Code HTTP
+            error: Exception correspondante
+        """
+        if status_code == 401:
+            print("❌ Clé API Groq invalide")
+        elif status_code == 429:
+            print("⚠️  Limite de requêtes atteinte - attendez quelques secondes")
+        else:
+            print(f"❌ Erreur HTTP {status_code}: {error}")
+
+    @staticmethod
+    def _report_error(error: Exception):
+        """
+        Affiche une erreur de requête de façon lisible.
+
+        Args:
+            error: Exception levée pendant la requête
+        """
+        if isinstance(error, requests.exceptions.Timeout):
+            print("⏱️  Timeout - la requête a pris trop de temps")
+        elif isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            LLMClient._report_status(error.response.status_code, error)
+        else:
+            print(f"❌ Erreur lors de l'analyse: {error}")
+
+    def _get_cached(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Recherche une réponse en cache.
+
+        Args:
+            text: Texte extrait du QCM
+
+        Returns:
+            Tuple (clé de cache ou None, réponse en cache ou None)
+        """
+        if self.cache is None:
+            return None, None
+        cache_key = self._cache_key(text)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print("✓ Réponse trouvée dans le cache")
+        return cache_key, cached
+
+    def analyze_qcm_text(
+        self,
+        text: str,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Optional[str]:
+        """
+        Analyse un texte de QCM avec Groq.
+
+        Args:
+            text: Texte extrait du QCM
+            on_token: Si fourni, la réponse est reçue en flux et chaque
+                fragment est transmis à ce callback dès sa génération
+
+        Returns:
+            Réponse formatée avec questions et réponses, ou None en cas d'erreur
+        """
+        if on_token is not None:
+            parts = []
+            for chunk in self.stream_qcm_text(text):
+                parts.append(chunk)
+                on_token(chunk)
+            return "".join(parts) if self.last_stream_completed else None
+
+        cache_key, cached = self._get_cached(text)
+        if cached is not None:
+            return cached
+
+        url, headers, payload = self._build_request(text)
 
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = self.session.post(url, headers=headers, json=payload, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
             answer = data.get("choices", [{}])[0].get("message", {}).get("content")
+            if answer and cache_key is not None:
+                self.cache.put(cache_key, answer)
             return answer
 
-        except requests.exceptions.Timeout:
-            print("⏱️  Timeout - la requête a pris trop de temps")
+        except Exception as e:
+            self._report_error(e)
             return None
 
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
-                print("❌ Clé API Groq invalide")
-            elif e.response.status_code == 429:
-                print("⚠️  Limite de requêtes atteinte - attendez quelques secondes")
-            else:
-                print(f"❌ Erreur HTTP {e.response.status_code}: {e}")
-            return None
+    def stream_qcm_text(self, text: str) -> Iterator[str]:
+        """
+        Analyse un texte de QCM en recevant la réponse en flux (SSE).
+
+        Les fragments sont produits au fur et à mesure de la génération.
+        En cas d'erreur, l'itération s'arrête et `last_stream_completed`
+        vaut False ; la réponse complète n'est mise en cache qu'en cas de
+        succès.
+
+        Args:
+            text: Texte extrait du QCM
+
+        Yields:
+            Fragments de texte de la réponse
+        """
+        self.last_stream_completed = False
+
+        cache_key, cached = self._get_cached(text)
+        if cached is not None:
+            self.last_stream_completed = True
+            yield cached
+            return
+
+        url, headers, payload = self._build_request(text, stream=True)
+        parts = []
+
+        try:
+            response = self.session.post(
+                url, headers=headers, json=payload, timeout=self.timeout, stream=True
+            )
+            try:
+                response.raise_for_status()
+                for chunk in self._iter_sse_content(response):
+                    parts.append(chunk)
+                    yield chunk
+            finally:
+                response.close()
 
         except Exception as e:
-            print(f"❌ Erreur lors de l'analyse: {e}")
-            return None
+            self._report_error(e)
+            return
+
+        self.last_stream_completed = True
+        if parts and cache_key is not None:
+            self.cache.put(cache_key, "".join(parts))
+
+    @staticmethod
+    def _iter_sse_content(response: requests.Response) -> Iterator[str]:
+        """
+        Extrait les fragments de contenu d'un flux SSE OpenAI-compatible.
+
+        Args:
+            response: Réponse HTTP ouverte en mode stream
+
+        Yields:
+            Contenu textuel de chaque événement "delta"
+        """
+        # SSE est toujours en UTF-8 ; sans charset, requests supposerait ISO-8859-1
+        response.encoding = "utf-8"
+        for line in response.iter_lines(decode_unicode=True):
+            done, content = LLMClient._parse_sse_line(line)
+            if done:
+                break
+            if content:
+                yield content
+
+    @staticmethod
+    def _parse_sse_line(line: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Décode une ligne d'un flux SSE chat/completions.
+
+        Args:
+            line: Ligne reçue (sans retour à la ligne)
+
+        Returns:
+            Tuple (fin du flux, contenu textuel éventuel)
+        """
+        if not line or not line.startswith("data:"):
+            return False, None
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return True, None
+        event = json.loads(data)
+        choices = event.get("choices") or [{}]
+        return False, choices[0].get("delta", {}).get("content")
 
 
-def create_llm_client(api_key: Optional[str] = None) -> LLMClient:
+def create_llm_client(
+    api_key: Optional[str] = None,
+    cache: Optional[ResultCache] = None
+) -> LLMClient:
     """
     Factory function pour créer un client Groq.
 
     Args:
         api_key: Clé API Groq (optionnel, lecture depuis .env par défaut)
+        cache: Cache des réponses (optionnel)
 
     Returns:
         Instance de LLMClient
@@ -128,4 +382,4 @@ def create_llm_client(api_key: Optional[str] = None) -> LLMClient:
     Raises:
         ValueError: Si la clé API est manquante
     """
-    return LLMClient(api_key=api_key)
+    return LLMClient(api_key=api_key, cache=cache)
@@ -0,0 +1,313 @@
+"""Mesures de latence par étape du pipeline : spans, histogrammes et export.
+
+Chaque étape (capture, conversion, encodage, envoi, OCR serveur, attente
+et génération LLM, affichage) produit un span avec sa durée et ses
+attributs (octets, succès du cache...). Les spans alimentent des
+histogrammes en mémoire (p50/p95/p99) et peuvent être exportés en JSON
+lines et au format textfile de Prometheus (node_exporter).
+"""
+
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+
+# Identifiant de la capture en cours (suivi à travers les tâches asyncio et les threads)
+current_trace: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("current_trace", default=None)
+
+
+@dataclass
+class Span:
+    """Durée d'une étape et ses attributs."""
+
+    name: str
+    start: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+    trace: Optional[int] = field(default_factory=current_trace.get)
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attrs):
+        """
+        Ajoute des attributs au span.
+
+        Args:
+            **attrs: Attributs (bytes, cache_hit...)
+        """
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation JSON du span."""
+        return {
+            "name": self.name,
+            "ts": round(self.start, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "trace": self.trace,
+            **self.attrs,
+        }
+
+
+class Histogram:
+    """Histogramme de latences sur une fenêtre glissante d'échantillons."""
+
+    def __init__(self, window: int = 1024):
+        """
+        Initialise l'histogramme.
+
+        Args:
+            window: Nombre d'échantillons conservés pour les quantiles
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        """
+        Ajoute un échantillon.
+
+        Args:
+            value: Valeur (ms)
+        """
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q: float) -> float:
+        """
+        Quantile des échantillons de la fenêtre (rang le plus proche).
+
+        Args:
+            q: Quantile entre 0 et 1
+
+        Returns:
+            Valeur du quantile (0 sans échantillon)
+        """
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Résumé de l'histogramme.
+
+        Returns:
+            Nombre, moyenne, p50, p95 et p99 (ms)
+        """
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 2),
+            "p95_ms": round(self.percentile(0.95), 2),
+            "p99_ms": round(self.percentile(0.99), 2),
+        }
+
+
+class MetricsRegistry:
+    """Collecte les spans du pipeline et les agrège par étape."""
+
+    def __init__(
+        self,
+        jsonl_path: Optional[str] = None,
+        prometheus_path: Optional[str] = None,
+        prefix: str = "qcm",
+        window: int = 1024
+    ):
+        """
+        Initialise le registre.
+
+        Args:
+            jsonl_path: Fichier JSON lines recevant chaque span (optionnel)
+            prometheus_path: Fichier textfile Prometheus réécrit par
+                write_prometheus() (optionnel)
+            prefix: Préfixe des métriques Prometheus
+            window: Échantillons conservés par histogramme
+        """
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.prefix = prefix
+        self.window = window
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, Histogram] = {}
+        self.bytes_total: Dict[str, int] = {}
+        self.cache_hits: Dict[str, int] = {}
+        self._trace_ids = 0
+
+    def new_trace(self) -> contextvars.Token:
+        """
+        Démarre le suivi d'une nouvelle capture.
+
+        Returns:
+            Jeton à passer à end_trace()
+        """
+        with self._lock:
+            self._trace_ids += 1
+            return current_trace.set(self._trace_ids)
+
+    def end_trace(self, token: contextvars.Token):
+        """
+        Termine le suivi d'une capture.
+
+        Args:
+            token: Jeton renvoyé par new_trace()
+        """
+        current_trace.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        """
+        Mesure une étape (utilisable autour de code synchrone ou de `await`).
+
+        Args:
+            name: Nom de l'étape
+            **attrs: Attributs initiaux
+
+        Yields:
+            Span, dont les attributs peuvent être complétés avec set()
+        """
+        span = Span(name, attrs=dict(attrs))
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            self.add(span)
+
+    def record(self, name: str, duration_ms: float, **attrs) -> Span:
+        """
+        Enregistre une étape mesurée ailleurs (ex: temps serveur OCRSpace).
+
+        Args:
+            name: Nom de l'étape
+            duration_ms: Durée (ms)
+            **attrs: Attributs
+
+        Returns:
+            Span enregistré
+        """
+        span = Span(name, start=time.time() - duration_ms / 1000, duration_ms=duration_ms, attrs=attrs)
+        self.add(span)
+        return span
+
+    def add(self, span: Span):
+        """
+        Ajoute un span terminé aux histogrammes (et au fichier JSON lines).
+
+        Args:
+            span: Span terminé
+        """
+        with self._lock:
+            histogram = self.histograms.get(span.name)
+            if histogram is None:
+                histogram = self.histograms[span.name] = Histogram(self.window)
+            histogram.observe(span.duration_ms)
+            if span.attrs.get("bytes"):
+                self.bytes_total[span.name] = self.bytes_total.get(span.name, 0) + int(span.attrs["bytes"])
+            if span.attrs.get("cache_hit"):
+                self.cache_hits[span.name] = self.cache_hits.get(span.name, 0) + 1
+
+            if self.jsonl_path:
+                try:
+                    with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(span.to_dict(), ensure_ascii=False) + "\n")
+                except OSError as e:
+                    print(f"⚠️  Export des métriques impossible ({self.jsonl_path}): {e}")
+                    self.jsonl_path = None
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Résumé des latences par étape.
+
+        Returns:
+            Par étape : nombre, moyenne, p50, p95, p99 (ms)
+        """
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in self.histograms.items()}
+
+    def report(self) -> str:
+        """
+        Tableau lisible des latences par étape.
+
+        Returns:
+            Texte du tableau
+        """
+        lines = [f"   {'étape':<16} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9}"]
+        for name, stats in self.get_stats().items():
+            lines.append(
+                f"   {name:<16} {stats['count']:>5} {stats['p50_ms']:>7.1f}ms "
+                f"{stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms"
+            )
+        return "\n".join(lines)
+
+    def prometheus_text(self) -> str:
+        """
+        Métriques au format d'exposition texte de Prometheus.
+
+        Returns:
+            Texte (summary de latence, octets et succès du cache par étape)
+        """
+        latency = f"{self.prefix}_stage_latency_ms"
+        lines = [
+            f"# HELP {latency} Latence des étapes du pipeline (ms).",
+            f"# TYPE {latency} summary",
+        ]
+        with self._lock:
+            for name, histogram in sorted(self.histograms.items()):
+                for q in (0.5, 0.95, 0.99):
+                    lines.append(f'{latency}{{stage="{name}",quantile="{q}"}} {histogram.percentile(q):.3f}')
+                lines.append(f'{latency}_sum{{stage="{name}"}} {histogram.total:.3f}')
+                lines.append(f'{latency}_count{{stage="{name}"}} {histogram.count}')
+
+            for metric, values, help_text in (
+                (f"{self.prefix}_stage_bytes_total", self.bytes_total, "Octets traités par étape."),
+                (f"{self.prefix}_stage_cache_hits_total", self.cache_hits, "Résultats servis par le cache."),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, value in sorted(values.items()):
+                    lines.append(f'{metric}{{stage="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[str] = None) -> bool:
+        """
+        Réécrit le fichier textfile Prometheus (remplacement atomique).
+
+        Args:
+            path: Chemin du fichier (prometheus_path par défaut)
+
+        Returns:
+            True si le fichier a été écrit
+        """
+        path = path or self.prometheus_path
+        if not path:
+            return False
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            print(f"⚠️  Export Prometheus impossible ({path}): {e}")
+            return False
+
+
+def spans_from_jsonl(path: str) -> List[Dict[str, Any]]:
+    """
+    Relit un fichier de spans JSON lines.
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        Liste des spans (dictionnaires)
+    """
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -1,8 +1,225 @@
 """Module OCR avec preprocessing d'image."""
 
-from typing import Optional, Tuple
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 from PIL import Image, ImageEnhance, ImageOps
-import pytesseract
+
+from src import preprocess as pp
+from src.cache import ResultCache, image_fingerprint, make_key
+
+try:
+    import tesserocr
+except ImportError:  # Dépendance optionnelle : repli sur pytesseract
+    tesserocr = None
+
+
+@dataclass
+class OCRLine:
+    """Ligne reconnue avec sa confiance et sa position."""
+
+    text: str
+    confidence: float
+    box: Tuple[int, int, int, int]  # gauche, haut, droite, bas
+
+
+class PytesseractEngine:
+    """Tesseract via pytesseract : un processus `tesseract` par appel."""
+
+    name = "pytesseract"
+
+    def __init__(self, lang: str, psm: int, tesseract_cmd: Optional[str] = None):
+        """
+        Initialise le moteur.
+
+        Args:
+            lang: Langues Tesseract (ex: 'fra+eng')
+            psm: Mode de segmentation de page
+            tesseract_cmd: Chemin vers l'exécutable Tesseract (optionnel)
+        """
+        import pytesseract  # Importé au premier moteur créé (coût évité en mode cloud)
+
+        self._pytesseract = pytesseract
+        self.lang = lang
+        self.config = f'--psm {psm}'
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    def recognize(self, image: Image.Image) -> str:
+        """
+        Reconnaît le texte d'une image.
+
+        Args:
+            image: Image PIL
+
+        Returns:
+            Texte brut
+        """
+        return self._pytesseract.image_to_string(image, lang=self.lang, config=self.config)
+
+    def recognize_lines(self, image: Image.Image, psm: int) -> List[OCRLine]:
+        """
+        Reconnaît les lignes d'une image avec leur confiance.
+
+        Args:
+            image: Image PIL
+            psm: Mode de segmentation de page
+
+        Returns:
+            Lignes dans l'ordre de lecture
+        """
+        data = self._pytesseract.image_to_data(
+            image, lang=self.lang, config=f'--psm {psm}',
+            output_type=self._pytesseract.Output.DICT
+        )
+        lines = {}
+        for i, word in enumerate(data["text"]):
+            confidence = float(data["conf"][i])
+            if confidence < 0 or not word.strip():
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            left, top = data["left"][i], data["top"][i]
+            right, bottom = left + data["width"][i], top + data["height"][i]
+            if key not in lines:
+                lines[key] = ([], [], [left, top, right, bottom])
+            words, confidences, box = lines[key]
+            words.append(word)
+            confidences.append(confidence)
+            box[:] = [min(box[0], left), min(box[1], top), max(box[2], right), max(box[3], bottom)]
+        return [
+            OCRLine(" ".join(words), sum(confidences) / len(confidences), tuple(box))
+            for words, confidences, box in lines.values()
+        ]
+
+    def close(self):
+        """Rien à libérer."""
+
+
+class TesserocrEngine:
+    """Tesseract dans le processus via tesserocr.
+
+    L'API Tesseract (et les modèles de langue) est chargée une seule fois
+    puis réutilisée ; les pixels sont transmis directement depuis la
+    mémoire, sans fichier temporaire ni processus externe.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang: str, psm: int, tessdata_path: Optional[str] = None):
+        """
+        Charge l'API Tesseract.
+
+        Args:
+            lang: Langues Tesseract (ex: 'fra+eng')
+            psm: Mode de segmentation de page
+            tessdata_path: Dossier des modèles (TESSDATA_PREFIX par défaut)
+
+        Raises:
+            ImportError: Si tesserocr n'est pas installé
+            RuntimeError: Si les modèles de langue ne peuvent pas être chargés
+        """
+        if tesserocr is None:
+            raise ImportError("tesserocr n'est pas installé (pip install tesserocr)")
+
+        kwargs = {"lang": lang, "psm": psm}
+        if tessdata_path:
+            kwargs["path"] = tessdata_path
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+        self._psm = psm
+        # L'API Tesseract n'est pas utilisable depuis plusieurs threads à la fois
+        self._lock = threading.Lock()
+
+    def recognize(self, image: Image.Image) -> str:
+        """
+        Reconnaît le texte d'une image.
+
+        Args:
+            image: Image PIL
+
+        Returns:
+            Texte brut
+        """
+        if image.mode not in ("L", "RGB"):
+            image = image.convert("RGB")
+        channels = len(image.getbands())
+        with self._lock:
+            self._api.SetImageBytes(
+                image.tobytes(), image.width, image.height,
+                channels, image.width * channels
+            )
+            return self._api.GetUTF8Text()
+
+    def recognize_lines(self, image: Image.Image, psm: int) -> List[OCRLine]:
+        """
+        Reconnaît les lignes d'une image avec leur confiance.
+
+        Args:
+            image: Image PIL
+            psm: Mode de segmentation de page
+
+        Returns:
+            Lignes dans l'ordre de lecture
+        """
+        if image.mode not in ("L", "RGB"):
+            image = image.convert("RGB")
+        channels = len(image.getbands())
+        level = tesserocr.RIL.TEXTLINE
+        lines = []
+        with self._lock:
+            self._api.SetPageSegMode(psm)
+            self._api.SetImageBytes(
+                image.tobytes(), image.width, image.height,
+                channels, image.width * channels
+            )
+            self._api.Recognize()
+            iterator = self._api.GetIterator()
+            if iterator is not None:
+                for item in tesserocr.iterate_level(iterator, level):
+                    text = (item.GetUTF8Text(level) or "").strip()
+                    if text:
+                        lines.append(OCRLine(text, item.Confidence(level), item.BoundingBox(level)))
+            self._api.SetPageSegMode(self._psm)
+        return lines
+
+    def close(self):
+        """Libère l'API Tesseract."""
+        self._api.End()
+
+
+def create_engine(
+    engine: str = "auto",
+    lang: str = "fra+eng",
+    psm: int = 6,
+    tesseract_cmd: Optional[str] = None
+):
+    """
+    Crée le moteur Tesseract demandé.
+
+    Args:
+        engine: "tesserocr", "pytesseract" ou "auto" (tesserocr si disponible)
+        lang: Langues Tesseract
+        psm: Mode de segmentation de page
+        tesseract_cmd: Chemin vers l'exécutable Tesseract (pytesseract)
+
+    Returns:
+        Moteur avec une méthode recognize(image) -> str
+
+    Raises:
+        ValueError: Si le moteur est inconnu
+    """
+    if engine not in ("auto", "tesserocr", "pytesseract"):
+        raise ValueError(f"Moteur Tesseract inconnu: {engine} (auto, tesserocr, pytesseract)")
+
+    if engine in ("auto", "tesserocr"):
+        try:
+            return TesserocrEngine(lang, psm)
+        except (ImportError, RuntimeError) as e:
+            if engine == "tesserocr":
+                raise
+            if tesserocr is not None:
+                print(f"⚠️  tesserocr indisponible ({e}), repli sur pytesseract")
+    return PytesseractEngine(lang, psm, tesseract_cmd)
 
 
 class OCRProcessor:
@@ -12,7 +229,12 @@ class OCRProcessor:
         self,
         lang: str = "fra+eng",
         min_text_length: int = 30,
-        tesseract_cmd: Optional[str] = None
+        tesseract_cmd: Optional[str] = None,
+        cache: Optional[ResultCache] = None,
+        engine: str = "auto",
+        workers: int = 1,
+        adaptive: bool = True,
+        min_confidence: float = 70.0
     ):
         """
         Initialise le processeur OCR.
@@ -21,12 +243,52 @@ class OCRProcessor:
             lang: Langues pour Tesseract (ex: 'fra+eng')
             min_text_length: Longueur minimale de texte acceptable
             tesseract_cmd: Chemin vers l'exécutable Tesseract (optionnel)
+            cache: Cache de résultats OCR partagé (optionnel)
+            engine: Moteur Tesseract ("auto" = tesserocr si installé,
+                sinon pytesseract)
+            workers: Nombre de processus ; au-delà de 1, l'image est
+                découpée en bandes reconnues en parallèle
+            adaptive: Prétraitement adaptatif guidé par la confiance
+                (sinon contraste, netteté et seuil fixes)
+            min_confidence: Confiance (0-100) en dessous de laquelle une
+                ligne est relue avec un prétraitement plus fort
         """
         self.lang = lang
         self.min_text_length = min_text_length
-        
-        if tesseract_cmd:
-            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        self.cache = cache
+        self.psm = 6  # PSM 6: bloc de texte uniforme
+        self.tesseract_config = f'--psm {self.psm}'
+        self.adaptive = adaptive
+        self.min_confidence = min_confidence
+
+        # Résumé du dernier OCR adaptatif (chemin suivi, lignes relues)
+        self.last_stats = {}
+        if workers > 1:
+            from src.ocr_parallel import ParallelOCR
+            self.engine = ParallelOCR(workers=workers, lang=lang, psm=self.psm, engine=engine)
+        else:
+            self.engine = create_engine(engine, lang, self.psm, tesseract_cmd)
+
+    def close(self):
+        """Libère le moteur Tesseract."""
+        self.engine.close()
+
+    def warm_up(self) -> Optional[float]:
+        """
+        Charge les modèles Tesseract (ou démarre le pool) avant le premier OCR.
+
+        Returns:
+            Durée en millisecondes, ou None en cas d'échec
+        """
+        start = time.perf_counter()
+        try:
+            if hasattr(self.engine, "warm_up"):
+                self.engine.warm_up()
+            else:
+                self.engine.recognize(Image.new("L", (64, 32), 255))
+        except Exception:
+            return None
+        return (time.perf_counter() - start) * 1000
 
     def preprocess_image(self, image: Image.Image) -> Image.Image:
         """
@@ -43,8 +305,8 @@ class OCRProcessor:
         Returns:
             Image prétraitée
         """
-        # Conversion en niveaux de gris
-        gray_image = ImageOps.grayscale(image)
+        # Conversion en niveaux de gris (déjà faite par la capture en mode "gray")
+        gray_image = image if image.mode == "L" else ImageOps.grayscale(image)
 
         # Augmentation du contraste
         enhancer = ImageEnhance.Contrast(gray_image)
@@ -61,6 +323,85 @@ class OCRProcessor:
 
         return binary_image
 
+    def _reread_line(self, gray, line: OCRLine, padding: int = 4) -> OCRLine:
+        """
+        Relit une ligne peu fiable avec des prétraitements de plus en plus forts.
+
+        Étapes : agrandissement si le texte est petit, puis seuil d'Otsu,
+        puis seuil local de Sauvola ; la lecture la plus confiante est gardée.
+
+        Args:
+            gray: Tableau de niveaux de gris (texte sombre sur fond clair)
+            line: Ligne lue au premier passage
+            padding: Marge autour de la ligne en pixels
+
+        Returns:
+            Meilleure lecture de la ligne
+        """
+        left, top, right, bottom = line.box
+        crop = gray[max(0, top - padding):bottom + padding, max(0, left - padding):right + padding]
+        if crop.size == 0:
+            return line
+
+        factor = pp.upscale_factor(bottom - top)
+        best = line
+        for binarize in (pp.otsu_binarize, pp.sauvola_binarize):
+            region = Image.fromarray(binarize(crop))
+            if factor > 1:
+                region = region.resize(
+                    (region.width * factor, region.height * factor), Image.Resampling.LANCZOS
+                )
+            candidates = self.engine.recognize_lines(region, 7)
+            if candidates:
+                text = " ".join(c.text for c in candidates)
+                confidence = min(c.confidence for c in candidates)
+                if confidence > best.confidence:
+                    best = OCRLine(text, confidence, line.box)
+            if best.confidence >= self.min_confidence:
+                break
+        return best
+
+    def _adaptive_ocr(self, image: Image.Image) -> str:
+        """
+        OCR adaptatif : passage rapide, puis relecture des seules lignes douteuses.
+
+        Le premier passage se fait sur l'image en niveaux de gris (inversée
+        en mode sombre), avec un mode de segmentation choisi d'après la mise
+        en page. Seules les lignes sous `min_confidence` paient les
+        prétraitements plus coûteux ; sans aucune ligne reconnue, l'image
+        entière est binarisée (Sauvola) et relue.
+
+        Args:
+            image: Image PIL
+
+        Returns:
+            Texte brut
+        """
+        gray = pp.normalize_polarity(pp.to_gray_array(image))
+        psm = pp.choose_psm(gray)
+        lines = self.engine.recognize_lines(Image.fromarray(gray), psm)
+
+        if not lines:
+            factor = pp.upscale_factor(pp.estimate_text_height(gray))
+            region = Image.fromarray(pp.sauvola_binarize(gray))
+            if factor > 1:
+                region = region.resize((region.width * factor, region.height * factor), Image.Resampling.LANCZOS)
+            lines = self.engine.recognize_lines(region, psm)
+            self.last_stats = {"path": "full", "psm": psm, "lines": len(lines), "reread": 0}
+            return "\n".join(line.text for line in lines)
+
+        weak = [i for i, line in enumerate(lines) if line.confidence < self.min_confidence]
+        for i in weak:
+            lines[i] = self._reread_line(gray, lines[i])
+
+        self.last_stats = {
+            "path": "reread" if weak else "fast",
+            "psm": psm,
+            "lines": len(lines),
+            "reread": len(weak),
+        }
+        return "\n".join(line.text for line in lines)
+
     def extract_text(
         self,
         image: Image.Image,
@@ -78,21 +419,33 @@ class OCRProcessor:
             succès = False si le texte est trop court
         """
         try:
-            # Prétraitement si demandé
-            if preprocess:
-                processed_image = self.preprocess_image(image)
-            else:
-                processed_image = image
+            cache_key = None
+            text = None
+            if self.cache is not None:
+                cache_key = make_key(
+                    "tesseract", image_fingerprint(image), self.lang,
+                    self.tesseract_config, preprocess, self.adaptive
+                )
+                text = self.cache.get(cache_key)
 
-            # Extraction OCR
-            text = pytesseract.image_to_string(
-                processed_image,
-                lang=self.lang,
-                config='--psm 6'  # PSM 6: bloc de texte uniforme
-            )
+            if text is None:
+                if preprocess and self.adaptive and hasattr(self.engine, "recognize_lines"):
+                    text = self._adaptive_ocr(image)
+                else:
+                    # Prétraitement si demandé
+                    if preprocess:
+                        processed_image = self.preprocess_image(image)
+                    else:
+                        processed_image = image
+
+                    # Extraction OCR
+                    text = self.engine.recognize(processed_image)
+
+                # Nettoyage du texte
+                text = text.strip()
 
-            # Nettoyage du texte
-            text = text.strip()
+                if cache_key is not None:
+                    self.cache.put(cache_key, text)
 
             # Vérification longueur minimale
             if len(text) < self.min_text_length:
@@ -1,11 +1,14 @@
 """Module OCR via API OCRSpace (gratuit)."""
 
 import os
-import base64
+import time
 from typing import Optional, Tuple
 from PIL import Image
 import requests
-import io
+
+from src.cache import ResultCache, image_fingerprint, make_key
+from src.encoder import ImageEncoder
+from src.http_session import create_session, get_timeouts, origin, warm_up
 
 
 class OCRSpaceAPI:
@@ -14,7 +17,12 @@ class OCRSpaceAPI:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        language: str = "fre"
+        language: str = "fre",
+        engine: int = 2,
+        cache: Optional[ResultCache] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[Tuple[float, float]] = None,
+        encoder: Optional[ImageEncoder] = None
     ):
         """
         Initialise le client OCRSpace.
@@ -22,10 +30,24 @@ class OCRSpaceAPI:
         Args:
             api_key: Clé API OCRSpace (gratuite sur ocr.space/ocrapi)
             language: Code langue (fre=français, eng=anglais)
+            engine: Moteur OCRSpace (2 est plus précis)
+            cache: Cache de résultats OCR partagé (optionnel)
+            session: Session HTTP à réutiliser (créée si absente)
+            timeout: Délais (connexion, lecture) en secondes
+            encoder: Encodeur d'image (budget de 900 KB par défaut)
         """
         self.api_key = api_key or os.getenv("OCRSPACE_API_KEY")
         self.language = language
-        self.api_url = "https://api.ocr.space/parse/image"
+        self.engine = engine
+        self.cache = cache
+        self.max_size = (1920, 1080)
+        self.encoder = encoder or ImageEncoder(max_size=self.max_size)
+        self.api_url = os.getenv("OCRSPACE_API_URL") or "https://api.ocr.space/parse/image"
+        self.session = session or self._create_session()
+        self.timeout = timeout or get_timeouts()
+
+        # Mesures de la dernière requête (taille, encodage, aller-retour)
+        self.last_stats = {}
         
         if not self.api_key:
             raise ValueError(
@@ -34,36 +56,133 @@ class OCRSpaceAPI:
                 "Puis ajoutez OCRSPACE_API_KEY dans .env"
             )
 
-    def _image_to_base64(self, image: Image.Image) -> str:
+    def _create_session(self) -> Optional[requests.Session]:
+        """Session HTTP par défaut (les sous-classes asynchrones n'en créent pas)."""
+        return create_session()
+
+    def warm_up(self) -> Optional[float]:
+        """
+        Ouvre la connexion vers OCRSpace avant la première capture.
+
+        Returns:
+            Durée en millisecondes, ou None en cas d'échec
+        """
+        return warm_up(self.session, origin(self.api_url), self.timeout)
+
+    def _cache_key(self, image: Image.Image) -> str:
+        """
+        Construit la clé de cache d'une image pour ce client.
+
+        Args:
+            image: Image PIL (avant redimensionnement)
+
+        Returns:
+            Clé de cache
+        """
+        return make_key(
+            "ocrspace", image_fingerprint(image), self.language,
+            self.engine, self.encoder.signature
+        )
+
+    def _get_cached(self, image: Image.Image) -> Tuple[Optional[str], Optional[str]]:
         """
-        Convertit une image PIL en base64 avec compression.
+        Recherche le texte d'une image en cache.
 
         Args:
             image: Image PIL
 
         Returns:
-            String base64
+            Tuple (clé de cache ou None, texte en cache ou None)
         """
-        buffered = io.BytesIO()
-        
-        # Redimensionner si trop grande
-        max_size = (1920, 1080)
-        if image.width > max_size[0] or image.height > max_size[1]:
-            image.thumbnail(max_size, Image.Resampling.LANCZOS)
-            print(f"   Image redimensionnée à {image.size}")
-        
-        # Sauvegarder avec compression
-        image.save(buffered, format="JPEG", quality=85, optimize=True)
-        size_kb = buffered.tell() / 1024
-        
-        # Si toujours trop gros, réduire la qualité
-        if size_kb > 900:  # Marge de sécurité
-            buffered = io.BytesIO()
-            image.save(buffered, format="JPEG", quality=70, optimize=True)
-            size_kb = buffered.tell() / 1024
-            print(f"   Image compressée à {size_kb:.1f} KB")
-        
-        return base64.b64encode(buffered.getvalue()).decode('utf-8')
+        # Statistiques propres à cet appel (pas celles de l'envoi précédent)
+        self.last_stats = {}
+        if self.cache is None:
+            return None, None
+        cache_key = self._cache_key(image)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.last_stats = {"cache_hit": True}
+            print(f"✓ Texte extrait du cache: {len(cached)} caractères")
+        return cache_key, cached
+
+    def _build_payload(self, image: Image.Image) -> Tuple[dict, dict]:
+        """
+        Prépare la requête multipart envoyée à OCRSpace.
+
+        L'image est encodée en une passe (voir ImageEncoder) puis envoyée
+        comme fichier binaire directement depuis le tampon mémoire (pas
+        d'encodage base64, ~33 % d'octets en moins).
+
+        Args:
+            image: Image PIL
+
+        Returns:
+            Tuple (champs du formulaire, fichiers)
+        """
+        encoded = self.encoder.encode(image)
+        self.last_stats = {
+            "payload_bytes": encoded.nbytes,
+            "encode_ms": encoded.encode_ms,
+            "format": encoded.format,
+            "quality": encoded.quality,
+        }
+
+        data = {
+            'apikey': self.api_key,
+            'language': self.language,
+            'isOverlayRequired': False,
+            'filetype': encoded.filetype,
+            'OCREngine': self.engine
+        }
+        files = {'file': (f'screen.{encoded.filetype.lower()}', encoded.buffer, encoded.mime_type)}
+        return data, files
+
+    def _record_response(self, result: dict, request_ms: float):
+        """
+        Complète les mesures de la dernière requête.
+
+        Args:
+            result: Réponse JSON décodée
+            request_ms: Durée d'envoi et de réponse en millisecondes
+        """
+        self.last_stats["request_ms"] = request_ms
+        server_ms = result.get("ProcessingTimeInMilliseconds")
+        if server_ms is not None:
+            self.last_stats["server_ms"] = float(server_ms)
+
+    def _parse_result(self, result: dict, cache_key: Optional[str]) -> Tuple[str, bool]:
+        """
+        Interprète la réponse JSON d'OCRSpace.
+
+        Args:
+            result: Réponse JSON décodée
+            cache_key: Clé sous laquelle mettre le texte en cache (optionnel)
+
+        Returns:
+            Tuple (texte extrait, succès)
+        """
+        # Vérifier les erreurs
+        if result.get('IsErroredOnProcessing'):
+            error_msg = result.get('ErrorMessage', ['Erreur inconnue'])[0]
+            print(f"❌ Erreur OCRSpace: {error_msg}")
+            return "", False
+
+        # Extraire le texte
+        parsed_results = result.get('ParsedResults', [])
+        if not parsed_results:
+            print("⚠️  Aucun texte détecté")
+            return "", False
+
+        text = parsed_results[0].get('ParsedText', '').strip()
+
+        if not text:
+            print("⚠️  Texte vide")
+            return "", False
+
+        print(f"✓ Texte extrait: {len(text)} caractères")
+        if cache_key is not None:
+            self.cache.put(cache_key, text)
+        return text, True
 
     def extract_text(self, image: Image.Image) -> Tuple[str, bool]:
         """
@@ -75,52 +194,30 @@ class OCRSpaceAPI:
         Returns:
             Tuple (texte extrait, succès)
         """
-        try:
-            # Convertir l'image en base64
-            image_b64 = self._image_to_base64(image)
+        cache_key, cached = self._get_cached(image)
+        if cached is not None:
+            return cached, True
 
+        try:
             # Préparer la requête
-            payload = {
-                'apikey': self.api_key,
-                'language': self.language,
-                'isOverlayRequired': False,
-                'base64Image': f'data:image/jpeg;base64,{image_b64}',
-                'OCREngine': 2  # Moteur 2 est plus précis
-            }
-
-            print(f"📤 Envoi à OCRSpace API...")
+            data, files = self._build_payload(image)
+
+            print(f"📤 Envoi à OCRSpace API ({self.last_stats['payload_bytes'] / 1024:.1f} KB)...")
             
             # Envoyer la requête
-            response = requests.post(
+            start = time.perf_counter()
+            response = self.session.post(
                 self.api_url,
-                data=payload,
-                timeout=30
+                data=data,
+                files=files,
+                timeout=self.timeout
             )
             response.raise_for_status()
-
-            # Parser la réponse
             result = response.json()
+            self._record_response(result, (time.perf_counter() - start) * 1000)
 
-            # Vérifier les erreurs
-            if result.get('IsErroredOnProcessing'):
-                error_msg = result.get('ErrorMessage', ['Erreur inconnue'])[0]
-                print(f"❌ Erreur OCRSpace: {error_msg}")
-                return "", False
-
-            # Extraire le texte
-            parsed_results = result.get('ParsedResults', [])
-            if not parsed_results:
-                print("⚠️  Aucun texte détecté")
-                return "", False
-
-            text = parsed_results[0].get('ParsedText', '').strip()
-
-            if not text:
-                print("⚠️  Texte vide")
-                return "", False
-
-            print(f"✓ Texte extrait: {len(text)} caractères")
-            return text, True
+            # Parser la réponse
+            return self._parse_result(result, cache_key)
 
         except requests.exceptions.Timeout:
             print("❌ Timeout de l'API OCRSpace")
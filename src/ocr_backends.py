@@ -0,0 +1,117 @@
+"""Registre des moteurs OCR, importés seulement lorsqu'ils sont choisis.
+
+Un moteur OCR est un objet exposant `extract_text(image) -> (texte, succès)`
+(méthode synchrone ou coroutine). Il peut aussi proposer `warm_up()`,
+`close()`, `aclose()`, `last_stats` ou `get_stats()`, utilisés s'ils existent.
+
+Pour ajouter un moteur, on enregistre une fabrique sous un nom ; les
+imports lourds se font dans la fabrique, donc au premier usage :
+
+    @register_backend("mon_moteur")
+    def _create_mon_moteur(**options):
+        from src.mon_moteur import MonMoteur
+        return MonMoteur(lang=options.get("tesseract_lang", "fra+eng"))
+"""
+
+from typing import Any, Callable, Dict, List
+
+
+BackendFactory = Callable[..., Any]
+
+_REGISTRY: Dict[str, BackendFactory] = {}
+
+
+def register_backend(name: str) -> Callable[[BackendFactory], BackendFactory]:
+    """
+    Décorateur enregistrant une fabrique de moteur OCR.
+
+    La fabrique reçoit les options de l'application en arguments nommés
+    (language, cache, encoder, use_async, tesseract_lang...) et ignore
+    celles qui ne la concernent pas.
+
+    Args:
+        name: Nom du moteur (valeur de OCR_BACKEND)
+
+    Returns:
+        Décorateur renvoyant la fabrique inchangée
+    """
+    def decorator(factory: BackendFactory) -> BackendFactory:
+        _REGISTRY[name.lower()] = factory
+        return factory
+    return decorator
+
+
+def available_backends() -> List[str]:
+    """
+    Noms des moteurs enregistrés.
+
+    Returns:
+        Liste des noms, dans l'ordre d'enregistrement
+    """
+    return list(_REGISTRY)
+
+
+def create_backend(name: str, **options) -> Any:
+    """
+    Crée un moteur OCR par son nom (l'import a lieu ici).
+
+    Args:
+        name: Nom du moteur
+        **options: Options transmises à la fabrique
+
+    Returns:
+        Moteur OCR
+
+    Raises:
+        ValueError: Si le moteur n'est pas enregistré
+        ImportError: Si une dépendance du moteur est absente
+    """
+    factory = _REGISTRY.get(name.lower())
+    if factory is None:
+        raise ValueError(f"Moteur OCR inconnu: {name} ({', '.join(_REGISTRY)})")
+    return factory(**options)
+
+
+def backend_parts(backend: Any, name: str) -> Dict[str, Any]:
+    """
+    Moteurs élémentaires d'un moteur (ceux d'un moteur composite).
+
+    Args:
+        backend: Moteur OCR
+        name: Nom sous lequel il a été créé
+
+    Returns:
+        Dictionnaire nom -> moteur
+    """
+    return dict(getattr(backend, "backends", None) or [(name, backend)])
+
+
+@register_backend("ocrspace")
+def _create_ocrspace(language: str = "fre", cache=None, encoder=None, use_async: bool = False, **_):
+    """OCRSpace API (client httpx asynchrone ou requests)."""
+    if use_async:
+        from src.async_clients import AsyncOCRSpaceAPI as api_class
+    else:
+        from src.ocr_api import OCRSpaceAPI as api_class
+    return api_class(language=language, cache=cache, encoder=encoder)
+
+
+@register_backend("tesseract")
+def _create_tesseract(tesseract_lang: str = "fra+eng", cache=None, tesseract_workers: int = 1, **_):
+    """Tesseract local (tesserocr ou pytesseract), en bandes parallèles au-delà d'un processus."""
+    from src.ocr import OCRProcessor
+    return OCRProcessor(lang=tesseract_lang, cache=cache, workers=tesseract_workers)
+
+
+@register_backend("hybrid")
+def _create_hybrid(hybrid_backends: str = "ocrspace,tesseract", quality_bar: float = 0.6, **options):
+    """Plusieurs moteurs en course, premier résultat de qualité suffisante."""
+    from src.ocr_hybrid import HybridOCR
+    names = [name.strip() for name in hybrid_backends.split(",") if name.strip()]
+    if "hybrid" in names:
+        raise ValueError("Le moteur hybrid ne peut pas se contenir lui-même")
+    return HybridOCR(
+        [(name, create_backend(name, **options)) for name in names],
+        quality_bar=quality_bar
+    )
+
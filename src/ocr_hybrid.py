@@ -0,0 +1,171 @@
+"""OCR hybride : course entre plusieurs moteurs, premier résultat de qualité suffisante."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from PIL import Image
+
+from src.questions import parse_questions
+
+
+# Ponctuation attendue dans un QCM (le reste trahit souvent du bruit OCR)
+_QCM_PUNCTUATION = set(".,;:!?'\"()[]-–—/%+=<>«»’…°")
+
+
+def score_text(text: str, target_length: int = 200) -> float:
+    """
+    Évalue la qualité d'un texte OCR de QCM (0 = inutilisable, 1 = excellent).
+
+    Critères :
+    - longueur (jusqu'à `target_length` caractères) ;
+    - cohérence des caractères (lettres, chiffres, ponctuation courante
+      plutôt que symboles parasites) ;
+    - structure de QCM détectée (questions avec options).
+
+    Args:
+        text: Texte extrait
+        target_length: Longueur à partir de laquelle le critère est plein
+
+    Returns:
+        Score entre 0 et 1
+    """
+    text = text.strip()
+    if not text:
+        return 0.0
+
+    length = min(1.0, len(text) / target_length)
+
+    visible = [c for c in text if not c.isspace()]
+    sane = sum(1 for c in visible if c.isalnum() or c in _QCM_PUNCTUATION)
+    sanity = sane / len(visible) if visible else 0.0
+
+    questions = parse_questions(text)
+    if any(question.options for question in questions):
+        structure = 1.0
+    elif questions:
+        structure = 0.6
+    else:
+        structure = 0.0
+
+    return round(0.3 * length + 0.4 * sanity + 0.3 * structure, 3)
+
+
+class HybridOCR:
+    """Lance plusieurs moteurs OCR en parallèle et garde le premier bon résultat.
+
+    Chaque moteur expose `extract_text(image) -> (texte, succès)`, synchrone
+    (exécuté dans un thread) ou asynchrone. Dès qu'un résultat atteint
+    `quality_bar`, les autres moteurs sont annulés (ou ignorés s'ils
+    tournent dans un thread) ; sinon le meilleur résultat obtenu est
+    renvoyé. Victoires, échecs et latences sont comptés par moteur.
+    """
+
+    def __init__(
+        self,
+        backends: List[Tuple[str, Any]],
+        quality_bar: float = 0.6,
+        latency_window: int = 256
+    ):
+        """
+        Initialise l'OCR hybride.
+
+        Args:
+            backends: Liste de (nom, moteur) par ordre de préférence
+            quality_bar: Score minimal d'un résultat accepté immédiatement
+            latency_window: Nombre de latences conservées par moteur
+        """
+        self.backends = backends
+        self.quality_bar = quality_bar
+        self.stats: Dict[str, Dict[str, Any]] = {
+            name: {"runs": 0, "wins": 0, "failures": 0, "latencies_ms": deque(maxlen=latency_window)}
+            for name, _ in backends
+        }
+        self.last_winner: Optional[str] = None
+
+    async def _run(self, name: str, backend: Any, image: Image.Image) -> Tuple[str, str, bool, float]:
+        """
+        Exécute un moteur et mesure sa latence.
+
+        Args:
+            name: Nom du moteur
+            backend: Moteur OCR
+            image: Image à analyser
+
+        Returns:
+            Tuple (nom, texte, succès, score)
+        """
+        start = time.perf_counter()
+        if asyncio.iscoroutinefunction(backend.extract_text):
+            text, success = await backend.extract_text(image)
+        else:
+            text, success = await asyncio.to_thread(backend.extract_text, image)
+        self.stats[name]["latencies_ms"].append((time.perf_counter() - start) * 1000)
+        return name, text, success, score_text(text) if success else 0.0
+
+    async def extract_text(self, image: Image.Image) -> Tuple[str, bool]:
+        """
+        Extrait le texte avec le premier moteur donnant un résultat de qualité.
+
+        Args:
+            image: Image PIL à analyser
+
+        Returns:
+            Tuple (texte extrait, succès)
+        """
+        tasks = {}
+        for name, backend in self.backends:
+            self.stats[name]["runs"] += 1
+            tasks[asyncio.create_task(self._run(name, backend, image))] = name
+
+        best = None
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        self.stats[tasks[task]]["failures"] += 1
+                        continue
+                    name, text, success, score = task.result()
+                    if not success:
+                        self.stats[name]["failures"] += 1
+                        continue
+                    if best is None or score > best[3]:
+                        best = (name, text, success, score)
+                if best is not None and best[3] >= self.quality_bar:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if best is None:
+            self.last_winner = None
+            return "", False
+
+        name, text, _, score = best
+        self.stats[name]["wins"] += 1
+        self.last_winner = name
+        print(f"🏁 OCR retenu: {name} (score {score:.2f})")
+        return text, True
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Statistiques par moteur.
+
+        Returns:
+            Par moteur : exécutions, taux de victoire, échecs, latence
+            moyenne et médiane (ms) des `latency_window` dernières
+            exécutions terminées
+        """
+        summary = {}
+        for name, stats in self.stats.items():
+            latencies = sorted(stats["latencies_ms"])
+            summary[name] = {
+                "runs": stats["runs"],
+                "win_rate": stats["wins"] / stats["runs"] if stats["runs"] else 0.0,
+                "failures": stats["failures"],
+                "mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+                "p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+            }
+        return summary
@@ -0,0 +1,275 @@
+"""OCR local parallèle : découpage en bandes horizontales et pool de processus Tesseract."""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+from src.ocr import OCRLine, create_engine
+
+
+Band = Tuple[int, int]
+
+# Moteur Tesseract propre à chaque processus du pool (chargé une seule fois)
+_worker_engine = None
+
+
+def _init_worker(engine_factory: Callable):
+    """
+    Initialise un processus du pool : charge le moteur et ses modèles.
+
+    Args:
+        engine_factory: Fonction sans argument créant le moteur
+    """
+    global _worker_engine
+    _worker_engine = engine_factory()
+
+
+def _ping() -> int:
+    """Tâche vide utilisée pour démarrer les processus à l'avance."""
+    return os.getpid()
+
+
+def _recognize_band(data: bytes, size: Tuple[int, int], mode: str) -> str:
+    """
+    OCR d'une bande dans un processus du pool.
+
+    Args:
+        data: Pixels bruts de la bande
+        size: Taille (largeur, hauteur)
+        mode: Mode PIL de l'image
+
+    Returns:
+        Texte reconnu
+    """
+    return _worker_engine.recognize(Image.frombytes(mode, size, data))
+
+
+def _recognize_band_lines(data: bytes, size: Tuple[int, int], mode: str, psm: int, top: int) -> List[OCRLine]:
+    """
+    Lignes d'une bande (texte, confiance, position) dans un processus du pool.
+
+    Args:
+        data: Pixels bruts de la bande
+        size: Taille (largeur, hauteur)
+        mode: Mode PIL de l'image
+        psm: Mode de segmentation de page
+        top: Position de la bande dans l'image (décalage des boîtes)
+
+    Returns:
+        Lignes reconnues, boîtes dans le repère de l'image entière
+    """
+    lines = _worker_engine.recognize_lines(Image.frombytes(mode, size, data), psm)
+    return [
+        OCRLine(line.text, line.confidence, (line.box[0], line.box[1] + top, line.box[2], line.box[3] + top))
+        for line in lines
+    ]
+
+
+def find_bands(
+    image: Image.Image,
+    count: int,
+    min_gap: int = 4,
+    overlap: int = 24,
+    dark_threshold: int = 128
+) -> List[Band]:
+    """
+    Découpe une image en bandes horizontales coupées dans les blancs.
+
+    Chaque coupe est placée au milieu de l'interligne le plus proche de la
+    position idéale (bandes de hauteurs égales). Sans interligne exploitable
+    à proximité, les bandes voisines se chevauchent de `overlap` pixels pour
+    ne couper aucune ligne ; les doublons sont retirés à la fusion.
+
+    Args:
+        image: Image prétraitée (texte sombre sur fond clair)
+        count: Nombre de bandes souhaité
+        min_gap: Hauteur minimale d'un interligne (lignes sans pixel sombre)
+        overlap: Chevauchement en l'absence d'interligne
+        dark_threshold: Luminosité en dessous de laquelle un pixel est du texte
+
+    Returns:
+        Liste de bandes (haut, bas exclu) dans l'ordre de lecture
+    """
+    height = image.height
+    if count <= 1 or height < 2 * count:
+        return [(0, height)]
+
+    gray = np.asarray(image if image.mode == "L" else image.convert("L"))
+    blank = ~(gray < dark_threshold).any(axis=1)
+
+    # Interlignes : suites d'au moins `min_gap` lignes blanches
+    edges = np.diff(np.concatenate(([0], blank.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    gaps = [(s + e) // 2 for s, e in zip(starts, ends) if e - s >= min_gap and 0 < s and e < height]
+
+    step = height / count
+    bands, top = [], 0
+    for i in range(1, count):
+        ideal = int(i * step)
+        window = step / 2
+        near = [g for g in gaps if top < g < height and abs(g - ideal) <= window]
+        if near:
+            cut = min(near, key=lambda g: abs(g - ideal))
+            bands.append((top, cut))
+            top = cut
+        else:
+            bands.append((top, min(height, ideal + overlap)))
+            top = max(top, ideal - overlap)
+    bands.append((top, height))
+    return [band for band in bands if band[1] - band[0] > 0]
+
+
+def _normalize_line(line: str) -> str:
+    """Forme comparable d'une ligne (espaces et casse ignorés)."""
+    return re.sub(r"\s+", " ", line).strip().casefold()
+
+
+def merge_band_lines(bands: List[Band], lines: List[List[OCRLine]]) -> List[OCRLine]:
+    """
+    Fusionne les lignes des bandes dans l'ordre de lecture.
+
+    Dans un chevauchement, chaque bande ne garde que les lignes dont le
+    centre tombe dans sa moitié : une ligne lue deux fois n'est gardée
+    qu'une fois, par la bande où elle est la moins coupée.
+
+    Args:
+        bands: Bandes (haut, bas exclu), de haut en bas
+        lines: Lignes de chaque bande (boîtes dans le repère de l'image)
+
+    Returns:
+        Lignes de l'image entière
+    """
+    merged: List[OCRLine] = []
+    for i, ((top, bottom), band_lines) in enumerate(zip(bands, lines)):
+        own_top = (top + bands[i - 1][1]) // 2 if i > 0 else top
+        own_bottom = (bands[i + 1][0] + bottom) // 2 if i + 1 < len(bands) else bottom
+        merged.extend(
+            line for line in band_lines
+            if own_top <= (line.box[1] + line.box[3]) // 2 < own_bottom
+        )
+    return merged
+
+
+def merge_band_texts(texts: List[str], max_overlap_lines: int = 3) -> str:
+    """
+    Fusionne les textes des bandes dans l'ordre de lecture.
+
+    Les lignes lues deux fois dans un chevauchement (fin d'une bande et
+    début de la suivante) ne sont conservées qu'une fois.
+
+    Args:
+        texts: Textes des bandes, de haut en bas
+        max_overlap_lines: Nombre maximal de lignes dupliquées à une jonction
+
+    Returns:
+        Texte complet
+    """
+    merged: List[str] = []
+    for text in texts:
+        lines = [line for line in text.splitlines() if line.strip()]
+        previous = [_normalize_line(line) for line in merged[-max_overlap_lines:]]
+        current = [_normalize_line(line) for line in lines[:max_overlap_lines]]
+        skip = 0
+        for size in range(min(len(previous), len(current)), 0, -1):
+            if previous[-size:] == current[:size]:
+                skip = size
+                break
+        merged.extend(lines[skip:])
+    return "\n".join(merged)
+
+
+class ParallelOCR:
+    """Moteur Tesseract parallèle (même interface que les autres moteurs).
+
+    Les processus du pool chargent leur moteur (et les modèles de langue)
+    une seule fois à leur démarrage ; chaque capture est découpée en bandes
+    reconnues simultanément. recognize_lines() rend l'OCR adaptatif
+    d'OCRProcessor utilisable avec le pool.
+    """
+
+    name = "parallel"
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        lang: str = "fra+eng",
+        psm: int = 6,
+        engine: str = "auto",
+        min_band_height: int = 200,
+        engine_factory: Optional[Callable] = None
+    ):
+        """
+        Démarre le pool de processus.
+
+        Args:
+            workers: Nombre de processus (nombre de cœurs par défaut)
+            lang: Langues Tesseract
+            psm: Mode de segmentation de page
+            engine: Moteur utilisé dans chaque processus (voir create_engine)
+            min_band_height: Hauteur minimale d'une bande en pixels
+            engine_factory: Fabrique de moteur (remplace engine/lang/psm)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.min_band_height = min_band_height
+        factory = engine_factory or partial(create_engine, engine, lang, psm)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(factory,)
+        )
+        self.last_bands: List[Band] = []
+
+    def warm_up(self):
+        """Démarre tous les processus (et charge les modèles) avant le premier OCR."""
+        futures = [self._pool.submit(_ping) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def recognize(self, image: Image.Image) -> str:
+        """
+        Reconnaît le texte d'une image en parallèle.
+
+        Args:
+            image: Image PIL prétraitée
+
+        Returns:
+            Texte brut, lignes dans l'ordre de lecture
+        """
+        count = max(1, min(self.workers, image.height // self.min_band_height))
+        self.last_bands = find_bands(image, count)
+
+        futures = []
+        for top, bottom in self.last_bands:
+            band = image.crop((0, top, image.width, bottom))
+            futures.append(self._pool.submit(_recognize_band, band.tobytes(), band.size, band.mode))
+        return merge_band_texts([future.result() for future in futures])
+
+    def recognize_lines(self, image: Image.Image, psm: int) -> List[OCRLine]:
+        """
+        Reconnaît les lignes d'une image en parallèle (OCR adaptatif).
+
+        Args:
+            image: Image PIL (niveaux de gris, texte sombre sur fond clair)
+            psm: Mode de segmentation de page
+
+        Returns:
+            Lignes avec confiance et position, dans l'ordre de lecture
+        """
+        count = max(1, min(self.workers, image.height // self.min_band_height))
+        self.last_bands = find_bands(image, count)
+
+        futures = []
+        for top, bottom in self.last_bands:
+            band = image.crop((0, top, image.width, bottom))
+            futures.append(self._pool.submit(
+                _recognize_band_lines, band.tobytes(), band.size, band.mode, psm, top
+            ))
+        return merge_band_lines(self.last_bands, [future.result() for future in futures])
+
+    def close(self):
+        """Arrête les processus du pool."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
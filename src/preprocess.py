@@ -0,0 +1,198 @@
+"""Prétraitements adaptatifs pour l'OCR local (NumPy vectorisé)."""
+
+from typing import List, Tuple
+import numpy as np
+from PIL import Image
+
+
+# Hauteur de ligne de texte (pixels) en dessous de laquelle Tesseract perd en précision
+MIN_TEXT_HEIGHT = 20
+
+
+def to_gray_array(image: Image.Image) -> np.ndarray:
+    """
+    Convertit une image PIL en tableau de niveaux de gris.
+
+    Args:
+        image: Image PIL
+
+    Returns:
+        Tableau uint8 (hauteur, largeur)
+    """
+    return np.asarray(image if image.mode == "L" else image.convert("L"))
+
+
+def is_dark_background(gray: np.ndarray) -> bool:
+    """
+    Indique si l'image a un fond sombre (mode sombre, texte clair).
+
+    Args:
+        gray: Tableau de niveaux de gris
+
+    Returns:
+        True si la luminosité médiane est inférieure à la moitié de l'échelle
+    """
+    return gray.size > 0 and float(np.median(gray)) < 128
+
+
+def normalize_polarity(gray: np.ndarray) -> np.ndarray:
+    """
+    Garantit un texte sombre sur fond clair (attendu par Tesseract).
+
+    Args:
+        gray: Tableau de niveaux de gris
+
+    Returns:
+        Tableau inversé si le fond est sombre, sinon inchangé
+    """
+    return 255 - gray if is_dark_background(gray) else gray
+
+
+def otsu_threshold(gray: np.ndarray) -> int:
+    """
+    Calcule le seuil d'Otsu (variance inter-classes maximale).
+
+    Args:
+        gray: Tableau de niveaux de gris
+
+    Returns:
+        Seuil entre 0 et 255
+    """
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    total = hist.sum()
+    if total == 0:
+        return 128
+    levels = np.arange(256)
+    weight_bg = np.cumsum(hist)
+    weight_fg = total - weight_bg
+    sum_bg = np.cumsum(hist * levels)
+    mean_bg = np.divide(sum_bg, weight_bg, out=np.zeros(256), where=weight_bg > 0)
+    mean_fg = np.divide(sum_bg[-1] - sum_bg, weight_fg, out=np.zeros(256), where=weight_fg > 0)
+    between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+    return int(np.argmax(between))
+
+
+def otsu_binarize(gray: np.ndarray) -> np.ndarray:
+    """
+    Binarise avec le seuil global d'Otsu.
+
+    Args:
+        gray: Tableau de niveaux de gris
+
+    Returns:
+        Tableau uint8 de 0 (texte) et 255 (fond)
+    """
+    return np.where(gray > otsu_threshold(gray), 255, 0).astype(np.uint8)
+
+
+def sauvola_binarize(gray: np.ndarray, window: int = 25, k: float = 0.2, r: float = 128.0) -> np.ndarray:
+    """
+    Binarise avec le seuil local de Sauvola (fonds non uniformes, faible contraste).
+
+    Seuil local T = m · (1 + k · (s / r − 1)), avec m et s la moyenne et
+    l'écart-type sur une fenêtre, calculés par images intégrales.
+
+    Args:
+        gray: Tableau de niveaux de gris
+        window: Côté de la fenêtre locale (impair)
+        k: Sensibilité à l'écart-type
+        r: Plage dynamique de l'écart-type
+
+    Returns:
+        Tableau uint8 de 0 (texte) et 255 (fond)
+    """
+    height, width = gray.shape
+    half = window // 2
+    values = gray.astype(np.float64)
+    padded = np.pad(values, half + 1, mode="edge")
+
+    integral = padded.cumsum(axis=0).cumsum(axis=1)
+    integral_sq = (padded ** 2).cumsum(axis=0).cumsum(axis=1)
+
+    def window_sum(table: np.ndarray) -> np.ndarray:
+        a = table[window:window + height, window:window + width]
+        b = table[:height, window:window + width]
+        c = table[window:window + height, :width]
+        d = table[:height, :width]
+        return a - b - c + d
+
+    area = window * window
+    mean = window_sum(integral) / area
+    std = np.sqrt(np.maximum(window_sum(integral_sq) / area - mean ** 2, 0))
+    threshold = mean * (1 + k * (std / r - 1))
+    return np.where(values > threshold, 255, 0).astype(np.uint8)
+
+
+def text_rows(gray: np.ndarray, dark_threshold: int = 128) -> List[Tuple[int, int]]:
+    """
+    Repère les lignes de texte par projection horizontale.
+
+    Args:
+        gray: Tableau (texte sombre sur fond clair)
+        dark_threshold: Luminosité en dessous de laquelle un pixel est du texte
+
+    Returns:
+        Liste de (haut, bas exclu) des lignes de texte
+    """
+    inked = (gray < dark_threshold).any(axis=1).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], inked, [0])))
+    return list(zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()))
+
+
+def estimate_text_height(gray: np.ndarray) -> float:
+    """
+    Estime la hauteur médiane des lignes de texte.
+
+    Args:
+        gray: Tableau (texte sombre sur fond clair)
+
+    Returns:
+        Hauteur en pixels (0 si aucun texte)
+    """
+    rows = text_rows(gray)
+    if not rows:
+        return 0.0
+    return float(np.median([bottom - top for top, bottom in rows]))
+
+
+def choose_psm(gray: np.ndarray, min_column_gap: int = 40) -> int:
+    """
+    Choisit le mode de segmentation Tesseract d'après la mise en page.
+
+    - 7 : une seule ligne de texte ;
+    - 3 : segmentation automatique (plusieurs colonnes séparées par un blanc) ;
+    - 6 : bloc de texte uniforme (cas habituel d'un QCM recadré).
+
+    Args:
+        gray: Tableau (texte sombre sur fond clair)
+        min_column_gap: Largeur minimale d'une gouttière entre colonnes
+
+    Returns:
+        Mode de segmentation (--psm)
+    """
+    rows = text_rows(gray)
+    if len(rows) <= 1:
+        return 7
+
+    inked_cols = (gray < 128).any(axis=0)
+    columns = np.flatnonzero(inked_cols)
+    if columns.size and np.diff(columns).max(initial=0) > min_column_gap:
+        return 3
+    return 6
+
+
+def upscale_factor(text_height: float, target: int = 32, max_factor: int = 4) -> int:
+    """
+    Facteur d'agrandissement pour amener le texte à une hauteur lisible.
+
+    Args:
+        text_height: Hauteur de ligne estimée en pixels
+        target: Hauteur visée
+        max_factor: Agrandissement maximal
+
+    Returns:
+        Facteur entier (1 = pas d'agrandissement)
+    """
+    if text_height <= 0 or text_height >= MIN_TEXT_HEIGHT:
+        return 1
+    return int(min(max_factor, np.ceil(target / text_height)))
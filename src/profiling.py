@@ -0,0 +1,274 @@
+"""Profilage optionnel d'une capture : échantillonnage CPU et diff tracemalloc.
+
+Activé par PROFILE_PIPELINE=cpu|mem|both ; sans cette variable, le module
+n'est pas importé et le pipeline ne subit aucun surcoût.
+
+Le pipeline s'exécute sur plusieurs threads (file des captures, boucle
+asyncio, threads de asyncio.to_thread) : un profileur déterministe comme
+cProfile ne suit que le thread qui l'active. Le profil CPU est donc
+obtenu par échantillonnage des piles de tous les threads.
+"""
+
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+PROFILE_MODES = ("cpu", "mem", "both")
+
+# Fonctions feuilles d'un thread en attente (hors temps de calcul du pipeline)
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),  # thread de asyncio.to_thread sans travail
+}
+
+# Dossiers écrits par _save (AAAAmmjj-HHMMSS-NNNN-étiquette) : seuls concernés par la rotation
+_RUN_NAME = re.compile(r"^\d{8}-\d{6}-\d{4}-.+$")
+
+# Allocations du profileur lui-même, exclues du diff mémoire
+_OWN_ALLOCATIONS = (
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+
+
+def _frame_label(frame) -> Tuple[str, str]:
+    """Nom court (fichier, fonction) d'une frame."""
+    return os.path.basename(frame.f_code.co_filename), frame.f_code.co_name
+
+
+class StackSampler:
+    """Échantillonne périodiquement les piles Python de tous les threads."""
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Initialise l'échantillonneur.
+
+        Args:
+            interval: Intervalle entre deux échantillons (secondes)
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Démarre l'échantillonnage dans un thread dédié."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête l'échantillonnage."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Boucle d'échantillonnage."""
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own)
+
+    def sample(self, exclude: Optional[int] = None):
+        """
+        Relève la pile de chaque thread actif.
+
+        Args:
+            exclude: Identifiant de thread ignoré (l'échantillonneur)
+        """
+        self.samples += 1
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == exclude or _frame_label(frame) in _IDLE_LEAVES:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def folded(self) -> List[str]:
+        """
+        Piles au format « folded » (flamegraph.pl, speedscope).
+
+        Returns:
+            Lignes "fichier:fonction;...;fichier:fonction nombre"
+        """
+        return [
+            ";".join(f"{file}:{function}" for file, function in stack) + f" {count}"
+            for stack, count in self.stacks.most_common()
+        ]
+
+    def top(self, count: int = 10) -> List[Tuple[str, int, int]]:
+        """
+        Fonctions les plus présentes dans les échantillons.
+
+        Args:
+            count: Nombre de fonctions
+
+        Returns:
+            Liste de (fichier:fonction, échantillons propres, échantillons cumulés)
+        """
+        own: Counter = Counter()
+        cumulative: Counter = Counter()
+        for stack, hits in self.stacks.items():
+            own[stack[-1]] += hits
+            for label in set(stack):
+                cumulative[label] += hits
+        ranked = sorted(cumulative, key=lambda label: (own[label], cumulative[label]), reverse=True)
+        return [(f"{file}:{function}", own[(file, function)], cumulative[(file, function)])
+                for file, function in ranked[:count]]
+
+
+class PipelineProfiler:
+    """Profile chaque capture et range les résultats dans un dossier tournant."""
+
+    def __init__(
+        self,
+        mode: str = "both",
+        output_dir: str = "profiles",
+        keep: int = 20,
+        top: int = 10,
+        interval: float = 0.005
+    ):
+        """
+        Initialise le profileur.
+
+        Args:
+            mode: "cpu", "mem" ou "both"
+            output_dir: Dossier des profils (un sous-dossier par capture)
+            keep: Nombre de captures profilées conservées
+            top: Nombre de lignes du résumé affiché
+            interval: Intervalle d'échantillonnage CPU (secondes)
+
+        Raises:
+            ValueError: Si le mode est inconnu
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"PROFILE_PIPELINE inconnu: {mode} ({', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.keep = keep
+        self.top = top
+        self.interval = interval
+        self.runs = 0
+
+    @property
+    def cpu(self) -> bool:
+        """Profil CPU actif."""
+        return self.mode in ("cpu", "both")
+
+    @property
+    def memory(self) -> bool:
+        """Profil mémoire actif."""
+        return self.mode in ("mem", "both")
+
+    @contextmanager
+    def profile(self, label: str = "capture") -> Iterator[Dict[str, str]]:
+        """
+        Profile le bloc de code et enregistre les résultats.
+
+        Args:
+            label: Suffixe du dossier de la capture
+
+        Yields:
+            Dictionnaire rempli à la sortie avec les chemins des fichiers écrits
+        """
+        files: Dict[str, str] = {}
+        sampler = StackSampler(self.interval) if self.cpu else None
+        started_tracing = False
+        before = None
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                started_tracing = True
+            before = tracemalloc.take_snapshot()
+        if sampler:
+            sampler.start()
+
+        start = time.perf_counter()
+        try:
+            yield files
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if sampler:
+                sampler.stop()
+            after = tracemalloc.take_snapshot() if before is not None else None
+            if started_tracing:
+                tracemalloc.stop()
+            files.update(self._save(label, elapsed_ms, sampler, before, after))
+
+    def _save(self, label, elapsed_ms, sampler, before, after) -> Dict[str, str]:
+        """
+        Écrit les profils d'une capture et affiche leur résumé.
+
+        Args:
+            label: Suffixe du dossier de la capture
+            elapsed_ms: Durée de la capture profilée
+            sampler: Échantillonneur CPU (None en mode mem)
+            before: Instantané tracemalloc initial (None en mode cpu)
+            after: Instantané tracemalloc final (None en mode cpu)
+
+        Returns:
+            Chemins des fichiers écrits
+        """
+        self.runs += 1
+        run_dir = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.runs:04d}-{label}")
+        os.makedirs(run_dir, exist_ok=True)
+        files = {}
+        print(f"🔬 Profil de la capture ({elapsed_ms:.0f} ms): {run_dir}")
+
+        if sampler is not None:
+            files["cpu_folded"] = os.path.join(run_dir, "cpu.folded")
+            with open(files["cpu_folded"], "w", encoding="utf-8") as f:
+                f.write("\n".join(sampler.folded()) + "\n")
+            lines = [f"{'fonction':<48} {'propre':>7} {'cumulé':>7}"]
+            for function, own, cumulative in sampler.top(self.top):
+                lines.append(f"{function:<48} {own:>7} {cumulative:>7}")
+            files["cpu_top"] = os.path.join(run_dir, "cpu_top.txt")
+            with open(files["cpu_top"], "w", encoding="utf-8") as f:
+                f.write(f"{sampler.samples} échantillons toutes les {self.interval * 1000:.0f} ms\n")
+                f.write("\n".join(lines) + "\n")
+            print(f"   CPU ({sampler.samples} échantillons, propre / cumulé):")
+            for line in lines[1:]:
+                print(f"   {line}")
+
+        if after is not None:
+            files["mem_snapshot"] = os.path.join(run_dir, "mem.snapshot")
+            after.dump(files["mem_snapshot"])
+            after = after.filter_traces(_OWN_ALLOCATIONS)
+            before = before.filter_traces(_OWN_ALLOCATIONS)
+            diff = [stat for stat in after.compare_to(before, "lineno") if stat.size_diff]
+            files["mem_top"] = os.path.join(run_dir, "mem_top.txt")
+            with open(files["mem_top"], "w", encoding="utf-8") as f:
+                f.write("\n".join(str(stat) for stat in diff[:100]) + "\n")
+            total_kb = sum(stat.size_diff for stat in diff) / 1024
+            print(f"   Mémoire ({total_kb:+.0f} KB conservés):")
+            for stat in diff[:self.top]:
+                frame = stat.traceback[0]
+                location = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+                print(f"   {location:<48} {stat.size_diff / 1024:>+8.1f} KB")
+
+        self._rotate()
+        return files
+
+    def _rotate(self):
+        """Supprime les profils les plus anciens au-delà de `keep` (autres dossiers ignorés)."""
+        runs = sorted(
+            entry for entry in os.listdir(self.output_dir)
+            if _RUN_NAME.match(entry) and os.path.isdir(os.path.join(self.output_dir, entry))
+        )
+        for entry in runs[:max(0, len(runs) - self.keep)]:
+            shutil.rmtree(os.path.join(self.output_dir, entry), ignore_errors=True)
@@ -0,0 +1,367 @@
+"""Découpage du texte OCR en questions et cache des réponses par question."""
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Set, Tuple
+
+from src.cache import ResultCache, make_key
+from src.llm_client import LLMClient, normalize_qcm_text
+
+
+# "Question 3 :", "Q3.", "QUESTION N° 3 -"
+QUESTION_PATTERN = re.compile(
+    r"^\s*(?:question|q)\s*(?:n\s*[°o.]?\s*)?(\d{1,3})\s*[:.)\-–]?\s*(.*)$",
+    re.IGNORECASE
+)
+# "3. Quelle est..." / "3) Quelle est..."
+NUMBERED_PATTERN = re.compile(r"^\s*(\d{1,3})\s*[.)]\s+(.+)$")
+# "A) Paris", "(b) Lyon", "C. Lille", "○ D - Nice", "E]Marseille"
+OPTION_PATTERN = re.compile(
+    r"^\s*(?:[○●◯□■☐☑•*]|[oO0]\s)?\s*"
+    r"[(\[]?([A-Ha-h])\s*(?:[)\]}]\s*|[.:\-–]\s+)(.+)$"
+)
+# Début d'un bloc de réponse du LLM ("❓ QUESTION 2: ...")
+ANSWER_BLOCK_PATTERN = re.compile(r"^(?=\s*(?:❓\s*)?QUESTION\s*\d+)", re.MULTILINE)
+ANSWER_NUMBER_PATTERN = re.compile(r"QUESTION\s*\d+")
+
+
+@dataclass
+class Question:
+    """Question de QCM extraite du texte OCR."""
+
+    stem: str
+    options: List[Tuple[str, str]] = field(default_factory=list)
+    number: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Empreinte insensible au bruit OCR (casse, espaces, ponctuation)."""
+        parts = [normalize_qcm_text(self.stem)]
+        parts.extend(f"{letter.upper()}:{normalize_qcm_text(text)}" for letter, text in self.options)
+        return make_key("question", *parts)
+
+    def to_text(self, label: Optional[int] = None) -> str:
+        """
+        Reconstruit le texte de la question pour le LLM.
+
+        Args:
+            label: Numéro à afficher devant l'énoncé (position à l'écran)
+
+        Returns:
+            Texte de la question et de ses options
+        """
+        lines = [f"Question {label} : {self.stem}" if label is not None else self.stem]
+        lines.extend(f"{letter.upper()}) {text}" for letter, text in self.options)
+        return "\n".join(lines)
+
+
+def _is_question(question: Question) -> bool:
+    """Indique si un bloc ressemble à une question (options ou point d'interrogation)."""
+    return bool(question.options) or "?" in question.stem
+
+
+def _join(lines: List[str]) -> str:
+    """Fusionne des lignes en ignorant les séparateurs de paragraphe ("")."""
+    return " ".join(line for line in lines if line)
+
+
+def _last_paragraph(lines: List[str]) -> str:
+    """Retourne le dernier paragraphe non vide d'une liste de lignes ("" = séparateur)."""
+    paragraph: List[str] = []
+    for line in reversed(lines):
+        if line:
+            paragraph.insert(0, line)
+        elif paragraph:
+            break
+    return _join(paragraph)
+
+
+def parse_questions(text: str) -> List[Question]:
+    """
+    Découpe un texte OCR en questions (énoncé + options lettrées).
+
+    Tolère les variantes OCR courantes des marqueurs ("A)", "(a)", "A.",
+    "A]", puces de boutons radio lues comme "o"). Après des options, une
+    ligne commençant par une minuscule prolonge l'option précédente ; les
+    autres lignes forment l'énoncé de la question suivante. Avant la
+    première question, seul le dernier paragraphe est gardé comme énoncé,
+    ce qui écarte l'en-tête de la page.
+
+    Args:
+        text: Texte extrait par OCR
+
+    Returns:
+        Liste des questions dans l'ordre de l'écran (vide si aucune
+        structure de QCM n'est reconnue)
+    """
+    questions: List[Question] = []
+    current: Optional[Question] = None
+    pending: List[str] = []
+
+    def close_current():
+        if current is not None and _is_question(current):
+            questions.append(current)
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            if pending:
+                pending.append("")
+            continue
+
+        header = QUESTION_PATTERN.match(line) or NUMBERED_PATTERN.match(line)
+        if header:
+            if current is not None and not current.options and pending:
+                current.stem = _join([current.stem] + pending)
+            close_current()
+            current = Question(stem=header.group(2).strip(), number=header.group(1))
+            pending = []
+            continue
+
+        option = OPTION_PATTERN.match(line)
+        if option:
+            letter = option.group(1).upper()
+            if current is None or (current.options and (pending or letter == "A")):
+                close_current()
+                current = Question(stem=_last_paragraph(pending))
+            elif pending:
+                current.stem = _join([current.stem] + pending)
+            pending = []
+            current.options.append((letter, option.group(2).strip()))
+            continue
+
+        continues_option = (
+            current is not None and current.options and not pending
+            and line[0].islower() and not line.endswith("?")
+        )
+        if continues_option:
+            letter, option_text = current.options[-1]
+            current.options[-1] = (letter, f"{option_text} {line}")
+        else:
+            pending.append(line)
+
+    if current is not None and not current.options and pending:
+        current.stem = _join([current.stem] + pending)
+        pending = []
+    close_current()
+
+    trailing = _last_paragraph(pending)
+    if "?" in trailing:
+        questions.append(Question(stem=trailing))
+
+    return questions
+
+
+def split_answer_blocks(response: str) -> List[str]:
+    """
+    Découpe la réponse du LLM en un bloc par question.
+
+    Args:
+        response: Réponse complète au format QCM_PROMPT
+
+    Returns:
+        Liste des blocs (sans séparateurs "---")
+    """
+    blocks = []
+    for block in ANSWER_BLOCK_PATTERN.split(response):
+        block = block.strip()
+        while block.endswith("---"):
+            block = block[:-3].rstrip()
+        if ANSWER_NUMBER_PATTERN.search(block):
+            blocks.append(block)
+    return blocks
+
+
+class QuestionAnswerer:
+    """Répond question par question en réutilisant les réponses déjà obtenues.
+
+    Seules les questions jamais vues sont envoyées au LLM ; les blocs de
+    réponse sont ensuite réassemblés dans l'ordre de l'écran.
+    """
+
+    def __init__(self, llm_client: LLMClient, cache: ResultCache):
+        """
+        Initialise le gestionnaire.
+
+        Args:
+            llm_client: Client LLM
+            cache: Cache des réponses par question
+        """
+        self.llm_client = llm_client
+        self.cache = cache
+        self.last_sent = 0
+        self.last_reused = 0
+
+    def _cache_key(self, question: Question) -> str:
+        """Clé de cache d'une question pour le modèle et le prompt courants."""
+        return make_key(
+            "question-answer", self.llm_client.model, self.llm_client.prompt_version,
+            self.llm_client.temperature, question.fingerprint
+        )
+
+    def _lookup(self, questions: List[Question]) -> Tuple[List[str], List[Optional[str]], List[int]]:
+        """
+        Recherche en cache la réponse de chaque question.
+
+        Args:
+            questions: Questions dans l'ordre de l'écran
+
+        Returns:
+            Tuple (clés de cache, blocs connus ou None, indices manquants)
+        """
+        keys = [self._cache_key(q) for q in questions]
+        blocks = [self.cache.get(key) for key in keys]
+        missing = [i for i, block in enumerate(blocks) if block is None]
+        self.last_sent, self.last_reused = len(missing), len(questions) - len(missing)
+
+        if missing:
+            print(f"   {len(missing)} question(s) nouvelle(s), {self.last_reused} en cache")
+        else:
+            print(f"   {len(questions)} question(s) déjà analysée(s)")
+        return keys, blocks, missing
+
+    @staticmethod
+    def _format_questions(questions: List[Question], indices: List[int]) -> str:
+        """Texte envoyé au LLM pour un groupe de questions (numérotées selon l'écran)."""
+        return "\n\n".join(questions[i].to_text(label=i + 1) for i in indices)
+
+    def _store_blocks(
+        self,
+        keys: List[str],
+        blocks: List[Optional[str]],
+        indices: List[int],
+        response: str
+    ) -> bool:
+        """
+        Répartit une réponse du LLM entre les questions d'un groupe.
+
+        Args:
+            keys: Clés de cache de toutes les questions
+            blocks: Blocs de réponse (complétés sur place)
+            indices: Questions du groupe
+            response: Réponse du LLM pour ce groupe
+
+        Returns:
+            False si la réponse ne contient pas un bloc par question : elle
+            est alors gardée telle quelle à la place du groupe, sans mise en cache
+        """
+        new_blocks = split_answer_blocks(response)
+        if len(new_blocks) != len(indices):
+            blocks[indices[0]] = response
+            for i in indices[1:]:
+                blocks[i] = ""
+            return False
+        for i, block in zip(indices, new_blocks):
+            blocks[i] = block
+            self.cache.put(keys[i], block)
+        return True
+
+    @staticmethod
+    def _stitch(blocks: List[str], verbatim: Set[int] = frozenset()) -> str:
+        """
+        Réassemble les blocs dans l'ordre de l'écran en renumérotant.
+
+        Args:
+            blocks: Blocs de réponse ("" pour une question couverte par un
+                bloc précédent)
+            verbatim: Indices des réponses non découpées (déjà numérotées
+                selon l'écran), laissées telles quelles
+
+        Returns:
+            Réponse réassemblée
+        """
+        numbered = [
+            block if i in verbatim else ANSWER_NUMBER_PATTERN.sub(f"QUESTION {i + 1}", block, count=1)
+            for i, block in enumerate(blocks) if block
+        ]
+        return "\n\n---\n\n".join(numbered)
+
+    def answer(
+        self,
+        text: str,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Optional[str]:
+        """
+        Analyse un texte de QCM en ne soumettant que les questions nouvelles.
+
+        Si le texte ne se découpe pas en questions, le texte complet est
+        analysé d'un seul tenant. Si la réponse du LLM ne contient pas un
+        bloc par question, elle est affichée telle quelle avec les réponses
+        déjà connues, sans nouvelle requête (quota).
+
+        Args:
+            text: Texte extrait du QCM
+            on_token: Callback de streaming, transmis à la requête portant
+                sur les questions nouvelles (la réponse réassemblée peut
+                donc différer du texte diffusé)
+
+        Returns:
+            Réponse formatée, ou None en cas d'erreur
+        """
+        questions = parse_questions(text)
+        if not questions:
+            self.last_sent, self.last_reused = 1, 0
+            return self.llm_client.analyze_qcm_text(text, on_token=on_token)
+
+        keys, blocks, missing = self._lookup(questions)
+        if missing:
+            response = self.llm_client.analyze_qcm_text(
+                self._format_questions(questions, missing), on_token=on_token
+            )
+            if not response:
+                return None
+            if not self._store_blocks(keys, blocks, missing, response):
+                return self._stitch(blocks, verbatim={missing[0]})
+
+        return self._stitch(blocks)
+
+    async def answer_async(
+        self,
+        text: str,
+        on_token: Optional[Callable[[str], None]] = None,
+        concurrency: int = 1
+    ) -> Optional[str]:
+        """
+        Variante asynchrone de answer() pour un client LLM asynchrone.
+
+        Les questions nouvelles peuvent être réparties en `concurrency`
+        groupes envoyés simultanément : chaque génération est plus courte,
+        au prix d'autant de requêtes sur le quota. Le streaming n'est
+        utilisé qu'avec un seul groupe.
+
+        Args:
+            text: Texte extrait du QCM
+            on_token: Callback de streaming (optionnel)
+            concurrency: Nombre maximal de requêtes simultanées
+
+        Returns:
+            Réponse formatée, ou None en cas d'erreur
+        """
+        questions = parse_questions(text)
+        if not questions:
+            self.last_sent, self.last_reused = 1, 0
+            return await self.llm_client.analyze_qcm_text(text, on_token=on_token)
+
+        keys, blocks, missing = self._lookup(questions)
+        if missing:
+            group_size = -(-len(missing) // max(1, concurrency))
+            groups = [missing[i:i + group_size] for i in range(0, len(missing), group_size)]
+            stream_callback = on_token if len(groups) == 1 else None
+
+            responses = await asyncio.gather(*(
+                self.llm_client.analyze_qcm_text(
+                    self._format_questions(questions, group), on_token=stream_callback
+                )
+                for group in groups
+            ))
+            if not all(responses):
+                return None
+
+            verbatim = {
+                group[0] for group, response in zip(groups, responses)
+                if not self._store_blocks(keys, blocks, group, response)
+            }
+            return self._stitch(blocks, verbatim)
+
+        return self._stitch(blocks)
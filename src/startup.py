@@ -0,0 +1,171 @@
+"""Mesure du démarrage : durée des étapes d'initialisation et des imports."""
+
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+
+
+class ImportProfiler:
+    """Chronomètre les imports de modules (premier chargement seulement).
+
+    Remplace temporairement `builtins.__import__`. Pour chaque module, la
+    durée cumulée inclut celle des modules qu'il importe ; la durée propre
+    en est déduite.
+    """
+
+    def __init__(self):
+        """Initialise le profileur (inactif tant qu'il n'est pas démarré)."""
+        self.records: List[Tuple[str, float, float]] = []
+        self._original: Optional[Callable] = None
+        self._children_ms: List[float] = []
+
+    def start(self):
+        """Commence à chronométrer les imports."""
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+
+    def stop(self):
+        """Rétablit l'import standard."""
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """Import chronométré (modules absolus pas encore chargés)."""
+        if level or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        self._children_ms.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = (time.perf_counter() - start) * 1000
+            children = self._children_ms.pop()
+            if self._children_ms:
+                self._children_ms[-1] += cumulative
+            self.records.append((name, cumulative, cumulative - children))
+
+    def top(self, count: int = 15) -> List[Tuple[str, float, float]]:
+        """
+        Modules les plus coûteux.
+
+        Args:
+            count: Nombre de modules
+
+        Returns:
+            Liste de (module, durée cumulée ms, durée propre ms)
+        """
+        return sorted(self.records, key=lambda record: record[1], reverse=True)[:count]
+
+
+class StartupTimer:
+    """Chronomètre les étapes du démarrage jusqu'à l'application prête.
+
+    Les étapes sont toujours mesurées (coût négligeable) ; le détail des
+    imports n'est relevé que si `profile_imports` est activé.
+    """
+
+    def __init__(self, start: Optional[float] = None, profile_imports: bool = False):
+        """
+        Initialise le chronomètre.
+
+        Args:
+            start: Instant de départ (time.perf_counter), maintenant par défaut
+            profile_imports: Relever aussi la durée de chaque import
+        """
+        self.start = start if start is not None else time.perf_counter()
+        self.phases: List[Tuple[str, Optional[float]]] = []
+        self.ready_ms: Optional[float] = None
+        self.imports = ImportProfiler() if profile_imports else None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Chronomètre une étape du démarrage.
+
+        Args:
+            name: Nom de l'étape
+        """
+        if self.imports:
+            self.imports.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+            if self.imports:
+                self.imports.stop()
+
+    def add(self, name: str, duration_ms: Optional[float]):
+        """
+        Ajoute une étape mesurée ailleurs (ex: préchauffage en arrière-plan).
+
+        Args:
+            name: Nom de l'étape
+            duration_ms: Durée en ms, ou None si l'étape a échoué
+        """
+        self.phases.append((name, duration_ms))
+
+    def elapsed_ms(self) -> float:
+        """Temps écoulé depuis le départ (ms)."""
+        return (time.perf_counter() - self.start) * 1000
+
+    def mark_ready(self) -> float:
+        """
+        Note l'instant où l'application est prête.
+
+        Returns:
+            Temps de démarrage (ms)
+        """
+        self.ready_ms = self.elapsed_ms()
+        return self.ready_ms
+
+    def report(self, top: int = 15) -> str:
+        """
+        Rapport lisible du démarrage.
+
+        Args:
+            top: Nombre d'imports les plus lents à lister
+
+        Returns:
+            Texte du rapport
+        """
+        lines = ["⏱️  Démarrage:"]
+        for name, duration in self.phases:
+            status = f"{duration:8.1f} ms" if duration is not None else "   échec"
+            lines.append(f"   {name:<28} {status}")
+        if self.ready_ms is not None:
+            lines.append(f"   {'= prêt':<28} {self.ready_ms:8.1f} ms")
+        if self.imports and self.imports.records:
+            lines.append("\n📦 Imports les plus lents (cumulé / propre):")
+            for module, cumulative, own in self.imports.top(top):
+                lines.append(f"   {module:<28} {cumulative:8.1f} ms {own:8.1f} ms")
+        return "\n".join(lines)
+
+
+def run_warm_up(tasks: List[Tuple[str, Callable[[], object]]]) -> List[Tuple[str, Optional[float]]]:
+    """
+    Exécute des tâches de préchauffage et mesure chacune.
+
+    Une tâche qui lève une exception est notée en échec sans interrompre
+    les suivantes.
+
+    Args:
+        tasks: Liste de (nom, fonction sans argument)
+
+    Returns:
+        Liste de (nom, durée ms ou None en cas d'échec)
+    """
+    results = []
+    for name, task in tasks:
+        start = time.perf_counter()
+        try:
+            task()
+            results.append((name, (time.perf_counter() - start) * 1000))
+        except Exception:
+            results.append((name, None))
+    return results
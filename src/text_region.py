@@ -0,0 +1,239 @@
+"""Détection de la zone de texte d'une capture pour la recadrer avant l'OCR."""
+
+from typing import List, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+
+Box = Tuple[int, int, int, int]
+
+
+def text_cell_map(
+    image: Image.Image,
+    thumb_width: int = 640,
+    cell_size: int = 4,
+    edge_threshold: int = 24,
+    min_density: float = 0.08
+) -> Tuple[np.ndarray, float]:
+    """
+    Repère les cellules contenant du texte sur une miniature binarisée.
+
+    Le texte se distingue des aplats (fonds, barres, marges) par une forte
+    densité de transitions de luminosité dans les deux directions : la
+    miniature est binarisée sur l'écart entre pixels voisins, puis découpée
+    en cellules. Exiger les deux directions écarte les filets et bordures
+    (transitions dans une seule direction).
+
+    Args:
+        image: Image PIL (tout mode)
+        thumb_width: Largeur approximative de la miniature
+        cell_size: Côté d'une cellule en pixels de miniature
+        edge_threshold: Écart de luminosité minimal d'une transition
+        min_density: Part minimale de transitions dans une cellule de texte
+
+    Returns:
+        Tuple (grille booléenne lignes×colonnes, côté d'une cellule en pixels de l'image)
+    """
+    factor = max(1, image.width // thumb_width)
+    thumb = image.reduce(factor) if factor > 1 else image
+    gray = np.asarray(thumb if thumb.mode == "L" else thumb.convert("L"), dtype=np.int16)
+
+    rows, cols = gray.shape[0] // cell_size, gray.shape[1] // cell_size
+    if rows == 0 or cols == 0:
+        # Image plus petite qu'une cellule : aucune zone de texte repérable
+        return np.zeros((rows, cols), dtype=bool), 1.0
+    gray = gray[:rows * cell_size, :cols * cell_size]
+
+    def cell_density(edges: np.ndarray) -> np.ndarray:
+        return edges.reshape(rows, cell_size, cols, cell_size).mean(axis=(1, 3))
+
+    horizontal = np.zeros(gray.shape, dtype=bool)
+    horizontal[:, 1:] = np.abs(np.diff(gray, axis=1)) > edge_threshold
+    vertical = np.zeros(gray.shape, dtype=bool)
+    vertical[1:, :] = np.abs(np.diff(gray, axis=0)) > edge_threshold
+
+    cells = (cell_density(horizontal) >= min_density) & (cell_density(vertical) >= min_density)
+    return cells, cell_size * image.width / (cols * cell_size)
+
+
+def _segments(profile: np.ndarray, min_gap: int) -> List[Tuple[int, int]]:
+    """
+    Découpe un profil de projection en segments séparés par des blancs.
+
+    Args:
+        profile: Nombre de cellules de texte par ligne ou colonne
+        min_gap: Nombre minimal de lignes/colonnes vides pour séparer
+
+    Returns:
+        Liste de segments (début, fin exclue)
+    """
+    filled = np.flatnonzero(profile)
+    if not filled.size:
+        return []
+    breaks = np.flatnonzero(np.diff(filled) > min_gap)
+    starts = np.concatenate(([filled[0]], filled[breaks + 1]))
+    ends = np.concatenate((filled[breaks], [filled[-1]])) + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _cut(cells: np.ndarray, axis: int, min_gap: int, keep_ratio: float) -> Tuple[int, int]:
+    """
+    Coupe la grille selon un axe et garde l'étendue des segments denses.
+
+    Les segments dont la masse de texte est inférieure à `keep_ratio` fois
+    celle du segment le plus dense (barres latérales) sont écartés s'ils
+    sont en bordure ; l'étendue renvoyée couvre tous les autres, y compris
+    les petits segments situés entre deux segments conservés.
+
+    Args:
+        cells: Grille booléenne
+        axis: 0 pour couper en lignes, 1 pour couper en colonnes
+        min_gap: Taille minimale d'un blanc séparateur (en cellules)
+        keep_ratio: Masse relative minimale d'un segment conservé
+
+    Returns:
+        Étendue (début, fin exclue) conservée sur l'axe
+    """
+    profile = cells.sum(axis=1 - axis)
+    segments = _segments(profile, min_gap)
+    if not segments:
+        return 0, cells.shape[axis]
+
+    masses = [int(profile[start:end].sum()) for start, end in segments]
+    kept = [seg for seg, mass in zip(segments, masses) if mass >= keep_ratio * max(masses)]
+    return kept[0][0], kept[-1][1]
+
+
+def _cut_rows(
+    cells: np.ndarray,
+    offset: int,
+    height: int,
+    min_gap: int,
+    max_gap: float,
+    chrome: float
+) -> Tuple[int, int]:
+    """
+    Coupe la grille en lignes en gardant tout le bloc de texte principal.
+
+    Un énoncé d'une ligne, moins dense que ses options, fait partie du
+    bloc : seuls sont écartés les bandes fines collées au haut ou au bas de
+    l'écran (barre du navigateur, pied de page) et les segments séparés du
+    bloc le plus dense par un blanc de plus de `max_gap` fois la hauteur.
+
+    Args:
+        cells: Grille booléenne du bloc
+        offset: Première ligne du bloc dans la grille de l'écran
+        height: Nombre de lignes de la grille de l'écran
+        min_gap: Taille minimale d'un blanc séparateur (en cellules)
+        max_gap: Blanc relatif au-delà duquel un segment est détaché du bloc
+        chrome: Part de la hauteur en haut et en bas où chercher les barres
+
+    Returns:
+        Étendue (début, fin exclue) conservée, relative au bloc
+    """
+    profile = cells.sum(axis=1)
+    segments = _segments(profile, min_gap)
+    if not segments:
+        return 0, cells.shape[0]
+
+    masses = [int(profile[start:end].sum()) for start, end in segments]
+    main = segments[int(np.argmax(masses))]
+
+    def is_chrome(segment: Tuple[int, int]) -> bool:
+        start, end = segment[0] + offset, segment[1] + offset
+        top_band = start < chrome / 2 * height and end <= chrome * height
+        bottom_band = end > (1 - chrome / 2) * height and start >= (1 - chrome) * height
+        return segment != main and (top_band or bottom_band)
+
+    segments = [segment for segment in segments if not is_chrome(segment)]
+    index = segments.index(main)
+    largest_gap = max(min_gap, max_gap * height)
+    first = last = index
+    while first > 0 and segments[first][0] - segments[first - 1][1] <= largest_gap:
+        first -= 1
+    while last + 1 < len(segments) and segments[last + 1][0] - segments[last][1] <= largest_gap:
+        last += 1
+    return segments[first][0], segments[last][1]
+
+
+def find_text_region(
+    image: Image.Image,
+    margin: int = 16,
+    min_gap: int = 3,
+    keep_ratio: float = 0.3,
+    max_area: float = 0.9,
+    depth: int = 3,
+    max_gap: float = 0.25,
+    chrome: float = 0.1
+) -> Optional[Box]:
+    """
+    Trouve la zone dense en texte d'une capture (découpage X-Y récursif).
+
+    Les lignes puis les colonnes de la grille de cellules de texte sont
+    projetées, sur `depth` niveaux alternés. En colonnes, les blocs peu
+    denses en bordure (menus, barres latérales) sont écartés ; en lignes,
+    tout le bloc de texte est gardé, sauf les barres fines au bord de
+    l'écran (barre du navigateur, pied de page) et les blocs isolés par un
+    grand blanc.
+
+    Args:
+        image: Image PIL
+        margin: Marge ajoutée autour de la zone, en pixels de l'image
+        min_gap: Blanc minimal séparant deux blocs, en cellules
+        keep_ratio: Masse relative minimale d'une colonne conservée
+        max_area: Au-delà de cette part de l'image, aucun recadrage
+        depth: Nombre de découpes alternées (lignes, colonnes, lignes...)
+        max_gap: Blanc vertical (part de la hauteur) qui détache un bloc
+        chrome: Part de la hauteur, en haut et en bas, réservée aux barres
+
+    Returns:
+        Boîte (gauche, haut, droite, bas) à recadrer, ou None si le
+        recadrage n'apporte rien (pas de texte ou zone quasi pleine)
+    """
+    cells, cell = text_cell_map(image)
+    if not cells.any():
+        return None
+
+    top, bottom, left, right = 0, cells.shape[0], 0, cells.shape[1]
+    for level in range(depth):
+        block = cells[top:bottom, left:right]
+        if level % 2 == 0:
+            start, end = _cut_rows(block, top, cells.shape[0], min_gap, max_gap, chrome)
+            top, bottom = top + start, top + end
+        else:
+            start, end = _cut(block, 1, min_gap, keep_ratio)
+            left, right = left + start, left + end
+
+    # Dernier ajustement : lignes et colonnes vides restantes
+    block = cells[top:bottom, left:right]
+    rows, cols = np.flatnonzero(block.any(axis=1)), np.flatnonzero(block.any(axis=0))
+    top, bottom = top + rows[0], top + rows[-1] + 1
+    left, right = left + cols[0], left + cols[-1] + 1
+
+    box = (
+        max(0, int(left * cell) - margin),
+        max(0, int(top * cell) - margin),
+        min(image.width, int(right * cell) + margin),
+        min(image.height, int(bottom * cell) + margin),
+    )
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    if area >= max_area * image.width * image.height:
+        return None
+    return box
+
+
+def crop_to_text(image: Image.Image, margin: int = 16) -> Tuple[Image.Image, Optional[Box]]:
+    """
+    Recadre une capture sur sa zone de texte.
+
+    Args:
+        image: Image PIL
+        margin: Marge autour de la zone, en pixels
+
+    Returns:
+        Tuple (image recadrée ou originale, boîte utilisée ou None)
+    """
+    box = find_text_region(image, margin=margin)
+    if box is None:
+        return image, None
+    return image.crop(box), box
@@ -1,5 +1,6 @@
 """Interface utilisateur overlay avec tkinter."""
 
+import queue
 import tkinter as tk
 from tkinter import scrolledtext, messagebox
 from typing import Optional, Callable
@@ -30,6 +31,9 @@ class OverlayWindow:
         self.copy_button: Optional[tk.Button] = None
         self.is_revealed = False
 
+        # Appels en provenance d'autres threads, exécutés par la boucle Tk
+        self._pending_calls: "queue.Queue[tuple]" = queue.Queue()
+
     def create_window(self):
         """Crée et configure la fenêtre overlay."""
         self.window = tk.Tk()
@@ -146,6 +150,32 @@ class OverlayWindow:
         )
         close_button.pack(side=tk.RIGHT)
 
+        self.window.after(30, self._process_pending_calls)
+
+    def call_soon(self, func: Callable, *args):
+        """
+        Planifie un appel dans le thread de l'interface.
+
+        Tkinter n'est pas thread-safe : les threads de traitement passent
+        par cette file, vidée périodiquement par la boucle principale.
+
+        Args:
+            func: Fonction à appeler
+            *args: Arguments de la fonction
+        """
+        self._pending_calls.put((func, args))
+
+    def _process_pending_calls(self):
+        """Exécute les appels planifiés depuis d'autres threads."""
+        while True:
+            try:
+                func, args = self._pending_calls.get_nowait()
+            except queue.Empty:
+                break
+            func(*args)
+        if self.window:
+            self.window.after(30, self._process_pending_calls)
+
     def set_ocr_text(self, text: str):
         """
         Affiche le texte OCR.
@@ -172,16 +202,19 @@ class OverlayWindow:
             self.explanation_widget.insert(1.0, text)
             self.explanation_widget.config(state=tk.DISABLED)
 
-    def append_explanation(self, text: str):
+    def append_explanation(self, text: str, separator: bool = True):
         """
         Ajoute du texte à l'explication existante.
 
         Args:
             text: Texte à ajouter
+            separator: Insérer un séparateur avant le texte (False pour
+                ajouter les fragments d'une réponse en streaming)
         """
         if self.explanation_widget:
             self.explanation_widget.config(state=tk.NORMAL)
-            self.explanation_widget.insert(tk.END, "\n\n" + "="*50 + "\n\n")
+            if separator:
+                self.explanation_widget.insert(tk.END, "\n\n" + "="*50 + "\n\n")
             self.explanation_widget.insert(tk.END, text)
             self.explanation_widget.see(tk.END)
             self.explanation_widget.config(state=tk.DISABLED)
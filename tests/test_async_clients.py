@@ -0,0 +1,122 @@
+"""Tests pour les clients asynchrones (httpx)."""
+
+import asyncio
+import json
+import threading
+import pytest
+from PIL import Image
+from src.cache import ResultCache
+from src.event_loop import EventLoopThread
+
+httpx = pytest.importorskip("httpx")
+from src.async_clients import AsyncLLMClient, AsyncOCRSpaceAPI  # noqa: E402
+
+
+def _client(handler):
+    """Client httpx asynchrone servi par un gestionnaire local."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestAsyncOCRSpaceAPI:
+    """Tests pour AsyncOCRSpaceAPI."""
+
+    def test_extract_text_and_cache(self):
+        """Le texte est extrait puis servi depuis le cache."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"ParsedResults": [{"ParsedText": " Question 1 "}]})
+
+        api = AsyncOCRSpaceAPI(api_key="k", cache=ResultCache(), client=_client(handler))
+        image = Image.new("RGB", (100, 50), "white")
+
+        async def scenario():
+            first = await api.extract_text(image)
+            second = await api.extract_text(image)
+            await api.aclose()
+            return first, second
+
+        assert asyncio.run(scenario()) == (("Question 1", True), ("Question 1", True))
+        assert len(calls) == 1
+
+    def test_no_sync_session(self):
+        """Aucune session requests inutilisée n'est créée."""
+        api = AsyncOCRSpaceAPI(api_key="k", client=_client(lambda request: httpx.Response(500)))
+        llm = AsyncLLMClient(api_key="k", client=_client(lambda request: httpx.Response(500)))
+
+        assert api.session is None
+        assert llm.session is None
+
+    def test_http_error(self):
+        """Une erreur HTTP renvoie un échec sans exception."""
+        api = AsyncOCRSpaceAPI(api_key="k", client=_client(lambda request: httpx.Response(500)))
+        image = Image.new("RGB", (100, 50), "white")
+
+        assert asyncio.run(api.extract_text(image)) == ("", False)
+
+
+class TestAsyncLLMClient:
+    """Tests pour AsyncLLMClient."""
+
+    def test_analyze(self):
+        """La réponse non streamée est renvoyée et mise en cache."""
+        def handler(request):
+            assert json.loads(request.content)["model"] == "llama-3.3-70b-versatile"
+            return httpx.Response(200, json={"choices": [{"message": {"content": "✅ RÉPONSE: A"}}]})
+
+        cache = ResultCache()
+        llm = AsyncLLMClient(api_key="k", cache=cache, client=_client(handler))
+
+        assert asyncio.run(llm.analyze_qcm_text("Q ?")) == "✅ RÉPONSE: A"
+        assert cache.get_stats()["entries"] == 1
+
+    def test_stream(self):
+        """Les fragments SSE sont transmis au callback dans l'ordre."""
+        body = (
+            'data: {"choices": [{"delta": {"content": "✅ "}}]}\n\n'
+            'data: {"choices": [{"delta": {"content": "RÉPONSE: B"}}]}\n\n'
+            "data: [DONE]\n\n"
+        )
+        llm = AsyncLLMClient(
+            api_key="k",
+            client=_client(lambda request: httpx.Response(200, text=body))
+        )
+        tokens = []
+
+        result = asyncio.run(llm.analyze_qcm_text("Q ?", on_token=tokens.append))
+
+        assert tokens == ["✅ ", "RÉPONSE: B"]
+        assert result == "✅ RÉPONSE: B"
+        assert llm.last_stream_completed
+
+    def test_rate_limit(self, capsys):
+        """Une réponse 429 renvoie None avec un message explicite."""
+        llm = AsyncLLMClient(api_key="k", client=_client(lambda request: httpx.Response(429)))
+
+        assert asyncio.run(llm.analyze_qcm_text("Q ?")) is None
+        assert "Limite de requêtes" in capsys.readouterr().out
+
+
+class TestEventLoopThread:
+    """Tests pour EventLoopThread."""
+
+    def test_run_and_cancel(self):
+        """Les coroutines s'exécutent sur la boucle et peuvent être annulées."""
+        loop = EventLoopThread()
+
+        async def value():
+            return 42
+
+        assert loop.run(value(), timeout=1) == 42
+
+        started = threading.Event()
+
+        async def wait_forever():
+            started.set()
+            await asyncio.sleep(10)
+
+        future = loop.submit(wait_forever())
+        assert started.wait(1)
+        assert future.cancel()
+        loop.stop()
@@ -0,0 +1,93 @@
+"""Tests pour le cache de résultats."""
+
+import pytest
+from unittest.mock import patch
+from PIL import Image, ImageDraw
+from src.cache import ResultCache, image_fingerprint, make_key
+
+
+class TestResultCache:
+    """Tests pour la classe ResultCache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test les compteurs de hits et de misses."""
+        cache = ResultCache()
+        assert cache.get("a") is None
+        cache.put("a", "texte")
+        assert cache.get("a") == "texte"
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_lru_eviction_by_entries(self):
+        """Test l'éviction de l'entrée la moins récemment utilisée."""
+        cache = ResultCache(max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+
+    def test_eviction_by_bytes(self):
+        """Test la limite en octets."""
+        cache = ResultCache(max_bytes=50)
+        cache.put("a", "x" * 30)
+        cache.put("b", "y" * 30)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == "y" * 30
+        assert cache.get_stats()["bytes"] <= 50
+
+    def test_ttl_expiry(self):
+        """Une entrée expirée n'est plus servie."""
+        cache = ResultCache(ttl=60)
+        with patch('src.cache.time.time', return_value=1000.0):
+            cache.put("a", "réponse")
+        with patch('src.cache.time.time', return_value=1030.0):
+            assert cache.get("a") == "réponse"
+        with patch('src.cache.time.time', return_value=1100.0):
+            assert cache.get("a") is None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_persistent_tier(self, tmp_path):
+        """Test la relecture depuis la base SQLite."""
+        db_path = str(tmp_path / "cache.db")
+        cache = ResultCache(db_path=db_path, namespace="ocr")
+        cache.put("k", "persistant")
+        cache.close()
+
+        reopened = ResultCache(db_path=db_path, namespace="ocr")
+        assert reopened.get("k") == "persistant"
+        assert reopened.get_stats()["disk_hits"] == 1
+        assert reopened.get_stats()["hits"] == 1
+
+        other = ResultCache(db_path=db_path, namespace="llm")
+        assert other.get("k") is None
+
+
+class TestKeys:
+    """Tests pour les fonctions de clé."""
+
+    def test_image_fingerprint_stable(self):
+        """Deux images identiques ont la même empreinte."""
+        img = Image.new('RGB', (2000, 1000), color='white')
+        ImageDraw.Draw(img).text((50, 50), "Question 1", fill='black')
+
+        assert image_fingerprint(img) == image_fingerprint(img.copy())
+
+    def test_image_fingerprint_differs(self):
+        """Une modification du contenu change l'empreinte."""
+        img = Image.new('RGB', (2000, 1000), color='white')
+        other = img.copy()
+        ImageDraw.Draw(other).text((50, 50), "Question 2", fill='black')
+
+        assert image_fingerprint(img) != image_fingerprint(other)
+
+    def test_make_key_depends_on_settings(self):
+        """Les paramètres font partie de la clé."""
+        assert make_key("ocrspace", "abc", "fre", 2) != make_key("ocrspace", "abc", "eng", 2)
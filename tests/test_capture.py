@@ -0,0 +1,186 @@
+"""Tests pour le module de capture."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+from PIL import Image
+from src.capture import ScreenCapture, bgra_to_gray, gray_frame, reduction_factor
+from src.capture_profiles import CaptureProfile
+
+
+def _fake_sct(monitors=None, size=(4, 2)):
+    """Crée une fausse session mss."""
+    sct = MagicMock()
+    sct.monitors = monitors or [
+        {"left": 0, "top": 0, "width": 4, "height": 2},
+        {"left": 0, "top": 0, "width": 4, "height": 2},
+    ]
+    screenshot = MagicMock()
+    screenshot.size = size
+    screenshot.raw = bytearray(size[0] * size[1] * 4)
+    screenshot.bgra = bytes(screenshot.raw)
+    sct.grab.return_value = screenshot
+    return sct
+
+
+class TestScreenCapture:
+    """Tests pour la classe ScreenCapture."""
+
+    @patch('src.capture.mss.mss')
+    def test_session_reused_between_captures(self, mock_mss):
+        """La session mss n'est ouverte qu'une seule fois."""
+        mock_mss.return_value = _fake_sct()
+
+        capturer = ScreenCapture()
+        capturer.capture_fullscreen()
+        capturer.capture_fullscreen()
+
+        assert mock_mss.call_count == 1
+        assert capturer.grab_count == 2
+        assert "grab_ms" in capturer.last_timing
+
+    @patch('src.capture.mss.mss')
+    def test_session_rebuilt_when_monitors_change(self, mock_mss):
+        """La session est recréée si les moniteurs changent."""
+        first = _fake_sct()
+        changed = _fake_sct(monitors=[
+            {"left": 0, "top": 0, "width": 8, "height": 4},
+            {"left": 0, "top": 0, "width": 8, "height": 4},
+        ], size=(8, 4))
+        probe = MagicMock()
+        probe.__enter__.return_value = changed
+        mock_mss.side_effect = [first, probe, changed]
+
+        capturer = ScreenCapture(monitor_check_interval=0)
+        capturer.capture_fullscreen()
+        image = capturer.capture_fullscreen()
+
+        assert first.close.called
+        assert image.size == (8, 4)
+
+    @patch('src.capture.mss.mss')
+    def test_close_releases_session(self, mock_mss):
+        """close() ferme la session ouverte."""
+        sct = _fake_sct()
+        mock_mss.return_value = sct
+
+        capturer = ScreenCapture()
+        capturer.capture_fullscreen()
+        capturer.close()
+
+        assert sct.close.called
+
+    @patch('src.capture.mss.mss')
+    def test_session_used_from_one_thread(self, mock_mss):
+        """Quel que soit le thread appelant, la session mss reste sur son thread."""
+        sct = _fake_sct()
+        threads = []
+        mock_mss.side_effect = lambda: threads.append(threading.get_ident()) or sct
+        sct.grab.side_effect = lambda area: threads.append(threading.get_ident()) or sct.grab.return_value
+
+        capturer = ScreenCapture()
+        capturer.capture_fullscreen()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda _: capturer.capture_fullscreen(), range(4)))
+        capturer.close()
+
+        assert mock_mss.call_count == 1
+        assert len(threads) == 6 and len(set(threads)) == 1
+        assert threads[0] != threading.get_ident()
+        assert sct.close.called
+
+    @patch('src.capture.mss.mss')
+    def test_probe_keeps_pipeline_state(self, mock_mss, tmp_path):
+        """Une capture de contrôle ne modifie ni les durées, ni le compteur, ni les captures de debug."""
+        mock_mss.return_value = _fake_sct()
+
+        capturer = ScreenCapture(debug_mode=True, debug_save_path=str(tmp_path))
+        capturer.capture_fullscreen()
+        timing = capturer.last_timing
+        saved = list(tmp_path.iterdir())
+
+        assert capturer.probe().size == (4, 2)
+        assert capturer.last_timing is timing
+        assert capturer.grab_count == 1
+        assert list(tmp_path.iterdir()) == saved
+
+    @patch('src.capture.mss.mss')
+    def test_profile_region_grabbed_natively(self, mock_mss):
+        """Seule la zone du profil est demandée à mss."""
+        sct = _fake_sct(monitors=[
+            {"left": 0, "top": 0, "width": 3840, "height": 2160},
+            {"left": 0, "top": 0, "width": 3840, "height": 2160},
+        ], size=(8, 4))
+        mock_mss.return_value = sct
+        profile = CaptureProfile("quiz", type="region", region=(100, 50, 8, 4))
+
+        ScreenCapture(profile=profile).capture_fullscreen()
+
+        sct.grab.assert_called_once_with({"left": 100, "top": 50, "width": 8, "height": 4})
+
+class TestGrayCapture:
+    """Tests pour la capture directe en niveaux de gris."""
+
+    def test_bgra_to_gray_matches_pil(self):
+        """La conversion NumPy correspond à celle de PIL (à l'arrondi près)."""
+        rng = np.random.default_rng(0)
+        raw = bytearray(rng.integers(0, 256, 8 * 6 * 4, dtype=np.uint8).tobytes())
+        expected = np.asarray(
+            Image.frombytes("RGB", (8, 6), bytes(raw), "raw", "BGRX").convert("L"), dtype=int
+        )
+
+        gray = bgra_to_gray(raw, (8, 6))
+
+        assert gray.shape == (6, 8)
+        assert np.abs(gray.astype(int) - expected).max() <= 1
+
+    def test_bgra_to_gray_block_mean(self):
+        """Avec un facteur 2, chaque pixel de sortie est la moyenne d'un bloc 2×2."""
+        pixels = np.zeros((2, 4, 4), dtype=np.uint8)
+        pixels[:, :2, :3] = 255
+        pixels[0, 2, :3] = 200
+
+        gray = bgra_to_gray(pixels.tobytes(), (4, 2), factor=2)
+
+        assert gray.tolist() == [[255, 50]]
+
+    def test_bgra_to_gray_white(self):
+        """Un écran blanc reste blanc (pas de débordement du produit en uint8)."""
+        raw = bytes([255]) * (4 * 4 * 4)
+
+        assert bgra_to_gray(raw, (4, 4)).tolist() == [[255] * 4] * 4
+        assert bgra_to_gray(raw, (4, 4), factor=2).tolist() == [[255] * 2] * 2
+
+    def test_reduction_factor(self):
+        """Le facteur entier ne descend jamais sous la taille maximale."""
+        assert reduction_factor((3840, 2160), (1920, 1080)) == 2
+        assert reduction_factor((2560, 1440), (1920, 1080)) == 1
+        assert reduction_factor((5120, 2880), (1920, 1080)) == 2
+        assert reduction_factor((1920, 1080), (1920, 1080)) == 1
+        assert reduction_factor((5120, 2880), None) == 1
+
+    def test_gray_frame_keeps_resolution(self):
+        """Une capture 2560x1440 donne 1920x1080 (et non 1280x720)."""
+        for size, expected in (((2560, 1440), (1920, 1080)), ((5120, 2880), (1920, 1080)), ((1280, 720), (1280, 720))):
+            raw = bytes(size[0] * size[1] * 4)
+            assert gray_frame(raw, size, (1920, 1080)).size == expected
+
+    @patch('src.capture.mss.mss')
+    def test_gray_mode(self, mock_mss):
+        """Le mode gray renvoie une image L réduite."""
+        mock_mss.return_value = _fake_sct(size=(8, 4))
+
+        capturer = ScreenCapture(mode="gray", max_size=(4, 2))
+        image = capturer.capture_fullscreen()
+
+        assert image.mode == "L"
+        assert image.size == (4, 2)
+
+    def test_unknown_mode(self):
+        """Un mode inconnu est refusé."""
+        with pytest.raises(ValueError):
+            ScreenCapture(mode="hdr")
+
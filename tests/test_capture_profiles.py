@@ -0,0 +1,81 @@
+"""Tests pour les profils de capture."""
+
+import json
+import pytest
+from src.capture_profiles import CaptureProfile, ProfileStore
+
+
+MONITORS = [
+    {"left": 0, "top": 0, "width": 4480, "height": 1440},
+    {"left": 0, "top": 0, "width": 1920, "height": 1080},
+    {"left": 1920, "top": 0, "width": 2560, "height": 1440},
+]
+
+
+class TestCaptureProfile:
+    """Tests pour CaptureProfile."""
+
+    def test_monitor(self):
+        """Un profil moniteur capture tout le moniteur demandé."""
+        profile = CaptureProfile("second", type="monitor", monitor=2)
+        assert profile.resolve(MONITORS) == MONITORS[2]
+
+    def test_region_relative_to_monitor(self):
+        """La zone est relative au moniteur et limitée à ses bords."""
+        profile = CaptureProfile("quiz", type="region", monitor=2, region=(100, 200, 1000, 800))
+        assert profile.resolve(MONITORS) == {"left": 2020, "top": 200, "width": 1000, "height": 800}
+
+        clipped = CaptureProfile("bord", type="region", monitor=1, region=(1500, 900, 1000, 800))
+        assert clipped.resolve(MONITORS) == {"left": 1500, "top": 900, "width": 420, "height": 180}
+
+    def test_region_outside_monitor(self):
+        """Une zone hors du moniteur est refusée."""
+        profile = CaptureProfile("hors", type="region", region=(5000, 0, 100, 100))
+        with pytest.raises(ValueError):
+            profile.resolve(MONITORS)
+
+    def test_cursor(self):
+        """Le profil curseur capture le moniteur sous la souris."""
+        profile = CaptureProfile("curseur", type="cursor", cursor=lambda: (3000, 500))
+        assert profile.resolve(MONITORS) == MONITORS[2]
+
+        unknown = CaptureProfile("curseur", type="cursor", cursor=lambda: None)
+        assert unknown.resolve(MONITORS) == MONITORS[1]
+
+    def test_invalid_type(self):
+        """Un type inconnu est refusé."""
+        with pytest.raises(ValueError):
+            CaptureProfile("x", type="window")
+
+
+class TestProfileStore:
+    """Tests pour ProfileStore."""
+
+    def test_defaults_without_file(self, tmp_path):
+        """Sans fichier, les profils par défaut sont disponibles."""
+        store = ProfileStore(str(tmp_path / "profiles.json"))
+        assert store.active == "ecran"
+        assert store.cycle().type == "cursor"
+
+    def test_load_cycle_and_save(self, tmp_path):
+        """Le profil choisi est enregistré dans le fichier."""
+        path = tmp_path / "profiles.json"
+        path.write_text(json.dumps({
+            "active": "quiz",
+            "profiles": {
+                "ecran": {"type": "monitor"},
+                "quiz": {"type": "region", "monitor": 2, "region": [0, 0, 800, 600]},
+            }
+        }))
+
+        store = ProfileStore(str(path))
+        assert store.current.region == (0, 0, 800, 600)
+        store.cycle()
+        store.save()
+
+        assert ProfileStore(str(path)).active == "ecran"
+
+    def test_unknown_active_profile(self, tmp_path):
+        """Un profil demandé inexistant est signalé."""
+        with pytest.raises(ValueError, match="inconnu"):
+            ProfileStore(str(tmp_path / "profiles.json"), active="absent")
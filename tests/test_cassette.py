@@ -0,0 +1,217 @@
+"""Tests pour l'enregistrement et le rejeu des sessions (cassette)."""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from PIL import Image
+from src.cassette import Cassette, CassetteCapture, _request_key
+
+httpx = pytest.importorskip("httpx")
+
+
+class _SSEHandler(BaseHTTPRequestHandler):
+    """Répond en deux fragments SSE espacés (encodage chunked, comme Groq)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in (b"data: un\n\n", b"data: deux\n\n"):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.flush()
+            time.sleep(0.05)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sse_server():
+    """Serveur HTTP local (URL de base)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SSEHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _session(cassette):
+    """Session requests montée sur la cassette."""
+    session = requests.Session()
+    session.mount("http://", cassette.adapter())
+    session.mount("https://", cassette.adapter())
+    return session
+
+
+class TestRequestKey:
+    """Tests pour l'empreinte des requêtes."""
+
+    def test_multipart_boundary_ignored(self):
+        """Deux envois ne différant que par la frontière ont la même empreinte."""
+        first = _request_key("POST", "https://h/parse/image", "multipart/form-data; boundary=aaa",
+                             b"--aaa\r\nimage\r\n--aaa--")
+        second = _request_key("POST", "https://h/parse/image", "multipart/form-data; boundary=bbb",
+                              b"--bbb\r\nimage\r\n--bbb--")
+
+        assert first == second
+        assert first[0] == "POST /parse/image"
+
+
+class TestCassette:
+    """Tests pour Cassette."""
+
+    def test_unknown_mode(self, tmp_path):
+        """Un mode inconnu est refusé."""
+        with pytest.raises(ValueError):
+            Cassette(str(tmp_path / "s.cassette"), mode="rewind")
+
+    def test_frames_roundtrip(self, tmp_path):
+        """Les captures sont relues dans l'ordre, avec leur empreinte et leurs durées."""
+        path = str(tmp_path / "s.cassette")
+        recorder = Cassette(path, mode="record")
+        images = [Image.new("L", (40, 20), value) for value in (10, 200)]
+        hashes = [recorder.record_frame(image, {"grab_ms": 3.0, "convert_ms": 1.0}) for image in images]
+        recorder.close()
+
+        capture = CassetteCapture(Cassette(path, mode="replay", latency_scale=0))
+        assert capture.probe() is None
+        for image, fingerprint in zip(images, hashes):
+            replayed = capture.capture_fullscreen()
+            assert replayed.tobytes() == image.tobytes()
+            assert capture.last_fingerprint == fingerprint
+            assert capture.last_timing == {"grab_ms": 3.0, "convert_ms": 1.0}
+        assert capture.capture_fullscreen() is None
+
+    def test_frame_write_error_reported(self, tmp_path, capsys):
+        """Une capture impossible à écrire est signalée au lieu d'être perdue en silence."""
+        recorder = Cassette(str(tmp_path / "s.cassette"), mode="record")
+        image = Image.new("L", (40, 20))
+        image.save = lambda *args, **kwargs: (_ for _ in ()).throw(OSError("disque plein"))
+        recorder.record_frame(image, {})
+        recorder.close()
+
+        assert "disque plein" in capsys.readouterr().out
+
+    def test_api_key_not_recorded(self, tmp_path, monkeypatch, sse_server):
+        """La clé OCRSpace envoyée dans le corps n'est pas écrite dans la cassette."""
+        monkeypatch.setenv("OCRSPACE_API_KEY", "secret-key")
+        path = str(tmp_path / "s.cassette")
+        recorder = Cassette(path, mode="record")
+        _session(recorder).post(f"{sse_server}/parse/image", data={"apikey": "secret-key"}).close()
+        recorder.close()
+
+        with open(path, "rb") as f:
+            assert b"secret-key" not in f.read()
+
+        # La clé du rejeu (différente) est masquée de la même façon
+        monkeypatch.setenv("OCRSPACE_API_KEY", "other-key")
+        player = Cassette(path, mode="replay", latency_scale=0)
+        _session(player).post(f"{sse_server}/parse/image", data={"apikey": "other-key"})
+        assert player.get_stats()["mismatched"] == 0
+
+
+class TestCassetteAdapter:
+    """Tests pour l'adaptateur requests."""
+
+    def test_record_and_replay_stream(self, tmp_path, sse_server):
+        """Les fragments SSE sont rejoués tels qu'enregistrés, aux mêmes instants."""
+        path = str(tmp_path / "s.cassette")
+        recorder = Cassette(path, mode="record")
+        with _session(recorder).post(f"{sse_server}/chat", json={"q": 1}, stream=True) as response:
+            recorded = list(response.iter_lines(decode_unicode=True))
+        recorder.close()
+
+        player = Cassette(path, mode="replay")
+        start = time.perf_counter()
+        with _session(player).post(f"{sse_server}/chat", json={"q": 1}, stream=True) as response:
+            assert response.status_code == 200
+            assert response.headers["Content-Type"] == "text/event-stream"
+            replayed = list(response.iter_lines(decode_unicode=True))
+
+        assert replayed == recorded == ["data: un", "", "data: deux", ""]
+        assert time.perf_counter() - start >= 0.04
+        assert player.get_stats()["replayed"] == 1
+
+    def test_prefers_identical_request(self, tmp_path, sse_server):
+        """La réponse au corps identique est préférée à l'ordre d'enregistrement."""
+        path = str(tmp_path / "s.cassette")
+        recorder = Cassette(path, mode="record")
+        session = _session(recorder)
+        for question in (1, 2):
+            session.post(f"{sse_server}/chat", json={"q": question})
+        recorder.close()
+
+        player = Cassette(path, mode="replay", latency_scale=0)
+        session = _session(player)
+        session.post(f"{sse_server}/chat", json={"q": 2})
+        session.post(f"{sse_server}/chat", json={"q": 3})
+
+        assert player.get_stats()["mismatched"] == 1
+        assert session.post(f"{sse_server}/chat", json={"q": 1}).status_code == 503
+        assert player.get_stats()["exhausted"] == 1
+
+    def test_warm_up_not_recorded(self, tmp_path):
+        """Les requêtes HEAD (préchauffage) répondent sans enregistrement."""
+        path = str(tmp_path / "s.cassette")
+        Cassette(path, mode="record").close()
+
+        player = Cassette(path, mode="replay")
+        assert _session(player).head("http://127.0.0.1:1/").status_code == 200
+        assert player.get_stats()["exhausted"] == 0
+
+
+class TestAsyncTransport:
+    """Tests pour le transport httpx."""
+
+    def test_record_async_replay_sync(self, tmp_path):
+        """Une session enregistrée par httpx se rejoue avec requests."""
+        async def body():
+            yield b"data: un\n\n"
+            yield b"data: deux\n\n"
+
+        def handler(request):
+            return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=body())
+
+        path = str(tmp_path / "s.cassette")
+        recorder = Cassette(path, mode="record")
+
+        async def record():
+            transport = recorder.async_transport(httpx.MockTransport(handler))
+            async with httpx.AsyncClient(transport=transport) as client:
+                async with client.stream("POST", "https://api.test/chat", json={"q": 1}) as response:
+                    return [chunk async for chunk in response.aiter_raw()]
+
+        assert asyncio.run(record()) == [b"data: un\n\n", b"data: deux\n\n"]
+        recorder.close()
+
+        player = Cassette(path, mode="replay", latency_scale=0)
+        response = _session(player).post("https://api.test/chat", data=b'{"q": 1}')
+        assert response.text == "data: un\n\ndata: deux\n\n"
+
+    def test_replay_async(self, tmp_path, sse_server):
+        """Un enregistrement requests se rejoue par httpx, fragment par fragment."""
+        path = str(tmp_path / "s.cassette")
+        recorder = Cassette(path, mode="record")
+        _session(recorder).post(f"{sse_server}/chat", json={"q": 1})
+        recorder.close()
+
+        player = Cassette(path, mode="replay", latency_scale=0)
+
+        async def replay():
+            transport = player.async_transport(httpx.MockTransport(lambda request: httpx.Response(500)))
+            async with httpx.AsyncClient(transport=transport) as client:
+                async with client.stream("POST", f"{sse_server}/chat", json={"q": 1}) as response:
+                    return response.status_code, [chunk async for chunk in response.aiter_raw()]
+
+        start = time.perf_counter()
+        assert asyncio.run(replay()) == (200, [b"data: un\n\n", b"data: deux\n\n"])
+        assert time.perf_counter() - start < 0.04
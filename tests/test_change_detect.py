@@ -0,0 +1,76 @@
+"""Tests pour la détection de changement d'écran."""
+
+import pytest
+from PIL import Image, ImageDraw
+from src.change_detect import ScreenChangeDetector, dhash, hamming_distance
+
+
+def _page(lines, size=(1600, 900)):
+    """Crée une page de texte synthétique."""
+    img = Image.new('RGB', size, color='white')
+    draw = ImageDraw.Draw(img)
+    for i, line in enumerate(lines):
+        draw.text((60, 60 + 40 * i), line, fill='black')
+    return img
+
+
+class TestDHash:
+    """Tests pour le hachage perceptuel."""
+
+    def test_identical_images(self):
+        """Deux captures identiques ont une distance nulle."""
+        img = _page(["Question 1 : capitale de la France ?", "A) Paris", "B) Lyon"])
+        assert hamming_distance(dhash(img), dhash(img.copy())) == 0
+
+    def test_different_pages(self):
+        """Deux pages différentes sont éloignées."""
+        first = _page(["Question 1 : capitale de la France ?", "A) Paris", "B) Lyon"])
+        second = _page(["Question 7 : combien font 6 x 7 ?"] + ["A) 42 " * 20] * 12)
+        assert hamming_distance(dhash(first), dhash(second)) > 2
+
+    def test_hash_size(self):
+        """Le hash contient hash_size² bits."""
+        img = _page(["Texte"])
+        assert dhash(img, hash_size=8) < 2 ** 64
+
+
+class TestScreenChangeDetector:
+    """Tests pour la classe ScreenChangeDetector."""
+
+    def test_first_capture_is_changed(self):
+        """Sans capture mémorisée, l'écran est considéré comme modifié."""
+        detector = ScreenChangeDetector()
+        img = _page(["Question 1"])
+        assert detector.is_unchanged(detector.compute(img)) is False
+
+    def test_remember_and_reset(self):
+        """La dernière signature mémorisée sert de référence."""
+        detector = ScreenChangeDetector(threshold=2)
+        img = _page(["Question 1", "A) oui", "B) non"])
+        signature = detector.compute(img)
+
+        detector.remember(signature)
+        assert detector.is_unchanged(detector.compute(img.copy())) is True
+
+        detector.reset()
+        assert detector.is_unchanged(signature) is False
+
+    def test_single_word_change_detected(self):
+        """Un mot remplacé à mise en page identique est détecté."""
+        detector = ScreenChangeDetector()
+        first = _page(["Question 1 : capitale de la France ?", "A) Paris", "B) Lyon"])
+        second = _page(["Question 1 : capitale de la France ?", "A) Paris", "B) Lille"])
+
+        detector.remember(detector.compute(first))
+        assert detector.is_unchanged(detector.compute(second)) is False
+
+    def test_same_screen(self):
+        """same_screen compare deux signatures sans toucher à la dernière mémorisée."""
+        detector = ScreenChangeDetector()
+        first = detector.compute(_page(["Question 1 : capitale de la France ?", "A) Paris"]))
+        again = detector.compute(_page(["Question 1 : capitale de la France ?", "A) Paris"]))
+        other = detector.compute(_page(["Question 2 : combien font 6 x 7 ?", "A) 42"]))
+
+        assert detector.same_screen(first, again)
+        assert not detector.same_screen(first, other)
+        assert detector.last_signature is None
@@ -0,0 +1,57 @@
+"""Tests pour l'encodeur d'images."""
+
+import numpy as np
+from PIL import Image, ImageDraw
+from src.encoder import ImageEncoder, content_features
+
+
+def _text_screen(size=(1280, 720)):
+    """Capture synthétique : lignes de texte sur fond blanc."""
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for y in range(20, size[1] - 20, 24):
+        draw.text((30, y), "Question : quelle est la bonne réponse ? A) oui B) non", fill="black")
+    return image
+
+
+def _noisy_screen(size=(1280, 720)):
+    """Capture bruitée (photo, fond texturé)."""
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8))
+
+
+class TestImageEncoder:
+    """Tests pour ImageEncoder."""
+
+    def test_text_screen_uses_png(self):
+        """Un écran de texte sur fond uni est envoyé en PNG, en une passe."""
+        encoded = ImageEncoder().encode(_text_screen())
+
+        assert encoded.format == "PNG"
+        assert encoded.filetype == "PNG"
+        assert encoded.passes == 1
+        assert encoded.buffer.getvalue()[:4] == b"\x89PNG"
+
+    def test_noisy_screen_uses_jpeg_under_budget(self):
+        """Une image bruitée passe en JPEG et respecte le budget."""
+        encoder = ImageEncoder(max_bytes=200 * 1024)
+        encoded = encoder.encode(_noisy_screen())
+
+        assert encoded.format == "JPEG"
+        assert encoded.mime_type == "image/jpeg"
+        assert encoded.nbytes <= 200 * 1024
+        assert encoded.quality < 85
+
+    def test_downscale_without_mutating_input(self):
+        """L'image est réduite aux dimensions maximales sans modifier l'originale."""
+        image = _text_screen((3840, 2160))
+        encoded = ImageEncoder(max_size=(1920, 1080)).encode(image)
+
+        assert encoded.size == (1920, 1080)
+        assert image.size == (3840, 2160)
+
+    def test_content_features(self):
+        """Le contraste et la densité sont nuls pour une image unie."""
+        assert content_features(Image.new("L", (200, 100), 255)) == (0.0, 0.0)
+        contrast, density = content_features(_noisy_screen().convert("L"))
+        assert contrast > 20 and density > 0.9
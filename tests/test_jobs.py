@@ -0,0 +1,142 @@
+"""Tests pour la file de traitements avec regroupement."""
+
+import threading
+import pytest
+from src.jobs import CoalescingJobQueue, Job
+
+
+class _BlockingHandler:
+    """Traitement factice bloqué jusqu'à ce que le test le libère."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.jobs = []
+
+    def __call__(self, job):
+        self.jobs.append(job)
+        self.started.set()
+        job.on_cancel(self.release.set)
+        self.release.wait(5)
+
+
+class TestJob:
+    """Tests pour Job."""
+
+    def test_cancel_runs_callbacks_once(self):
+        """L'annulation appelle les actions enregistrées une seule fois."""
+        calls = []
+        job = Job(id=1)
+        job.on_cancel(lambda: calls.append("annulé"))
+
+        assert job.cancel()
+        assert not job.cancel()
+        assert calls == ["annulé"]
+
+    def test_callback_after_cancel(self):
+        """Une action enregistrée après l'annulation est appelée aussitôt."""
+        calls = []
+        job = Job(id=1)
+        job.cancel()
+        job.on_cancel(lambda: calls.append("annulé"))
+        assert calls == ["annulé"]
+
+
+class TestCoalescingJobQueue:
+    """Tests pour CoalescingJobQueue."""
+
+    def test_single_job(self):
+        """Une demande isolée est traitée une fois."""
+        handled = []
+        queue = CoalescingJobQueue(handled.append)
+
+        job, merged = queue.submit()
+
+        assert not merged
+        assert queue.wait_idle(2)
+        assert handled == [job]
+        assert job.wait_ms is not None
+        queue.stop()
+
+    def test_presses_during_processing_are_coalesced(self):
+        """Les appuis reçus pendant un traitement donnent une seule demande suivante."""
+        handler = _BlockingHandler()
+        queue = CoalescingJobQueue(handler)
+
+        first, _ = queue.submit()
+        assert handler.started.wait(2)
+        second, merged_second = queue.submit()
+        third, merged_third = queue.submit()
+        fourth, merged_fourth = queue.submit()
+
+        assert not merged_second and merged_third and merged_fourth
+        assert second is third is fourth
+        assert second.presses == 3
+        assert queue.depth == 2
+
+        handler.release.set()
+        assert queue.wait_idle(2)
+        assert handler.jobs == [first, second]
+
+        stats = queue.get_stats()
+        assert stats["submitted"] == 4
+        assert stats["coalesced"] == 2
+        assert stats["completed"] == 2
+        assert stats["max_depth"] == 2
+        assert stats["depth"] == 0
+        assert 0 <= stats["wait_mean_ms"] <= stats["wait_max_ms"]
+        assert stats["wait_p95_ms"] <= stats["wait_max_ms"]
+        queue.stop()
+
+    def test_wait_history_bounded(self):
+        """Seules les `wait_window` dernières attentes sont conservées."""
+        queue = CoalescingJobQueue(lambda job: None, wait_window=2)
+        for _ in range(5):
+            queue.submit()
+            assert queue.wait_idle(2)
+
+        assert queue.get_stats()["completed"] == 5
+        assert len(queue._waits._samples) == 2
+        queue.stop()
+
+    def test_cancel_running(self):
+        """Le traitement en cours peut être annulé, la demande suivante s'exécute."""
+        handler = _BlockingHandler()
+        queue = CoalescingJobQueue(handler)
+
+        first, _ = queue.submit()
+        assert handler.started.wait(2)
+        second, _ = queue.submit()
+
+        assert queue.cancel_running()
+        assert first.cancelled
+        assert queue.wait_idle(2)
+        assert handler.jobs == [first, second]
+        assert queue.get_stats()["cancelled"] == 1
+        queue.stop()
+
+    def test_handler_errors_do_not_stop_consumer(self):
+        """Une erreur de traitement n'arrête pas la file."""
+        handled = []
+
+        def handler(job):
+            handled.append(job)
+            if len(handled) == 1:
+                raise RuntimeError("échec")
+
+        queue = CoalescingJobQueue(handler)
+        queue.submit()
+        assert queue.wait_idle(2)
+        queue.submit()
+        assert queue.wait_idle(2)
+
+        assert len(handled) == 2
+        queue.stop()
+
+    def test_stop(self):
+        """Une file arrêtée refuse les nouvelles demandes."""
+        queue = CoalescingJobQueue(lambda job: None)
+        queue.stop()
+
+        with pytest.raises(RuntimeError):
+            queue.submit()
@@ -2,7 +2,8 @@
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from src.llm_client import LLMClient, create_llm_client
+from src.cache import ResultCache
+from src.llm_client import LLMClient, create_llm_client, normalize_qcm_text
 
 
 class TestLLMClient:
@@ -188,3 +189,151 @@ class TestFactoryFunction:
         assert client.api_key == "custom_key"
         assert client.base_url == "https://custom.api.com"
         assert client.model == "custom-model"
+
+
+class TestNormalization:
+    """Tests pour la normalisation du texte OCR."""
+
+    def test_whitespace_and_case(self):
+        """Espaces et casse n'influencent pas le texte normalisé."""
+        assert normalize_qcm_text("  Quelle  est\nla CAPITALE ?") == \
+            normalize_qcm_text("quelle est la capitale?")
+
+    def test_punctuation_variants(self):
+        """Les variantes typographiques sont unifiées."""
+        assert normalize_qcm_text("l’eau — « oui »…") == normalize_qcm_text("l'eau - \"oui\"...")
+
+
+class TestResponseCache:
+    """Tests pour le cache des réponses LLM."""
+
+    def test_cache_hit_skips_request(self):
+        """Un texte déjà analysé (au bruit OCR près) n'est pas renvoyé à Groq."""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": "✅ RÉPONSE: A"}}]
+        }
+        session = Mock()
+        session.post.return_value = mock_response
+
+        client = LLMClient(api_key="test_key", cache=ResultCache(), session=session)
+        first = client.analyze_qcm_text("Question 1 : 2 + 2 ?\nA) 4\nB) 5")
+        second = client.analyze_qcm_text("question 1: 2 + 2 ?  A ) 4 B ) 5")
+
+        assert first == second == "✅ RÉPONSE: A"
+        assert session.post.call_count == 1
+        assert client.cache.get_stats()["hits"] == 1
+
+    def test_cache_key_depends_on_model_and_temperature(self):
+        """Le modèle et la température font partie de la clé."""
+        base = LLMClient(api_key="test_key")
+        other_model = LLMClient(api_key="test_key", model="autre-modele")
+        other_temp = LLMClient(api_key="test_key", temperature=0.9)
+
+        key = base._cache_key("Question")
+        assert key != other_model._cache_key("Question")
+        assert key != other_temp._cache_key("Question")
+
+
+class TestHTTPSession:
+    """Tests pour la session HTTP du client."""
+
+    def test_session_reused_with_split_timeouts(self):
+        """Toutes les requêtes passent par la même session avec (connexion, lecture)."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"choices": [{"message": {"content": "ok"}}]}
+        session = Mock()
+        session.post.return_value = mock_response
+
+        client = LLMClient(api_key="test_key", session=session, timeout=(2, 20))
+        client.analyze_qcm_text("Question A")
+        client.analyze_qcm_text("Question B")
+
+        assert session.post.call_count == 2
+        assert session.post.call_args[1]["timeout"] == (2, 20)
+
+    def test_base_url_from_env(self, monkeypatch):
+        """GROQ_BASE_URL redirige les requêtes (serveur compatible OpenAI local)."""
+        monkeypatch.setenv("GROQ_BASE_URL", "http://127.0.0.1:8081/openai/v1/")
+        mock_response = Mock()
+        mock_response.json.return_value = {"choices": [{"message": {"content": "ok"}}]}
+        session = Mock()
+        session.post.return_value = mock_response
+
+        LLMClient(api_key="test_key", session=session).analyze_qcm_text("Question A")
+
+        assert session.post.call_args[0][0] == "http://127.0.0.1:8081/openai/v1/chat/completions"
+
+
+class TestStreaming:
+    """Tests pour le mode streaming."""
+
+    @staticmethod
+    def _sse_session(lines):
+        """Crée une session renvoyant un flux SSE."""
+        response = Mock()
+        response.iter_lines.return_value = iter(lines)
+        session = Mock()
+        session.post.return_value = response
+        return session
+
+    def test_stream_yields_tokens(self):
+        """Les fragments sont produits dans l'ordre puis mis en cache."""
+        session = self._sse_session([
+            'data: {"choices": [{"delta": {"content": "✅ RÉPONSE"}}]}',
+            '',
+            'data: {"choices": [{"delta": {"content": ": B"}}]}',
+            'data: [DONE]',
+        ])
+        client = LLMClient(api_key="test_key", cache=ResultCache(), session=session)
+
+        chunks = list(client.stream_qcm_text("Question ?"))
+
+        assert chunks == ["✅ RÉPONSE", ": B"]
+        assert client.last_stream_completed is True
+        assert session.post.call_args[1]["json"]["stream"] is True
+        assert session.post.call_args[1]["stream"] is True
+        assert client.analyze_qcm_text("Question ?") == "✅ RÉPONSE: B"
+
+    def test_stream_decodes_utf8_without_charset(self):
+        """Un flux text/event-stream sans charset est décodé en UTF-8."""
+        import io
+        import json
+        import requests
+        events = [{"choices": [{"delta": {"content": "✅ RÉPONSE"}}]}, {"choices": [{"delta": {"content": ": é"}}]}]
+        body = "".join(f"data: {json.dumps(e, ensure_ascii=False)}\n\n" for e in events) + "data: [DONE]\n\n"
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "text/event-stream"
+        response.encoding = "ISO-8859-1"
+        response.raw = io.BytesIO(body.encode("utf-8"))
+        session = Mock()
+        session.post.return_value = response
+        client = LLMClient(api_key="test_key", session=session)
+
+        assert list(client.stream_qcm_text("Question ?")) == ["✅ RÉPONSE", ": é"]
+
+    def test_callback_form(self):
+        """analyze_qcm_text(on_token=...) transmet chaque fragment."""
+        session = self._sse_session([
+            'data: {"choices": [{"delta": {"content": "A"}}]}',
+            'data: {"choices": [{"delta": {"content": "B"}}]}',
+            'data: [DONE]',
+        ])
+        client = LLMClient(api_key="test_key", session=session)
+        received = []
+
+        result = client.analyze_qcm_text("Question ?", on_token=received.append)
+
+        assert received == ["A", "B"]
+        assert result == "AB"
+
+    def test_stream_error_returns_none(self):
+        """Une erreur réseau interrompt le flux sans lever d'exception."""
+        import requests
+        session = Mock()
+        session.post.side_effect = requests.exceptions.Timeout()
+        client = LLMClient(api_key="test_key", session=session)
+
+        assert client.analyze_qcm_text("Question ?", on_token=lambda chunk: None) is None
+        assert client.last_stream_completed is False
@@ -0,0 +1,121 @@
+"""Tests pour les mesures de latence par étape."""
+
+import asyncio
+import json
+import time
+from src.metrics import Histogram, MetricsRegistry, current_trace, spans_from_jsonl
+
+
+class TestHistogram:
+    """Tests pour Histogram."""
+
+    def test_percentiles(self):
+        """Les quantiles suivent la méthode du rang le plus proche."""
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.observe(float(value))
+
+        assert histogram.percentile(0.50) == 50
+        assert histogram.percentile(0.95) == 95
+        assert histogram.percentile(0.99) == 99
+        summary = histogram.summary()
+        assert summary["count"] == 100
+        assert summary["mean_ms"] == 50.5
+
+    def test_empty(self):
+        """Un histogramme vide renvoie des zéros."""
+        assert Histogram().summary()["p99_ms"] == 0.0
+
+    def test_window(self):
+        """Les quantiles portent sur la fenêtre, les totaux sur tout l'historique."""
+        histogram = Histogram(window=10)
+        for value in [1000.0] * 10 + [1.0] * 10:
+            histogram.observe(value)
+
+        assert histogram.percentile(0.99) == 1.0
+        assert histogram.count == 20
+
+
+class TestMetricsRegistry:
+    """Tests pour MetricsRegistry."""
+
+    def test_span_records_duration_and_attrs(self):
+        """Un span mesure sa durée et alimente l'histogramme de l'étape."""
+        metrics = MetricsRegistry()
+        with metrics.span("ocr", backend="ocrspace") as span:
+            time.sleep(0.01)
+            span.set(cache_hit=True, bytes=2048)
+
+        assert span.duration_ms >= 10
+        assert span.attrs == {"backend": "ocrspace", "cache_hit": True, "bytes": 2048}
+        assert metrics.get_stats()["ocr"]["count"] == 1
+        assert metrics.bytes_total["ocr"] == 2048
+        assert metrics.cache_hits["ocr"] == 1
+
+    def test_span_recorded_on_error(self):
+        """Un span est enregistré même si l'étape lève une exception."""
+        metrics = MetricsRegistry()
+        try:
+            with metrics.span("upload"):
+                raise TimeoutError
+        except TimeoutError:
+            pass
+        assert metrics.get_stats()["upload"]["count"] == 1
+
+    def test_trace_follows_async_tasks_and_threads(self):
+        """L'identifiant de capture suit les tâches asyncio et asyncio.to_thread."""
+        metrics = MetricsRegistry()
+
+        async def pipeline():
+            token = metrics.new_trace()
+            try:
+                with metrics.span("capture") as outer:
+                    inner = await asyncio.to_thread(lambda: metrics.record("convert", 1.0))
+                return outer, inner
+            finally:
+                metrics.end_trace(token)
+
+        outer, inner = asyncio.run(pipeline())
+        assert outer.trace == inner.trace == 1
+        assert current_trace.get() is None
+
+    def test_jsonl_export(self, tmp_path):
+        """Chaque span est ajouté au fichier JSON lines."""
+        path = tmp_path / "spans.jsonl"
+        metrics = MetricsRegistry(jsonl_path=str(path))
+        metrics.record("encode", 12.5, bytes=1000, format="PNG")
+        metrics.record("upload", 80.0, bytes=1000)
+
+        spans = spans_from_jsonl(str(path))
+        assert [span["name"] for span in spans] == ["encode", "upload"]
+        assert spans[0]["duration_ms"] == 12.5
+        assert spans[0]["format"] == "PNG"
+
+    def test_prometheus_textfile(self, tmp_path):
+        """Le textfile Prometheus contient quantiles, sommes, compteurs et octets."""
+        path = tmp_path / "qcm.prom"
+        metrics = MetricsRegistry(prometheus_path=str(path))
+        for value in (10.0, 20.0, 30.0):
+            metrics.record("ocr", value, bytes=100, cache_hit=value == 10.0)
+
+        assert metrics.write_prometheus()
+        text = path.read_text(encoding="utf-8")
+        assert "# TYPE qcm_stage_latency_ms summary" in text
+        assert 'qcm_stage_latency_ms{stage="ocr",quantile="0.5"} 20.000' in text
+        assert 'qcm_stage_latency_ms_sum{stage="ocr"} 60.000' in text
+        assert 'qcm_stage_latency_ms_count{stage="ocr"} 3' in text
+        assert 'qcm_stage_bytes_total{stage="ocr"} 300' in text
+        assert 'qcm_stage_cache_hits_total{stage="ocr"} 1' in text
+        assert not (tmp_path / "qcm.prom.tmp").exists()
+
+    def test_prometheus_disabled(self):
+        """Sans chemin, rien n'est écrit."""
+        assert not MetricsRegistry().write_prometheus()
+
+    def test_report(self):
+        """Le rapport liste chaque étape."""
+        metrics = MetricsRegistry()
+        metrics.record("capture", 5.0)
+        metrics.record("llm_generation", 500.0)
+        report = metrics.report()
+        assert "capture" in report and "llm_generation" in report
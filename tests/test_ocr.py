@@ -1,8 +1,12 @@
 """Tests pour le module OCR."""
 
 import pytest
+from unittest.mock import MagicMock, patch
 from PIL import Image, ImageDraw, ImageFont
-from src.ocr import OCRProcessor, extract_text_from_image
+from src.ocr import (
+    OCRLine, OCRProcessor, PytesseractEngine, TesserocrEngine, create_engine,
+    extract_text_from_image
+)
 
 
 class TestOCRProcessor:
@@ -56,6 +60,106 @@ class TestOCRProcessor:
         assert isinstance(success, bool)
 
 
+class TestEngines:
+    """Tests pour le choix du moteur Tesseract."""
+
+    @patch('src.ocr.tesserocr', None)
+    def test_auto_falls_back_to_pytesseract(self):
+        """Sans tesserocr, le mode auto utilise pytesseract."""
+        assert isinstance(create_engine("auto"), PytesseractEngine)
+
+    @patch('src.ocr.tesserocr', None)
+    def test_tesserocr_required(self):
+        """Demander tesserocr sans l'avoir installé échoue clairement."""
+        with pytest.raises(ImportError):
+            create_engine("tesserocr")
+
+    def test_unknown_engine(self):
+        """Un moteur inconnu est refusé."""
+        with pytest.raises(ValueError):
+            create_engine("easyocr")
+
+    @patch('src.ocr.tesserocr')
+    def test_tesserocr_api_reused(self, mock_tesserocr):
+        """L'API est chargée une fois et reçoit les pixels directement."""
+        api = mock_tesserocr.PyTessBaseAPI.return_value
+        api.GetUTF8Text.return_value = "Question 1 : quelle est la bonne réponse ?"
+
+        processor = OCRProcessor(lang="fra", min_text_length=10)
+        img = Image.new('L', (40, 20), color=255)
+        processor.extract_text(img, preprocess=False)
+        text, success = processor.extract_text(img.copy(), preprocess=False)
+
+        assert isinstance(processor.engine, TesserocrEngine)
+        mock_tesserocr.PyTessBaseAPI.assert_called_once_with(lang="fra", psm=6)
+        api.SetImageBytes.assert_called_with(img.tobytes(), 40, 20, 1, 40)
+        assert success is True
+
+        processor.close()
+        api.End.assert_called_once()
+
+
+class TestAdaptiveOCR:
+    """Tests pour le prétraitement adaptatif."""
+
+    def _processor(self, engine):
+        processor = OCRProcessor(min_text_length=5)
+        processor.engine = engine
+        return processor
+
+    def _page(self, background='white', ink='black'):
+        img = Image.new('RGB', (400, 100), color=background)
+        draw = ImageDraw.Draw(img)
+        draw.text((10, 20), "Question 1 : capitale ?", fill=ink)
+        draw.text((10, 60), "A) Paris", fill=ink)
+        return img
+
+    def test_fast_path(self):
+        """Des lignes confiantes ne déclenchent aucune relecture."""
+        engine = MagicMock()
+        engine.recognize_lines.return_value = [
+            OCRLine("Question 1 : capitale ?", 95, (10, 20, 150, 30)),
+            OCRLine("A) Paris", 91, (10, 60, 60, 70)),
+        ]
+        processor = self._processor(engine)
+
+        text, success = processor.extract_text(self._page())
+
+        assert text == "Question 1 : capitale ?\nA) Paris"
+        assert success is True
+        assert engine.recognize_lines.call_count == 1
+        assert processor.last_stats["path"] == "fast"
+
+    def test_low_confidence_line_reread(self):
+        """Seule la ligne douteuse est relue (en ligne unique, agrandie)."""
+        engine = MagicMock()
+        engine.recognize_lines.side_effect = [
+            [OCRLine("Question 1 : capitale ?", 95, (10, 20, 150, 30)),
+             OCRLine("A) Par1s", 40, (10, 60, 60, 70))],
+            [OCRLine("A) Paris", 88, (0, 0, 200, 60))],
+        ]
+        processor = self._processor(engine)
+
+        text, _ = processor.extract_text(self._page())
+
+        assert text.endswith("A) Paris")
+        reread_image, psm = engine.recognize_lines.call_args[0]
+        assert psm == 7
+        assert reread_image.height > 20
+        assert processor.last_stats == {"path": "reread", "psm": 6, "lines": 2, "reread": 1}
+
+    def test_dark_mode_inverted_before_ocr(self):
+        """Une page en mode sombre est inversée avant le premier passage."""
+        engine = MagicMock()
+        engine.recognize_lines.return_value = [OCRLine("Question 1", 90, (0, 0, 10, 10))]
+        processor = self._processor(engine)
+
+        processor.extract_text(self._page(background='black', ink='white'))
+
+        first_image = engine.recognize_lines.call_args_list[0][0][0]
+        assert first_image.getpixel((0, 0)) == 255
+
+
 class TestUtilityFunctions:
     """Tests pour les fonctions utilitaires."""
 
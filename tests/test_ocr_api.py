@@ -0,0 +1,80 @@
+"""Tests pour le client OCRSpace."""
+
+import pytest
+from unittest.mock import Mock, patch
+from PIL import Image
+from src.cache import ResultCache
+from src.ocr_api import OCRSpaceAPI
+
+
+def _ocr_response(text):
+    """Crée une fausse réponse OCRSpace."""
+    response = Mock()
+    response.json.return_value = {
+        "IsErroredOnProcessing": False,
+        "ParsedResults": [{"ParsedText": text}]
+    }
+    return response
+
+
+class TestOCRSpaceAPI:
+    """Tests pour la classe OCRSpaceAPI."""
+
+    def test_init_no_api_key(self):
+        """Test l'initialisation sans clé API."""
+        with patch.dict('os.environ', {}, clear=True):
+            with pytest.raises(ValueError, match="OCRSpace"):
+                OCRSpaceAPI()
+
+    def test_extract_text_cached(self):
+        """Une deuxième capture identique ne rappelle pas l'API."""
+        session = Mock()
+        session.post.return_value = _ocr_response("Question 1 ?")
+        api = OCRSpaceAPI(api_key="test_key", cache=ResultCache(), session=session)
+        img = Image.new('RGB', (300, 200), color='white')
+
+        first = api.extract_text(img)
+        second = api.extract_text(img.copy())
+
+        assert first == second == ("Question 1 ?", True)
+        assert session.post.call_count == 1
+        assert api.cache.get_stats()["hits"] == 1
+
+    def test_warm_up_opens_connection(self):
+        """warm_up() envoie une requête HEAD via la session du client."""
+        session = Mock()
+        api = OCRSpaceAPI(api_key="test_key", session=session, timeout=(1, 5))
+
+        assert api.warm_up() is not None
+        session.head.assert_called_once()
+        assert session.head.call_args[1]["timeout"] == (1, 5)
+
+    def test_api_url_from_env(self, monkeypatch):
+        """OCRSPACE_API_URL redirige l'envoi et le préchauffage (serveur local)."""
+        monkeypatch.setenv("OCRSPACE_API_URL", "http://127.0.0.1:8080/parse/image")
+        session = Mock()
+        session.post.return_value = _ocr_response("Question 1 ?")
+        api = OCRSpaceAPI(api_key="test_key", session=session)
+
+        api.extract_text(Image.new('RGB', (300, 200), color='white'))
+        api.warm_up()
+
+        assert session.post.call_args[0][0] == "http://127.0.0.1:8080/parse/image"
+        assert session.head.call_args[0][0] == "http://127.0.0.1:8080/"
+
+    def test_multipart_upload(self):
+        """L'image part en fichier binaire, sans champ base64."""
+        session = Mock()
+        session.post.return_value = _ocr_response("Question 1 ?")
+        api = OCRSpaceAPI(api_key="test_key", session=session)
+
+        api.extract_text(Image.new('RGB', (300, 200), color='white'))
+
+        kwargs = session.post.call_args[1]
+        name, fileobj, content_type = kwargs["files"]["file"]
+        assert content_type == "image/png"
+        assert fileobj.getvalue()[:4] == b"\x89PNG"
+        assert "base64Image" not in kwargs["data"]
+        assert kwargs["data"]["filetype"] == "PNG"
+        assert api.last_stats["payload_bytes"] == len(fileobj.getvalue())
+        assert "request_ms" in api.last_stats
@@ -0,0 +1,94 @@
+"""Tests pour le registre des moteurs OCR."""
+
+import subprocess
+import sys
+import pytest
+from src import ocr_backends
+from src.ocr_backends import available_backends, backend_parts, create_backend, register_backend
+
+
+class TestRegistry:
+    """Tests pour l'enregistrement et la création des moteurs."""
+
+    def test_builtin_backends(self):
+        """Les moteurs fournis sont enregistrés."""
+        assert {"ocrspace", "tesseract", "hybrid"} <= set(available_backends())
+
+    def test_register_custom_backend(self, monkeypatch):
+        """Un moteur enregistré reçoit les options de l'application."""
+        monkeypatch.setattr(ocr_backends, "_REGISTRY", dict(ocr_backends._REGISTRY))
+
+        @register_backend("Factice")
+        def _create(language="fre", **_):
+            return ("factice", language)
+
+        assert create_backend("factice", language="eng", cache=None) == ("factice", "eng")
+
+    def test_unknown_backend(self):
+        """Un nom inconnu lève une ValueError listant les moteurs."""
+        with pytest.raises(ValueError, match="ocrspace"):
+            create_backend("inconnu")
+
+    def test_ocrspace_backend(self, monkeypatch):
+        """Le moteur ocrspace crée le client requests hors mode asynchrone."""
+        from src.ocr_api import OCRSpaceAPI
+        monkeypatch.setenv("OCRSPACE_API_KEY", "test_key")
+
+        backend = create_backend("ocrspace", language="eng", use_async=False)
+
+        assert isinstance(backend, OCRSpaceAPI)
+        assert backend.language == "eng"
+
+    def test_tesseract_workers(self, monkeypatch):
+        """Le nombre de processus Tesseract est transmis à OCRProcessor."""
+        from src import ocr
+        created = {}
+        monkeypatch.setattr(ocr.OCRProcessor, "__init__", lambda self, **kwargs: created.update(kwargs))
+
+        create_backend("tesseract", tesseract_lang="eng", tesseract_workers=3)
+
+        assert created == {"lang": "eng", "cache": None, "workers": 3}
+
+    def test_hybrid_backend(self, monkeypatch):
+        """Le moteur hybrid combine les moteurs demandés."""
+        monkeypatch.setattr(ocr_backends, "_REGISTRY", dict(ocr_backends._REGISTRY))
+        register_backend("a")(lambda **_: "moteur a")
+        register_backend("b")(lambda **_: "moteur b")
+
+        backend = create_backend("hybrid", hybrid_backends="a, b", quality_bar=0.8)
+
+        assert backend.quality_bar == 0.8
+        assert backend_parts(backend, "hybrid") == {"a": "moteur a", "b": "moteur b"}
+
+    def test_hybrid_cannot_nest(self):
+        """Le moteur hybrid refuse de se contenir lui-même."""
+        with pytest.raises(ValueError):
+            create_backend("hybrid", hybrid_backends="hybrid")
+
+    def test_backend_parts_single(self):
+        """Un moteur simple est son propre et unique composant."""
+        backend = object()
+        assert backend_parts(backend, "seul") == {"seul": backend}
+
+
+class TestLazyImports:
+    """Les dépendances d'un moteur ne sont importées qu'à sa création."""
+
+    def test_registry_import_is_light(self):
+        """Importer le registre n'importe ni pytesseract, ni requests, ni httpx."""
+        code = (
+            "import sys, src.ocr_backends\n"
+            "print(sorted(m for m in ('pytesseract', 'requests', 'httpx', 'src.ocr') if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        assert output == "[]"
+
+    def test_ocr_module_defers_pytesseract(self):
+        """src.ocr n'importe pytesseract qu'à la création d'un moteur pytesseract."""
+        code = "import sys, src.ocr\nprint('pytesseract' in sys.modules)"
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        assert output == "False"
@@ -0,0 +1,160 @@
+"""Tests pour l'OCR hybride (course entre moteurs)."""
+
+import asyncio
+import time
+from PIL import Image
+from src.ocr_hybrid import HybridOCR, score_text
+
+
+QCM = """Question 1 : Quelle est la capitale de la France ?
+A) Paris
+B) Lyon
+C) Marseille
+D) Toulouse"""
+
+
+class _SyncBackend:
+    """Faux moteur synchrone (type Tesseract local)."""
+
+    def __init__(self, text, success=True, delay=0.0):
+        self.text, self.success, self.delay = text, success, delay
+
+    def extract_text(self, image):
+        time.sleep(self.delay)
+        return self.text, self.success
+
+
+class _AsyncBackend:
+    """Faux moteur asynchrone (type client OCRSpace httpx)."""
+
+    def __init__(self, text, success=True, delay=0.0):
+        self.text, self.success, self.delay = text, success, delay
+        self.cancelled = False
+
+    async def extract_text(self, image):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.text, self.success
+
+
+class _FailingBackend:
+    """Faux moteur levant une exception."""
+
+    def extract_text(self, image):
+        raise RuntimeError("moteur indisponible")
+
+
+def _image():
+    return Image.new("L", (50, 50), 255)
+
+
+class TestScoreText:
+    """Tests pour score_text."""
+
+    def test_empty_text(self):
+        """Un texte vide vaut 0."""
+        assert score_text("") == 0.0
+        assert score_text("   \n") == 0.0
+
+    def test_qcm_scores_high(self):
+        """Un QCM complet et propre dépasse le seuil par défaut."""
+        assert score_text(QCM) >= 0.6
+
+    def test_garbage_scores_low(self):
+        """Des symboles parasites sans structure restent sous le seuil."""
+        assert score_text("|~ ^^ ## @@ ¤¤ ~~ || §§ ``") < 0.3
+
+    def test_structure_beats_plain_text(self):
+        """À longueur égale, un texte structuré en QCM l'emporte."""
+        plain = "Le texte suivant ne contient aucune question ni option."
+        assert score_text(QCM) > score_text(plain * 2)
+
+
+class TestHybridOCR:
+    """Tests pour HybridOCR."""
+
+    def test_fast_good_result_wins(self):
+        """Le premier résultat au-dessus du seuil est retenu, l'autre annulé."""
+        slow = _AsyncBackend(QCM + " (lent)", delay=5)
+        hybrid = HybridOCR([("ocrspace", slow), ("tesseract", _SyncBackend(QCM))])
+
+        text, success = asyncio.run(hybrid.extract_text(_image()))
+
+        assert success and text == QCM
+        assert hybrid.last_winner == "tesseract"
+        assert slow.cancelled
+
+    def test_poor_fast_result_waits_for_better(self):
+        """Un résultat rapide mais médiocre cède la place à un meilleur résultat."""
+        hybrid = HybridOCR([
+            ("tesseract", _SyncBackend("~~ ##")),
+            ("ocrspace", _AsyncBackend(QCM, delay=0.05)),
+        ])
+
+        text, success = asyncio.run(hybrid.extract_text(_image()))
+
+        assert success and text == QCM
+        assert hybrid.last_winner == "ocrspace"
+
+    def test_best_result_below_bar(self):
+        """Sans résultat au-dessus du seuil, le meilleur obtenu est renvoyé."""
+        hybrid = HybridOCR([
+            ("a", _SyncBackend("texte court")),
+            ("b", _AsyncBackend("~~", delay=0.01)),
+        ], quality_bar=0.99)
+
+        text, success = asyncio.run(hybrid.extract_text(_image()))
+
+        assert success and text == "texte court"
+
+    def test_failures_are_ignored(self):
+        """Les échecs et exceptions d'un moteur n'empêchent pas l'autre de gagner."""
+        hybrid = HybridOCR([
+            ("cassé", _FailingBackend()),
+            ("vide", _SyncBackend("", success=False)),
+            ("ok", _AsyncBackend(QCM, delay=0.01)),
+        ])
+
+        text, success = asyncio.run(hybrid.extract_text(_image()))
+
+        assert success and text == QCM
+        stats = hybrid.get_stats()
+        assert stats["cassé"]["failures"] == 1
+        assert stats["vide"]["failures"] == 1
+
+    def test_all_fail(self):
+        """Si tous les moteurs échouent, l'extraction échoue."""
+        hybrid = HybridOCR([("cassé", _FailingBackend())])
+
+        assert asyncio.run(hybrid.extract_text(_image())) == ("", False)
+        assert hybrid.last_winner is None
+
+    def test_stats(self):
+        """Taux de victoire et latences sont enregistrés par moteur."""
+        hybrid = HybridOCR([
+            ("rapide", _SyncBackend(QCM)),
+            ("lent", _AsyncBackend(QCM, delay=5)),
+        ])
+
+        for _ in range(2):
+            asyncio.run(hybrid.extract_text(_image()))
+        stats = hybrid.get_stats()
+
+        assert stats["rapide"]["runs"] == 2
+        assert stats["rapide"]["win_rate"] == 1.0
+        assert stats["rapide"]["p50_ms"] >= 0
+        assert stats["lent"]["win_rate"] == 0.0
+        assert stats["lent"]["mean_ms"] == 0.0
+
+    def test_latencies_bounded(self):
+        """Seules les `latency_window` dernières latences sont conservées."""
+        hybrid = HybridOCR([("rapide", _SyncBackend(QCM))], latency_window=3)
+
+        for _ in range(5):
+            asyncio.run(hybrid.extract_text(_image()))
+
+        assert hybrid.get_stats()["rapide"]["runs"] == 5
+        assert len(hybrid.stats["rapide"]["latencies_ms"]) == 3
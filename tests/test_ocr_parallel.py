@@ -0,0 +1,147 @@
+"""Tests pour l'OCR parallèle par bandes."""
+
+from functools import partial
+import numpy as np
+from PIL import Image, ImageDraw
+from src import ocr_parallel
+from src.ocr import OCRLine, OCRProcessor
+from src.ocr_parallel import ParallelOCR, find_bands, merge_band_lines, merge_band_texts
+
+
+class _HeightEngine:
+    """Faux moteur : renvoie le nombre de pixels sombres de la bande reçue."""
+
+    def recognize(self, image):
+        return f"bande {int((np.asarray(image) < 128).sum())}"
+
+
+def _height_engine():
+    """Fabrique du faux moteur (appelée dans chaque processus)."""
+    return _HeightEngine()
+
+
+class _LineEngine:
+    """Faux moteur : une ligne par bloc sombre, nommée d'après sa largeur."""
+
+    def recognize_lines(self, image, psm):
+        dark = np.asarray(image) < 128
+        rows = dark.any(axis=1)
+        edges = np.diff(np.concatenate(([0], rows.astype(np.int8), [0])))
+        lines = []
+        for top, bottom in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+            width = int(dark[top:bottom].any(axis=0).sum())
+            lines.append(OCRLine(f"ligne {width}", 95.0, (0, int(top), width, int(bottom))))
+        return lines
+
+
+def _line_engine():
+    """Fabrique du faux moteur par lignes."""
+    return _LineEngine()
+
+
+def _lines_page(lines=12, spacing=40, size=(400, 480)):
+    """Page de texte sombre sur fond blanc, lignes régulièrement espacées."""
+    image = Image.new("L", size, 255)
+    draw = ImageDraw.Draw(image)
+    for i in range(lines):
+        draw.rectangle((10, 10 + i * spacing, 100 + 15 * i, 10 + i * spacing + 12), fill=0)
+    return image
+
+
+class TestFindBands:
+    """Tests pour find_bands."""
+
+    def test_cuts_in_whitespace(self):
+        """Les coupes tombent dans les interlignes, sans chevauchement."""
+        image = _lines_page()
+        bands = find_bands(image, 4)
+
+        assert len(bands) == 4
+        assert bands[0][0] == 0 and bands[-1][1] == image.height
+        for (_, bottom), (top, _) in zip(bands, bands[1:]):
+            assert bottom == top
+            assert np.asarray(image)[top].min() == 255
+
+    def test_overlap_without_whitespace(self):
+        """Sans interligne, les bandes voisines se chevauchent."""
+        image = Image.new("L", (100, 400), 0)
+        bands = find_bands(image, 2, overlap=20)
+
+        assert bands == [(0, 220), (180, 400)]
+
+    def test_single_band(self):
+        """Une seule bande demandée couvre toute l'image."""
+        assert find_bands(_lines_page(), 1) == [(0, 480)]
+
+
+class TestMergeBandTexts:
+    """Tests pour merge_band_texts."""
+
+    def test_duplicate_lines_at_seam_removed(self):
+        """Les lignes lues dans le chevauchement ne sont gardées qu'une fois."""
+        texts = ["Question 1\nA) Paris\nB) Lyon", "B)  Lyon\nC) Lille\n", "Question 2"]
+        assert merge_band_texts(texts) == "Question 1\nA) Paris\nB) Lyon\nC) Lille\nQuestion 2"
+
+    def test_distinct_lines_kept(self):
+        """Sans chevauchement, toutes les lignes sont conservées."""
+        assert merge_band_texts(["A) oui", "B) non"]) == "A) oui\nB) non"
+
+
+class TestParallelOCR:
+    """Tests pour ParallelOCR."""
+
+    def test_bands_recognized_in_order(self):
+        """Chaque bande est reconnue par le pool, résultats dans l'ordre."""
+        ocr = ParallelOCR(workers=2, min_band_height=100, engine_factory=_height_engine)
+        try:
+            ocr.warm_up()
+            text = ocr.recognize(_lines_page())
+        finally:
+            ocr.close()
+
+        pixels = np.asarray(_lines_page()) < 128
+        expected = [f"bande {int(pixels[top:bottom].sum())}" for top, bottom in ocr.last_bands]
+        assert len(expected) == 2
+        assert text == "\n".join(expected)
+
+    def test_recognize_lines_in_order(self):
+        """Les lignes des bandes sont renvoyées dans l'ordre, boîtes dans le repère de l'image."""
+        ocr = ParallelOCR(workers=3, min_band_height=100, engine_factory=_line_engine)
+        try:
+            lines = ocr.recognize_lines(_lines_page(), 6)
+        finally:
+            ocr.close()
+
+        assert len(ocr.last_bands) == 3
+        assert [line.text for line in lines] == [f"ligne {91 + 15 * i}" for i in range(12)]
+        assert [line.box[1] for line in lines] == [10 + 40 * i for i in range(12)]
+
+    def test_adaptive_ocr_with_workers(self, monkeypatch):
+        """Avec plusieurs processus, OCRProcessor garde le prétraitement adaptatif."""
+        monkeypatch.setattr(
+            ocr_parallel, "ParallelOCR", partial(ParallelOCR, engine_factory=_line_engine, min_band_height=100)
+        )
+        processor = OCRProcessor(workers=2, adaptive=True, min_text_length=1)
+        try:
+            text, success = processor.extract_text(_lines_page().convert("RGB"))
+        finally:
+            processor.close()
+
+        assert success
+        assert processor.last_stats["path"] == "fast"
+        assert text.splitlines() == [f"ligne {91 + 15 * i}" for i in range(12)]
+
+
+class TestMergeBandLines:
+    """Tests pour merge_band_lines."""
+
+    def test_overlap_lines_kept_once(self):
+        """Une ligne lue par deux bandes qui se chevauchent n'est gardée qu'une fois."""
+        bands = [(0, 220), (180, 400)]
+        seam = OCRLine("milieu", 90.0, (0, 195, 50, 210))
+        lines = [
+            [OCRLine("haut", 90.0, (0, 10, 50, 20)), seam],
+            [seam, OCRLine("bas", 90.0, (0, 300, 50, 310))],
+        ]
+
+        assert [line.text for line in merge_band_lines(bands, lines)] == ["haut", "milieu", "bas"]
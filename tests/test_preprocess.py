@@ -0,0 +1,63 @@
+"""Tests pour les prétraitements adaptatifs."""
+
+import numpy as np
+from src import preprocess as pp
+
+
+def _text_block(background=230, ink=40, size=(60, 200)):
+    """Bandes de « texte » sombres sur fond clair."""
+    gray = np.full(size, background, dtype=np.uint8)
+    for top in range(5, size[0] - 10, 15):
+        gray[top:top + 8, 10:150] = ink
+    return gray
+
+
+class TestThresholds:
+    """Tests pour les seuillages."""
+
+    def test_otsu_separates_modes(self):
+        """Le seuil d'Otsu tombe entre l'encre et le fond."""
+        gray = _text_block()
+        assert 40 <= pp.otsu_threshold(gray) < 230
+        assert set(np.unique(pp.otsu_binarize(gray))) == {0, 255}
+
+    def test_sauvola_handles_uneven_background(self):
+        """Sauvola retrouve le texte sur un fond en dégradé."""
+        gray = _text_block().astype(np.int16)
+        gradient = np.linspace(-60, 20, gray.shape[1]).astype(np.int16)
+        uneven = np.clip(gray + gradient, 0, 255).astype(np.uint8)
+
+        binary = pp.sauvola_binarize(uneven, window=15)
+
+        assert binary[8, 20] == 0 and binary[8, 140] == 0
+        assert binary[1, 20] == 255 and binary[1, 180] == 255
+
+
+class TestLayout:
+    """Tests pour la polarité, la hauteur du texte et le mode de segmentation."""
+
+    def test_dark_mode_inverted(self):
+        """Un fond sombre est inversé en texte sombre sur fond clair."""
+        dark = 255 - _text_block()
+        assert pp.is_dark_background(dark)
+        assert np.array_equal(pp.normalize_polarity(dark), _text_block())
+
+    def test_text_height_and_upscale(self):
+        """Un texte petit est agrandi, un texte lisible ne l'est pas."""
+        assert pp.estimate_text_height(_text_block()) == 8
+        assert pp.upscale_factor(8) == 4
+        assert pp.upscale_factor(12) == 3
+        assert pp.upscale_factor(24) == 1
+
+    def test_choose_psm(self):
+        """Une ligne, un bloc ou plusieurs colonnes donnent des modes différents."""
+        line = np.full((20, 200), 255, dtype=np.uint8)
+        line[5:12, 10:150] = 0
+        assert pp.choose_psm(line) == 7
+
+        assert pp.choose_psm(_text_block()) == 6
+
+        columns = np.full((60, 400), 255, dtype=np.uint8)
+        columns[5:12, 10:100] = columns[25:32, 10:100] = 0
+        columns[5:12, 250:390] = 0
+        assert pp.choose_psm(columns) == 3
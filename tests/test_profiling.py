@@ -0,0 +1,101 @@
+"""Tests pour le profilage optionnel du pipeline."""
+
+import os
+import threading
+import time
+import pytest
+from src.profiling import PipelineProfiler, StackSampler
+
+
+def _busy_work(duration=0.05):
+    """Calcul occupant le processeur pendant `duration` secondes."""
+    end = time.perf_counter() + duration
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(200))
+    return total
+
+
+class TestStackSampler:
+    """Tests pour StackSampler."""
+
+    def test_samples_other_threads(self):
+        """Les piles des autres threads sont relevées, y compris le calcul en cours."""
+        sampler = StackSampler(interval=0.001)
+        worker = threading.Thread(target=_busy_work, args=(0.1,))
+        sampler.start()
+        worker.start()
+        worker.join()
+        sampler.stop()
+
+        assert sampler.samples > 0
+        functions = [function for function, _, _ in sampler.top(20)]
+        assert any(function.endswith(":_busy_work") for function in functions)
+        assert all(" " in line for line in sampler.folded())
+
+    def test_idle_threads_ignored(self):
+        """Un thread bloqué en attente n'apparaît pas dans les piles."""
+        release = threading.Event()
+        waiter = threading.Thread(target=release.wait)
+        waiter.start()
+        sampler = StackSampler()
+        sampler.sample(exclude=threading.get_ident())
+        release.set()
+        waiter.join()
+
+        assert not any(stack[-1] == ("threading.py", "wait") for stack in sampler.stacks)
+
+
+class TestPipelineProfiler:
+    """Tests pour PipelineProfiler."""
+
+    def test_unknown_mode(self):
+        """Un mode inconnu est refusé."""
+        with pytest.raises(ValueError):
+            PipelineProfiler(mode="gpu")
+
+    def test_both_modes_write_files(self, tmp_path, capsys):
+        """cpu + mem écrit les piles, le top CPU, le diff et l'instantané mémoire."""
+        profiler = PipelineProfiler(mode="both", output_dir=str(tmp_path), interval=0.001)
+
+        with profiler.profile("capture1") as files:
+            kept = [bytearray(1024) for _ in range(200)]
+            _busy_work(0.05)
+
+        assert set(files) == {"cpu_folded", "cpu_top", "mem_snapshot", "mem_top"}
+        assert all(os.path.exists(path) for path in files.values())
+        output = capsys.readouterr().out
+        assert "Profil de la capture" in output
+        assert "Mémoire" in output
+        assert len(kept) == 200
+
+    def test_memory_only(self, tmp_path):
+        """mem seul n'écrit pas de profil CPU."""
+        profiler = PipelineProfiler(mode="mem", output_dir=str(tmp_path))
+        with profiler.profile() as files:
+            pass
+        assert "cpu_folded" not in files and "mem_top" in files
+
+    def test_rotation(self, tmp_path):
+        """Seuls les `keep` derniers profils sont conservés."""
+        profiler = PipelineProfiler(mode="cpu", output_dir=str(tmp_path), keep=2)
+        for _ in range(4):
+            with profiler.profile():
+                pass
+
+        runs = sorted(os.listdir(tmp_path))
+        assert len(runs) == 2
+        assert runs[-1].endswith("0004-capture")
+
+    def test_rotation_keeps_other_directories(self, tmp_path):
+        """La rotation ne touche pas aux dossiers que le profileur n'a pas créés."""
+        (tmp_path / "data").mkdir()
+        (tmp_path / "0-notes").mkdir()
+        profiler = PipelineProfiler(mode="cpu", output_dir=str(tmp_path), keep=1)
+        for _ in range(2):
+            with profiler.profile():
+                pass
+
+        entries = sorted(os.listdir(tmp_path))
+        assert "data" in entries and "0-notes" in entries
+        assert len(entries) == 3
@@ -0,0 +1,152 @@
+"""Tests pour le découpage en questions."""
+
+import asyncio
+import pytest
+from unittest.mock import Mock
+from src.cache import ResultCache
+from src.questions import QuestionAnswerer, parse_questions, split_answer_blocks
+
+
+QCM_TEXT = """Moodle - Quiz 3
+Accueil > Cours
+
+Question 1
+Quelle est la capitale
+de la France ?
+A) Paris
+B) Lyon
+c. Lille
+Question 2 : Combien font 2 + 2 ?
+(a) 4
+(b) 5
+"""
+
+
+def _answer(n, letter):
+    """Bloc de réponse au format du prompt."""
+    return f"❓ QUESTION {n}: ...\n✅ RÉPONSE: {letter}\n💡 EXPLICATION: ..."
+
+
+class TestParseQuestions:
+    """Tests pour parse_questions."""
+
+    def test_numbered_questions(self):
+        """Les questions numérotées et leurs options sont extraites."""
+        questions = parse_questions(QCM_TEXT)
+
+        assert len(questions) == 2
+        assert questions[0].stem == "Quelle est la capitale de la France ?"
+        assert questions[0].options == [("A", "Paris"), ("B", "Lyon"), ("C", "Lille")]
+        assert questions[1].options == [("A", "4"), ("B", "5")]
+
+    def test_unnumbered_questions_with_ocr_noise(self):
+        """Questions sans numéro, puces radio et crochets lus par l'OCR."""
+        text = (
+            "Quelle est la couleur du ciel ?\n"
+            "o A. Bleu\n"
+            "o B. Vert\n"
+            "Parmi les propositions suivantes, laquelle est vraie ?\n"
+            "A] La Terre est plate\n"
+            "B] La Terre est ronde\n"
+        )
+        questions = parse_questions(text)
+
+        assert [q.stem for q in questions] == [
+            "Quelle est la couleur du ciel ?",
+            "Parmi les propositions suivantes, laquelle est vraie ?",
+        ]
+        assert questions[1].options[1] == ("B", "La Terre est ronde")
+
+    def test_no_qcm(self):
+        """Un texte sans structure de QCM ne donne aucune question."""
+        assert parse_questions("Bonjour, pas de QCM ici.") == []
+
+    def test_fingerprint_ignores_ocr_noise(self):
+        """L'empreinte ne dépend pas de la casse ni des espaces."""
+        first = parse_questions("Question 1 : 2+2 ?\nA) 4\nB) 5")[0]
+        second = parse_questions("QUESTION 1 :  2+2?\na) 4\nb)  5")[0]
+        assert first.fingerprint == second.fingerprint
+
+
+class TestQuestionAnswerer:
+    """Tests pour QuestionAnswerer."""
+
+    def test_split_answer_blocks(self):
+        """La réponse est découpée en un bloc par question."""
+        response = f"{_answer(1, 'A')}\n\n---\n\n{_answer(2, 'B')}"
+        assert split_answer_blocks(response) == [_answer(1, 'A'), _answer(2, 'B')]
+
+    def test_only_new_questions_are_sent(self):
+        """Après défilement, seule la nouvelle question part au LLM."""
+        llm = Mock(model="m", prompt_version="v", temperature=0.3)
+        llm.analyze_qcm_text.side_effect = [
+            f"{_answer(1, 'A')}\n\n---\n\n{_answer(2, 'A')}",
+            _answer(1, 'C'),
+        ]
+        answerer = QuestionAnswerer(llm, ResultCache())
+
+        answerer.answer(QCM_TEXT)
+        scrolled = (
+            "Question 2 : Combien font 2 + 2 ?\n(a) 4\n(b) 5\n"
+            "Question 3 : Couleur du ciel ?\nA) Bleu\nB) Vert\nC) Rouge\n"
+        )
+        result = answerer.answer(scrolled)
+
+        sent = llm.analyze_qcm_text.call_args_list[1][0][0]
+        assert "Couleur du ciel" in sent
+        assert "Combien font" not in sent
+        assert answerer.last_reused == 1
+        assert "QUESTION 1" in result and "QUESTION 2" in result
+        assert result.index("RÉPONSE: A") < result.index("RÉPONSE: C")
+
+    def test_answer_async_concurrent_groups(self):
+        """Les nouvelles questions sont réparties entre requêtes simultanées."""
+        sent = []
+
+        async def analyze(text, on_token=None):
+            sent.append(text)
+            return _answer(1, "A")
+
+        llm = Mock(model="m", prompt_version="v", temperature=0.3)
+        llm.analyze_qcm_text = analyze
+        answerer = QuestionAnswerer(llm, ResultCache())
+
+        result = asyncio.run(answerer.answer_async(QCM_TEXT, concurrency=2))
+
+        assert len(sent) == 2
+        assert "capitale" in sent[0] and "Combien font" in sent[1]
+        assert result.count("RÉPONSE: A") == 2
+
+    def test_unsplit_answer_not_resent(self):
+        """Une réponse mal découpée est gardée avec les réponses connues, sans requête de plus."""
+        llm = Mock(model="m", prompt_version="v", temperature=0.3)
+        llm.analyze_qcm_text.side_effect = [
+            f"{_answer(1, 'A')}\n\n---\n\n{_answer(2, 'A')}",
+            "Question 3 : réponse B (format libre)",
+        ]
+        answerer = QuestionAnswerer(llm, ResultCache())
+        answerer.answer(QCM_TEXT)
+
+        scrolled = QCM_TEXT + "Question 3 : Couleur du ciel ?\nA) Bleu\nB) Vert\n"
+        result = answerer.answer(scrolled)
+
+        assert llm.analyze_qcm_text.call_count == 2
+        assert result.count("RÉPONSE: A") == 2
+        assert result.endswith("Question 3 : réponse B (format libre)")
+
+    def test_answer_async_unsplit_group(self):
+        """En asynchrone, un groupe mal découpé n'entraîne pas d'analyse du texte complet."""
+        sent = []
+
+        async def analyze(text, on_token=None):
+            sent.append(text)
+            return _answer(1, "A") if "capitale" in text else "réponse libre"
+
+        llm = Mock(model="m", prompt_version="v", temperature=0.3)
+        llm.analyze_qcm_text = analyze
+        answerer = QuestionAnswerer(llm, ResultCache())
+
+        result = asyncio.run(answerer.answer_async(QCM_TEXT, concurrency=2))
+
+        assert len(sent) == 2
+        assert result == f"{_answer(1, 'A')}\n\n---\n\nréponse libre"
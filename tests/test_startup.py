@@ -0,0 +1,99 @@
+"""Tests pour la mesure du démarrage."""
+
+import builtins
+import sys
+import time
+from src.startup import ImportProfiler, StartupTimer, run_warm_up
+
+
+class TestImportProfiler:
+    """Tests pour ImportProfiler."""
+
+    def test_records_new_imports_only(self, monkeypatch):
+        """Seuls les modules pas encore chargés sont chronométrés."""
+        monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+        original = builtins.__import__
+        profiler = ImportProfiler()
+
+        profiler.start()
+        try:
+            import colorsys  # noqa: F401
+            import os  # noqa: F401  (déjà chargé)
+        finally:
+            profiler.stop()
+
+        assert builtins.__import__ is original
+        names = [name for name, _, _ in profiler.records]
+        assert "colorsys" in names
+        assert "os" not in names
+
+    def test_self_time_excludes_children(self):
+        """La durée propre d'un module exclut celle des modules qu'il importe."""
+        profiler = ImportProfiler()
+
+        def fake_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if name == "module_parent_factice":
+                profiler._import("module_enfant_factice")
+            time.sleep(0.01)
+
+        profiler._original = fake_import
+        profiler._import("module_parent_factice")
+
+        records = {name: (cumulative, own) for name, cumulative, own in profiler.records}
+        parent, child = records["module_parent_factice"], records["module_enfant_factice"]
+        assert parent[0] >= child[0] + 10
+        assert parent[1] < parent[0] - 5
+        assert profiler.top(1)[0][0] == "module_parent_factice"
+
+
+class TestStartupTimer:
+    """Tests pour StartupTimer."""
+
+    def test_phases_and_ready(self):
+        """Les étapes et le temps de démarrage apparaissent dans le rapport."""
+        timer = StartupTimer()
+        with timer.phase("composants"):
+            time.sleep(0.005)
+        timer.add("préchauffage réseau", None)
+        ready = timer.mark_ready()
+
+        assert timer.phases[0][0] == "composants"
+        assert timer.phases[0][1] >= 5
+        assert ready >= timer.phases[0][1]
+        report = timer.report()
+        assert "composants" in report
+        assert "échec" in report
+        assert "prêt" in report
+        assert "Imports" not in report
+
+    def test_import_profiling_per_phase(self, monkeypatch):
+        """Avec profile_imports, les imports d'une étape sont relevés."""
+        monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+        original = builtins.__import__
+        timer = StartupTimer(profile_imports=True)
+
+        with timer.phase("imports"):
+            import colorsys  # noqa: F401
+
+        assert "colorsys" in timer.report()
+        assert builtins.__import__ is original
+
+
+class TestRunWarmUp:
+    """Tests pour run_warm_up."""
+
+    def test_failures_do_not_stop_others(self):
+        """Une tâche en échec est notée None, les suivantes s'exécutent."""
+        calls = []
+
+        def failing():
+            raise ConnectionError("hors ligne")
+
+        results = run_warm_up([
+            ("réseau", failing),
+            ("codecs", lambda: calls.append("codecs")),
+        ])
+
+        assert results[0] == ("réseau", None)
+        assert results[1][0] == "codecs" and results[1][1] >= 0
+        assert calls == ["codecs"]
@@ -0,0 +1,89 @@
+"""Tests pour la détection de la zone de texte."""
+
+from PIL import Image, ImageDraw
+from src.text_region import crop_to_text, find_text_region, text_cell_map
+
+
+def _quiz_page(size=(960, 540)):
+    """Page synthétique : barre du navigateur, menu latéral, QCM et pied de page."""
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, size[0], 40), fill=(222, 222, 222))
+    draw.text((10, 12), "https://moodle.example.org/mod/quiz", fill="black")
+    draw.line((130, 40, 130, size[1]), fill=(150, 150, 150))
+    draw.text((10, 60), "Menu", fill="black")
+    lines = [
+        "Question 1 : Quelle est la capitale de la France ?",
+        "A) Paris, sur la Seine", "B) Lyon, au confluent du Rhone", "C) Lille, dans le Nord",
+        "Question 2 : Combien font 2 + 2 en base dix ?",
+        "A) 4, le resultat attendu", "B) 5, une erreur classique", "C) 22, une concatenation",
+    ]
+    for i, line in enumerate(lines):
+        draw.text((300, 120 + 22 * i), line, fill="black")
+    draw.text((850, 525), "2026", fill="black")
+    return image
+
+
+def _spaced_quiz_page(stem_y, options_y, count, spacing, size=(1920, 1080)):
+    """Page plein écran : énoncé d'une ligne séparé d'options espacées."""
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, size[0], 80), fill=(222, 222, 222))
+    draw.text((20, 30), "https://moodle.example.org/mod/quiz/attempt.php", fill="black")
+    draw.text((300, stem_y), "Question 3 : Quel protocole chiffre les echanges web ?", fill="black")
+    for i in range(count):
+        draw.text((320, options_y + spacing * i), f"{chr(65 + i)}) Option de reponse numero {i + 1}", fill="black")
+    return image
+
+
+class TestTextRegion:
+    """Tests pour find_text_region et crop_to_text."""
+
+    def test_crops_to_quiz(self):
+        """La zone retenue couvre le QCM et exclut barre, menu et pied de page."""
+        image = _quiz_page()
+        longest = ImageDraw.Draw(image).textbbox((300, 120), "Question 1 : Quelle est la capitale de la France ?")
+        left, top, right, bottom = find_text_region(image, margin=8)
+
+        assert 130 < left <= 300
+        assert 40 < top <= 120
+        assert longest[2] <= right < 600
+        assert 120 + 22 * 8 <= bottom < 500
+
+    def test_crop_to_text_returns_smaller_image(self):
+        """L'image recadrée est plus petite que la capture."""
+        image = _quiz_page().convert("L")
+        cropped, box = crop_to_text(image)
+
+        assert box is not None
+        assert cropped.size == (box[2] - box[0], box[3] - box[1])
+        assert cropped.width * cropped.height < 0.3 * image.width * image.height
+
+    def test_blank_or_full_page_not_cropped(self):
+        """Sans texte, ou si le texte couvre tout l'écran, l'image est inchangée."""
+        blank = Image.new("RGB", (400, 300), "white")
+        assert crop_to_text(blank) == (blank, None)
+
+        full = Image.new("RGB", (400, 300), "white")
+        draw = ImageDraw.Draw(full)
+        for y in range(0, 300, 12):
+            draw.text((0, y), "texte " * 20, fill="black")
+        assert find_text_region(full) is None
+
+    def test_image_smaller_than_a_cell(self):
+        """Une image plus petite qu'une cellule n'est pas recadrée (pas de division par zéro)."""
+        for size in ((3, 100), (100, 3), (2, 2)):
+            tiny = Image.new("L", size, "white")
+            assert text_cell_map(tiny)[0].size == 0
+            assert find_text_region(tiny) is None
+            assert crop_to_text(tiny) == (tiny, None)
+
+    def test_keeps_spaced_question_stem(self):
+        """Un énoncé d'une ligne, séparé de ses options par un blanc, reste dans la zone."""
+        for stem_y, options_y, count, spacing in ((200, 280, 6, 24), (150, 300, 12, 42)):
+            image = _spaced_quiz_page(stem_y, options_y, count, spacing)
+            left, top, right, bottom = find_text_region(image, margin=8)
+
+            assert 80 < top <= stem_y
+            assert left <= 300
+            assert bottom >= options_y + spacing * (count - 1) + 8